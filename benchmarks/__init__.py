@@ -0,0 +1,3 @@
+"""
+benchmarks 패키지 초기화
+"""
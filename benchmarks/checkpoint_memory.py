@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+체크포인트 크기와 스텝당 메모리 할당 벤치마크
+
+메시지 기록 길이(초기 상태에 미리 넣은 메시지 수)별로 평가를 반복 실행하면서
+스텝(체크포인트 저장)마다 체크포인트 DB에 추가된 바이트 수와 tracemalloc 최대 할당량을 측정합니다.
+채널별 증분 저장소(ThreadedSqliteSaver)와 스텝마다 전체 상태를 저장하는 SqliteSaver를 비교하며,
+결정적 가짜 백엔드(src/fakes.py)를 사용하므로 네트워크가 필요 없습니다.
+
+사용 예:
+    python -m benchmarks.checkpoint_memory --history 10,100,1000 --runs 5 -o benchmarks/checkpoint_memory.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.fakes import use_fake_backends
+from src.llm import set_llm_cache
+from src.retrieval import QueryEmbeddingCache, set_query_embedding_cache, setup_pdf_retrieval
+from src.workflow import set_node_cache
+from src.workflow.checkpoint import create_checkpointer
+from src.workflow.graph import build_workflow
+from benchmarks.synthetic_pdf import write_synthetic_pdf
+
+# 저장소 종류별 스레드 데이터 크기 조회 (테이블, 크기 식)
+STORAGE_TABLES = (
+    ("checkpoints", "length(checkpoint) + length(metadata)"),
+    ("writes", "length(value)"),
+    ("checkpoint_blobs", "length(blob)"),
+)
+
+SERVICE_DESCRIPTION = "CreditAI 서비스는 금융 기관을 위한 AI 신용 평가 시스템입니다."
+
+
+def _parse_counts(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _summary(values):
+    return {
+        "mean": round(sum(values) / len(values), 1) if values else None,
+        "max": max(values) if values else None
+    }
+
+
+def _create_saver(kind, path):
+    if kind == "incremental":
+        return create_checkpointer(path)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    saver = SqliteSaver(conn)
+    saver.setup()
+    return saver
+
+
+def _thread_bytes(conn, tables, thread_id):
+    return sum(
+        conn.execute(f"SELECT COALESCE(SUM({size}), 0) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+        for table, size in tables
+    )
+
+
+class StepRecorder:
+    """
+    체크포인트 저장소의 put()을 감싸 스텝마다 추가된 저장 바이트와 최대 할당량을 기록합니다.
+    """
+
+    def node_steps(self):
+        """
+        입력 상태를 저장하는 스텝(-1: 입력, 0: 입력 적용)을 제외한 노드 실행 스텝의 측정값을 반환합니다.
+
+        Returns:
+            tuple: (입력 스텝 저장 바이트 합계, 스텝별 저장 바이트 목록, 스텝별 최대 할당량 목록)
+        """
+        input_bytes = sum(size for step, size in zip(self.steps, self.step_bytes) if step < 1)
+        node_bytes = [size for step, size in zip(self.steps, self.step_bytes) if step >= 1]
+        node_alloc = [alloc for step, alloc in zip(self.steps, self.step_alloc) if step >= 1]
+        return input_bytes, node_bytes, node_alloc
+
+    def __init__(self, saver, path):
+        self.saver = saver
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        existing = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.tables = [(table, size) for table, size in STORAGE_TABLES if table in existing]
+        self.put = saver.put
+        saver.put = self._put
+        self.thread_id = None
+        self.reset(None)
+
+    def reset(self, thread_id):
+        """
+        새 실행의 측정을 시작합니다.
+
+        Args:
+            thread_id (str | None): 측정할 스레드 ID
+        """
+        self.thread_id = thread_id
+        self.steps = []
+        self.step_bytes = []
+        self.step_alloc = []
+        self.stored = 0
+        tracemalloc.reset_peak()
+        self.step_start = tracemalloc.get_traced_memory()[0]
+
+    def _put(self, config, checkpoint, metadata, new_versions):
+        result = self.put(config, checkpoint, metadata, new_versions)
+        peak = tracemalloc.get_traced_memory()[1]
+        self.step_alloc.append(peak - self.step_start)
+
+        stored = _thread_bytes(self.conn, self.tables, self.thread_id)
+        self.steps.append(metadata.get("step"))
+        self.step_bytes.append(stored - self.stored)
+        self.stored = stored
+
+        tracemalloc.reset_peak()
+        self.step_start = tracemalloc.get_traced_memory()[0]
+        return result
+
+
+def bench_history(kind, history_sizes, runs, retriever, chain, workdir):
+    """
+    메시지 기록 길이별로 스텝당 체크포인트 크기와 할당량을 측정합니다.
+
+    Args:
+        kind (str): incremental(채널별 증분 저장) 또는 snapshot(SqliteSaver 전체 상태 저장)
+        history_sizes (list): 초기 상태에 넣을 메시지 수 목록
+        runs (int): 기록 길이별 평가 반복 횟수
+        retriever: PDF 검색기
+        chain: PDF 검색 체인
+        workdir (str): 체크포인트 DB를 둘 임시 디렉토리
+
+    Returns:
+        list: 기록 길이별 측정 결과
+    """
+    path = os.path.join(workdir, f"checkpoints_{kind}.sqlite")
+    saver = _create_saver(kind, path)
+    app, initial_state = build_workflow(retriever, chain, saver)
+    recorder = StepRecorder(saver, path)
+
+    results = []
+    for history in history_sizes:
+        messages = [HumanMessage(content=f"이전 평가 메시지 {index}: " + "기록 " * 20) for index in range(history)]
+        step_bytes, step_alloc, run_bytes, input_bytes = [], [], [], 0
+        for run in range(runs):
+            thread_id = f"{kind}-{history}-{run}"
+            state = {**initial_state, "service_description": SERVICE_DESCRIPTION, "messages": messages}
+            recorder.reset(thread_id)
+            app.invoke(state, {"configurable": {"thread_id": thread_id}})
+            # 입력 스텝은 미리 넣은 메시지 기록 전체를 한 번 저장하므로 노드 실행 스텝과 구분
+            input_bytes, node_bytes, node_alloc = recorder.node_steps()
+            step_bytes.extend(node_bytes)
+            step_alloc.extend(node_alloc)
+            run_bytes.append(recorder.stored)
+
+        result = {
+            "history_messages": history,
+            "steps_per_run": len(step_bytes) // runs,
+            "input_checkpoint_bytes": input_bytes,
+            "step_checkpoint_bytes": _summary(step_bytes),
+            "step_alloc_bytes": _summary(step_alloc),
+            "run_checkpoint_bytes": _summary(run_bytes)
+        }
+        results.append(result)
+        print(f"[{kind}] 메시지 {history}개: 스텝당 저장 평균 {result['step_checkpoint_bytes']['mean']:.0f}B "
+              f"(최대 {result['step_checkpoint_bytes']['max']}B), 스텝당 할당 평균 "
+              f"{result['step_alloc_bytes']['mean'] / 1024:.1f}KB (최대 {result['step_alloc_bytes']['max'] / 1024:.1f}KB)")
+    return results
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="체크포인트 크기와 스텝당 메모리 할당 벤치마크")
+    parser.add_argument("--history", type=_parse_counts, default=[10, 100, 1000],
+                        help="초기 상태에 넣을 메시지 수 목록 (기본값: 10,100,1000)")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="메시지 수별 평가 반복 횟수 (기본값: 5)")
+    parser.add_argument("--pdf-pages", type=int, default=10,
+                        help="합성 가이드라인 PDF 페이지 수 (기본값: 10)")
+    parser.add_argument("--output", "-o", type=str,
+                        help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ethics-ckpt-bench-") as workdir:
+        # 인덱스 캐시, LLM 응답 캐시, 노드 출력 캐시가 측정에 섞이지 않도록 분리
+        os.environ["INDEX_CACHE_DIR"] = os.path.join(workdir, "index")
+        set_llm_cache(None)
+        set_node_cache(None)
+        set_query_embedding_cache(QueryEmbeddingCache(path=os.path.join(workdir, "embedding_cache.sqlite")))
+        use_fake_backends()
+
+        pdf_path = write_synthetic_pdf(os.path.join(workdir, "guideline.pdf"), args.pdf_pages)
+        retriever, chain, _ = setup_pdf_retrieval(pdf_path)
+
+        tracemalloc.start()
+        try:
+            results = {
+                kind: bench_history(kind, args.history, args.runs, retriever, chain, workdir)
+                for kind in ("incremental", "snapshot")
+            }
+        finally:
+            tracemalloc.stop()
+
+    if args.output:
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "runs": args.runs,
+                "results": results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n벤치마크 결과가 저장되었습니다: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+CLI 시작 시간 벤치마크
+
+main.py --help, 인자 파싱, server.py --help를 새 인터프리터에서 반복 실행해 시간을 측정하고,
+인자 파싱까지 LangChain/LangGraph/OpenAI 같은 무거운 의존성이 로드되지 않았는지 확인합니다.
+시간 예산을 넘거나 무거운 모듈이 로드되면 종료 코드 1을 반환하므로 CI 검사로 사용할 수 있습니다.
+
+사용 예:
+    python -m benchmarks.import_time --budget 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 인자 파싱까지 로드되면 안 되는 모듈
+HEAVY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "langchain_community",
+    "langchain_openai",
+    "langchain_teddynote",
+    "langchain_opentutorial",
+    "langgraph",
+    "openai",
+    "faiss",
+    "tiktoken",
+)
+
+PARSE_SCRIPT = """
+import json, sys
+import main
+main.build_parser().parse_args(["AI 서비스 설명", "--risk-mode", "per_category", "--report-mode", "template"])
+heavy = json.loads(sys.argv[1])
+print(json.dumps(sorted(name for name in heavy if name in sys.modules)))
+"""
+
+SCENARIOS = {
+    "main_help": [sys.executable, "main.py", "--help"],
+    "main_parse": [sys.executable, "-c", PARSE_SCRIPT, json.dumps(HEAVY_MODULES)],
+    "server_help": [sys.executable, "server.py", "--help"],
+}
+
+
+def _run(command):
+    # LangSmith 설정이 측정에 섞이지 않도록 끔
+    env = {**os.environ, "LANGSMITH_TRACING": "false"}
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"실행 실패 ({' '.join(command[:2])}): {completed.stderr.strip()}")
+    return elapsed, completed.stdout
+
+
+def bench_scenario(name, repeat):
+    """
+    시나리오를 새 인터프리터에서 반복 실행해 시간을 측정합니다.
+
+    Args:
+        name (str): 시나리오 이름
+        repeat (int): 반복 횟수
+
+    Returns:
+        dict: 최소/중앙값/최대 시간(초)과 마지막 실행 출력
+    """
+    timings = []
+    output = ""
+    for _ in range(repeat):
+        elapsed, output = _run(SCENARIOS[name])
+        timings.append(elapsed)
+    return {
+        "min_seconds": round(min(timings), 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "max_seconds": round(max(timings), 4),
+        "output": output
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="CLI 시작 시간 벤치마크")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="시나리오별 중앙값 시간 예산(초, 기본값: 0.5)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="시나리오별 반복 횟수 (기본값: 5)")
+    parser.add_argument("--output", "-o", type=str,
+                        help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    # 인터프리터 자체의 시작 시간 (예산 비교 기준)
+    baseline = min(_run([sys.executable, "-c", "pass"])[0] for _ in range(args.repeat))
+    print(f"[baseline] python 시작 {baseline:.3f}s")
+
+    results = {}
+    failed = False
+    for name in SCENARIOS:
+        result = bench_scenario(name, args.repeat)
+        output = result.pop("output")
+        over_budget = result["median_seconds"] > args.budget
+        failed = failed or over_budget
+        if name == "main_parse":
+            result["heavy_modules_loaded"] = json.loads(output)
+            failed = failed or bool(result["heavy_modules_loaded"])
+        results[name] = result
+
+        status = "예산 초과" if over_budget else "OK"
+        print(f"[{name}] median {result['median_seconds']:.3f}s (min {result['min_seconds']:.3f}s) - {status}")
+    if results["main_parse"]["heavy_modules_loaded"]:
+        print(f"[main_parse] 인자 파싱 중 로드된 무거운 모듈: {', '.join(results['main_parse']['heavy_modules_loaded'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget_seconds": args.budget, "python_startup_seconds": round(baseline, 4),
+                       "scenarios": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n벤치마크 결과가 저장되었습니다: {args.output}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+요청 한도(429) 상황의 처리량 벤치마크
+
+가짜 채팅 모델에 분당 요청 한도(FakeQuota)를 걸고, 배치 평가와 대화형 평가를 동시에 실행하면서
+호출 스케줄러 설정별로 다음 항목을 측정합니다.
+- scheduler: 한도에 맞춘 요청 버킷 + 우선순위 + 429 공동 백오프 (RATE_LIMITS 설정과 같음)
+- backoff: 버킷 없이 429를 받은 뒤에만 백오프 (RATE_LIMITS를 설정하지 않은 경우와 같음)
+- none: 재시도 없음 (429가 그대로 평가 실패가 됨)
+
+측정 항목은 실패한 평가 수, 429 응답 수, 한도 대비 실제 LLM 처리량, 우선순위별 평가 지연 시간입니다.
+결정적 가짜 백엔드(src/fakes.py)를 사용하므로 네트워크가 필요 없습니다.
+
+사용 예:
+    python -m benchmarks.rate_limit --quota-rpm 600 --evaluations 24 --interactive 4 -o benchmarks/rate_limit.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from src.fakes import FakeQuota, use_fake_backends
+from src.llm import set_llm_cache
+from src.metrics import percentile
+from src.ratelimit import PROVIDER_OPENAI, RateLimitScheduler, set_rate_limiter
+from src.retrieval import QueryEmbeddingCache, set_query_embedding_cache
+from src.workflow import get_default_evaluator, set_node_cache
+from src.workflow.batch import run_batch
+
+MODES = ("scheduler", "backoff", "none")
+
+
+def _create_scheduler(mode, quota_rpm, burst_seconds):
+    # 벤치마크가 짧으므로 재시도 대기 시간을 줄임
+    if mode == "scheduler":
+        return RateLimitScheduler({PROVIDER_OPENAI: (quota_rpm, None)}, base_delay=0.1, max_delay=2.0,
+                                  burst_seconds=burst_seconds)
+    if mode == "backoff":
+        return RateLimitScheduler(base_delay=0.1, max_delay=2.0)
+    return RateLimitScheduler(max_retries=0)
+
+
+def _latency(values):
+    return {
+        "p50": round(percentile(values, 0.5), 3) if values else None,
+        "p95": round(percentile(values, 0.95), 3) if values else None,
+    }
+
+
+def _evaluate_interactive(evaluator, index, results):
+    start = time.perf_counter()
+    try:
+        result = evaluator.evaluate(f"대화형{index} 서비스는 고객 상담을 돕는 AI 챗봇입니다. (#{index})")
+        error = None if result.get("final_report") else "보고서 없음"
+    except Exception as e:
+        error = str(e)
+    results.append({"error": error, "latency": time.perf_counter() - start})
+
+
+def bench_mode(mode, args):
+    """
+    스케줄러 설정 하나로 배치 평가와 대화형 평가를 동시에 실행합니다.
+
+    Args:
+        mode (str): scheduler, backoff 또는 none
+        args (argparse.Namespace): 벤치마크 설정
+
+    Returns:
+        dict: 실패 수, 429 수, LLM 처리량, 우선순위별 지연 시간
+    """
+    quota = FakeQuota(args.quota_rpm, burst_seconds=args.burst_seconds)
+    use_fake_backends(llm_latency=args.llm_latency, llm_quota=quota)
+    scheduler = _create_scheduler(mode, args.quota_rpm, args.burst_seconds)
+    set_rate_limiter(scheduler)
+    evaluator = get_default_evaluator()
+
+    items = [
+        {"id": str(index), "service_name": None,
+         "description": f"배치{index} 서비스는 금융 기관을 위한 AI 신용 평가 시스템입니다. (#{index})"}
+        for index in range(args.evaluations)
+    ]
+    batch_output = []
+    start = time.perf_counter()
+    batch_thread = threading.Thread(
+        target=lambda: batch_output.append(run_batch(items, evaluator, max_concurrency=args.concurrency))
+    )
+    batch_thread.start()
+    # 배치가 한도를 채운 뒤에 대화형 요청이 들어오도록 함
+    time.sleep(args.interactive_delay)
+    interactive_results = []
+    threads = [threading.Thread(target=_evaluate_interactive, args=(evaluator, index, interactive_results))
+               for index in range(args.interactive)]
+    for thread in threads:
+        thread.start()
+    for thread in threads + [batch_thread]:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    batch_results = batch_output[0]
+
+    result = {
+        "wall_seconds": round(elapsed, 3),
+        "failed_batch": sum(1 for item in batch_results if item["error"]),
+        "failed_interactive": sum(1 for item in interactive_results if item["error"]),
+        "rate_limited_responses": quota.rejected,
+        "llm_requests": quota.accepted,
+        "llm_requests_per_minute": round(quota.accepted / elapsed * 60, 1),
+        "quota_utilization": round(quota.accepted / elapsed * 60 / args.quota_rpm, 3),
+        "batch_latency_seconds": _latency([item["latency"] for item in batch_results if not item["error"]]),
+        "interactive_latency_seconds": _latency([item["latency"] for item in interactive_results
+                                                 if not item["error"]]),
+        "scheduler": scheduler.stats()
+    }
+    print(f"[{mode}] {elapsed:.1f}s, 실패 배치 {result['failed_batch']}/{args.evaluations} "
+          f"대화형 {result['failed_interactive']}/{args.interactive}, 429 {quota.rejected}회, "
+          f"LLM {result['llm_requests_per_minute']}/분 (한도의 {result['quota_utilization']:.0%}), "
+          f"지연 p50 배치 {result['batch_latency_seconds']['p50']}s / "
+          f"대화형 {result['interactive_latency_seconds']['p50']}s")
+    return result
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="요청 한도(429) 상황의 처리량 벤치마크")
+    parser.add_argument("--quota-rpm", type=float, default=600,
+                        help="가짜 채팅 모델의 분당 요청 한도 (기본값: 600)")
+    parser.add_argument("--burst-seconds", type=float, default=1,
+                        help="한도 버킷 크기 (분당 한도의 몇 초 분량, 기본값: 1)")
+    parser.add_argument("--evaluations", type=int, default=24,
+                        help="배치 평가 수 (기본값: 24)")
+    parser.add_argument("--concurrency", "-c", type=int, default=8,
+                        help="배치 평가 동시 실행 수 (기본값: 8)")
+    parser.add_argument("--interactive", type=int, default=4,
+                        help="배치 도중 들어오는 대화형 평가 수 (기본값: 4)")
+    parser.add_argument("--interactive-delay", type=float, default=2.0,
+                        help="배치 시작 후 대화형 평가를 시작할 때까지의 시간(초, 기본값: 2)")
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="가짜 LLM 호출당 지연 시간(초, 기본값: 0.05)")
+    parser.add_argument("--modes", type=lambda value: value.split(","), default=list(MODES),
+                        help=f"측정할 스케줄러 설정 (기본값: {','.join(MODES)})")
+    parser.add_argument("--output", "-o", type=str,
+                        help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ethics-ratelimit-bench-") as workdir:
+        # 캐시가 있으면 두 번째 설정부터 LLM을 호출하지 않으므로 모두 끔
+        os.environ["INDEX_CACHE_DIR"] = os.path.join(workdir, "index")
+        set_llm_cache(None)
+        set_node_cache(None)
+        set_query_embedding_cache(QueryEmbeddingCache(path=os.path.join(workdir, "embedding_cache.sqlite")))
+        try:
+            results = {mode: bench_mode(mode, args) for mode in args.modes}
+        finally:
+            set_rate_limiter(None)
+
+    if args.output:
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "settings": {key: value for key, value in vars(args).items() if key != "output"},
+                "results": results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n벤치마크 결과가 저장되었습니다: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+오프라인 성능 벤치마크
+
+OpenAI/Tavily를 결정적 가짜 백엔드로 대체한 뒤 다음 항목을 측정해 JSON으로 저장합니다.
+- PDF 인덱스 생성(콜드)과 캐시 로드(웜) 시간: 합성 가이드라인 PDF 크기별
+- 여러 PDF 코퍼스 적재 시간과 최대 메모리: 코퍼스 파일 수별
+- 검색기 처리량(QPS): 검색 모드(hybrid/vector/lexical)별 순차, 쿼리 임베딩 캐시 적중, 배치 호출
+- 평가 1/10/100건의 종단 간 지연 시간, 처리량, 최대 메모리
+
+사용 예:
+    python -m benchmarks.run --output benchmarks/results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.fakes import use_fake_backends
+from src.llm import set_llm_cache
+from src.workflow import set_node_cache
+from src.metrics import MetricsRegistry, percentile
+from src.retrieval import RETRIEVAL_MODES, QueryEmbeddingCache, set_query_embedding_cache, setup_pdf_retrieval
+from src.workflow import get_default_evaluator
+from src.workflow.batch import run_batch
+from benchmarks.synthetic_pdf import write_synthetic_pdf
+
+RETRIEVAL_QUERIES = (
+    "AI 윤리 공정성 평가 기준",
+    "privacy safeguards for personal data",
+    "transparency and explainability requirements",
+    "safety controls for high impact models",
+    "accountability and human oversight",
+)
+
+
+def _parse_counts(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _round(value):
+    return round(value, 4) if value is not None else None
+
+
+def _distribution(values):
+    return {
+        "p50": _round(percentile(values, 0.5)),
+        "p95": _round(percentile(values, 0.95)),
+        "p99": _round(percentile(values, 0.99)),
+        "mean": _round(sum(values) / len(values) if values else None),
+        "max": _round(max(values) if values else None)
+    }
+
+
+def _max_rss_mb():
+    # Linux는 KB, macOS는 바이트 단위
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _measure(func, trace_memory):
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def bench_ingestion(page_counts, workdir, trace_memory):
+    """
+    합성 PDF 크기별 인덱스 생성과 캐시 로드 시간을 측정합니다.
+
+    Args:
+        page_counts (list): 합성 PDF 페이지 수 목록
+        workdir (str): PDF와 인덱스 캐시를 둘 임시 디렉토리
+        trace_memory (bool): tracemalloc으로 최대 메모리를 측정할지 여부
+
+    Returns:
+        tuple: (측정 결과 목록, 가장 큰 PDF의 검색기)
+    """
+    results = []
+    retriever = None
+    for pages in page_counts:
+        pdf_path = write_synthetic_pdf(os.path.join(workdir, f"guideline_{pages}p.pdf"), pages, seed=pages)
+
+        (retriever, _, vectorstore), cold_seconds, peak = _measure(
+            lambda: setup_pdf_retrieval(pdf_path), trace_memory
+        )
+        _, warm_seconds, _ = _measure(lambda: setup_pdf_retrieval(pdf_path), False)
+
+        results.append({
+            "pages": pages,
+            "pdf_bytes": os.path.getsize(pdf_path),
+            "chunks": vectorstore.index.ntotal,
+            "cold_build_seconds": round(cold_seconds, 4),
+            "warm_load_seconds": round(warm_seconds, 4),
+            "peak_memory_mb": round(peak, 2) if peak is not None else None
+        })
+        print(f"[ingestion] {pages}p: build {cold_seconds:.2f}s, load {warm_seconds:.3f}s, "
+              f"{vectorstore.index.ntotal} chunks")
+    return results, retriever
+
+
+def bench_corpus_ingestion(file_counts, pages_per_file, workdir, trace_memory):
+    """
+    PDF 디렉토리(코퍼스) 파일 수별 인덱스 생성 시간과 최대 메모리를 측정합니다.
+
+    Args:
+        file_counts (list): 코퍼스 PDF 파일 수 목록
+        pages_per_file (int): 파일당 페이지 수
+        workdir (str): PDF와 인덱스 캐시를 둘 임시 디렉토리
+        trace_memory (bool): tracemalloc으로 최대 메모리를 측정할지 여부
+
+    Returns:
+        list: 측정 결과 목록
+    """
+    results = []
+    for files in file_counts:
+        corpus_dir = os.path.join(workdir, f"corpus_{files}")
+        os.makedirs(corpus_dir, exist_ok=True)
+        for index in range(files):
+            write_synthetic_pdf(os.path.join(corpus_dir, f"policy_{index}.pdf"), pages_per_file,
+                                seed=1000 + files * 100 + index)
+
+        (_, _, vectorstore), cold_seconds, peak = _measure(
+            lambda: setup_pdf_retrieval(corpus_dir), trace_memory
+        )
+        results.append({
+            "files": files,
+            "pages": files * pages_per_file,
+            "chunks": vectorstore.index.ntotal,
+            "cold_build_seconds": round(cold_seconds, 4),
+            "chunks_per_second": round(vectorstore.index.ntotal / cold_seconds, 2),
+            "peak_memory_mb": round(peak, 2) if peak is not None else None
+        })
+        print(f"[corpus] {files} files: build {cold_seconds:.2f}s, {vectorstore.index.ntotal} chunks"
+              + (f", peak {peak:.1f}MB" if peak is not None else ""))
+    return results
+
+
+def bench_retrieval(retriever, query_count):
+    """
+    검색 모드별로 검색기의 순차 호출과 배치 호출 처리량을 측정합니다.
+
+    Args:
+        retriever (HybridRetriever): PDF 검색기 (hybrid 모드로 생성되어 두 색인을 모두 가진 검색기)
+        query_count (int): 실행할 쿼리 수
+
+    Returns:
+        dict: 검색 모드별 처리량(QPS)과 쿼리당 지연 시간 분포
+    """
+    return {
+        mode: _bench_retrieval_mode(retriever.model_copy(update={"mode": mode}), mode, query_count)
+        for mode in RETRIEVAL_MODES
+    }
+
+
+def _bench_retrieval_mode(retriever, mode, query_count):
+    # 쿼리 임베딩 캐시가 측정에 섞이지 않도록 모드와 측정 단계마다 다른 쿼리 사용
+    def make_queries(phase):
+        return [RETRIEVAL_QUERIES[i % len(RETRIEVAL_QUERIES)] + f" {mode} {phase} {i}" for i in range(query_count)]
+
+    queries = make_queries("sequential")
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        query_start = time.perf_counter()
+        retriever.invoke(query)
+        latencies.append(time.perf_counter() - query_start)
+    sequential_seconds = time.perf_counter() - start
+
+    # 같은 쿼리 반복 (쿼리 임베딩 캐시 적중)
+    start = time.perf_counter()
+    for query in queries:
+        retriever.invoke(query)
+    cached_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    retriever.batch(make_queries("batch"))
+    batch_seconds = time.perf_counter() - start
+
+    result = {
+        "queries": query_count,
+        "sequential_qps": round(query_count / sequential_seconds, 2),
+        "cached_qps": round(query_count / cached_seconds, 2),
+        "batch_qps": round(query_count / batch_seconds, 2),
+        "latency_seconds": _distribution(latencies)
+    }
+    print(f"[retrieval] {mode}: sequential {result['sequential_qps']} QPS, cached {result['cached_qps']} QPS, "
+          f"batch {result['batch_qps']} QPS")
+    return result
+
+
+def bench_evaluations(counts, concurrency, risk_mode, report_mode, trace_memory):
+    """
+    평가 건수별 종단 간 지연 시간, 처리량, 최대 메모리를 측정합니다.
+
+    evaluate_ai_service_ethics()와 같은 기본 평가 엔진을 사용합니다.
+
+    Args:
+        counts (list): 평가 건수 목록 (예: [1, 10, 100])
+        concurrency (int): 동시에 실행할 최대 평가 수
+        risk_mode (str | None): 리스크 평가 모드
+        report_mode (str | None): 보고서 생성 모드
+        trace_memory (bool): tracemalloc으로 최대 메모리를 측정할지 여부
+
+    Returns:
+        dict: 엔진 생성 시간과 건수별 측정 결과
+    """
+    _, setup_seconds, _ = _measure(get_default_evaluator, False)
+    print(f"[evaluation] engine setup {setup_seconds:.2f}s")
+
+    runs = []
+    for count in counts:
+        items = [
+            {
+                "id": str(index),
+                "service_name": None,
+                "description": f"Service{index} 서비스는 금융 기관을 위한 AI 신용 평가 시스템입니다. (#{index})"
+            }
+            for index in range(count)
+        ]
+        results, elapsed, peak = _measure(
+            lambda: run_batch(items, max_concurrency=concurrency, risk_mode=risk_mode,
+                              report_mode=report_mode), trace_memory
+        )
+
+        registry = MetricsRegistry()
+        for item_result in results:
+            if item_result["result"] is not None:
+                registry.observe(item_result["result"]["metrics"])
+        node_summary = registry.summary()["nodes"]
+
+        runs.append({
+            "evaluations": count,
+            "concurrency": concurrency,
+            "failed": sum(1 for item_result in results if item_result["error"]),
+            "wall_seconds": round(elapsed, 4),
+            "throughput_per_second": round(count / elapsed, 3),
+            "latency_seconds": _distribution([item_result["latency"] for item_result in results]),
+            "peak_memory_mb": round(peak, 2) if peak is not None else None,
+            "node_wall_seconds": {
+                node: {key: _round(metrics["wall_seconds"][key]) for key in ("p50", "p95", "p99")}
+                for node, metrics in node_summary.items()
+            }
+        })
+        print(f"[evaluation] {count}건: {elapsed:.2f}s, {count / elapsed:.2f}건/s")
+
+    return {"engine_setup_seconds": round(setup_seconds, 4), "runs": runs}
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="AI 윤리 평가 시스템 오프라인 벤치마크")
+    parser.add_argument("--output", "-o", type=str, default="benchmarks/results.json",
+                        help="결과 JSON 파일 경로 (기본값: benchmarks/results.json)")
+    parser.add_argument("--evaluations", type=_parse_counts, default=[1, 10, 100],
+                        help="측정할 평가 건수 목록 (기본값: 1,10,100)")
+    parser.add_argument("--pdf-pages", type=_parse_counts, default=[10, 50, 200],
+                        help="합성 PDF 페이지 수 목록 (기본값: 10,50,200)")
+    parser.add_argument("--corpus-files", type=_parse_counts, default=[1, 4, 8],
+                        help="코퍼스 적재 측정에 사용할 PDF 파일 수 목록 (기본값: 1,4,8)")
+    parser.add_argument("--corpus-pages", type=int, default=50,
+                        help="코퍼스 PDF 파일당 페이지 수 (기본값: 50)")
+    parser.add_argument("--retrieval-queries", type=int, default=200,
+                        help="검색 처리량 측정에 사용할 쿼리 수 (기본값: 200)")
+    parser.add_argument("--concurrency", "-c", type=int, default=8,
+                        help="동시에 실행할 최대 평가 수 (기본값: 8)")
+    parser.add_argument("--risk-mode", type=str, choices=["combined", "per_category"],
+                        help="리스크 평가 모드")
+    parser.add_argument("--report-mode", type=str, choices=["llm", "template"],
+                        help="보고서 생성 모드")
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="가짜 LLM 호출당 지연 시간(초, 기본값: 0.05)")
+    parser.add_argument("--embedding-latency", type=float, default=0.01,
+                        help="가짜 임베딩 호출당 지연 시간(초, 기본값: 0.01)")
+    parser.add_argument("--search-latency", type=float, default=0.02,
+                        help="가짜 검색 호출당 지연 시간(초, 기본값: 0.02)")
+    parser.add_argument("--no-trace-memory", action="store_true",
+                        help="tracemalloc 메모리 측정을 끕니다 (측정 오버헤드 제거)")
+    args = parser.parse_args()
+
+    trace_memory = not args.no_trace_memory
+
+    with tempfile.TemporaryDirectory(prefix="ethics-bench-") as workdir:
+        # 인덱스 캐시, LLM 응답 캐시, 노드 출력 캐시가 측정에 섞이지 않도록 분리
+        os.environ["INDEX_CACHE_DIR"] = os.path.join(workdir, "index")
+        set_llm_cache(None)
+        set_node_cache(None)
+        set_query_embedding_cache(QueryEmbeddingCache(path=os.path.join(workdir, "embedding_cache.sqlite")))
+        use_fake_backends(
+            llm_latency=args.llm_latency,
+            embedding_latency=args.embedding_latency,
+            search_latency=args.search_latency
+        )
+
+        ingestion, retriever = bench_ingestion(args.pdf_pages, workdir, trace_memory)
+        corpus = bench_corpus_ingestion(args.corpus_files, args.corpus_pages, workdir, trace_memory)
+        retrieval = bench_retrieval(retriever, args.retrieval_queries) if retriever else None
+        evaluation = bench_evaluations(args.evaluations, args.concurrency, args.risk_mode,
+                                       args.report_mode, trace_memory)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                "llm_latency": args.llm_latency,
+                "embedding_latency": args.embedding_latency,
+                "search_latency": args.search_latency,
+                "concurrency": args.concurrency,
+                "risk_mode": args.risk_mode,
+                "report_mode": args.report_mode,
+                "trace_memory": trace_memory
+            }
+        },
+        "ingestion": ingestion,
+        "corpus_ingestion": corpus,
+        "retrieval": retrieval,
+        "evaluation": evaluation,
+        "max_rss_mb": round(_max_rss_mb(), 2)
+    }
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n벤치마크 결과가 저장되었습니다: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+벤치마크용 합성 가이드라인 PDF 생성
+"""
+
+import random
+
+TOPICS = ("fairness", "privacy", "transparency", "safety", "accountability",
+          "human oversight", "data governance", "robustness", "explainability")
+
+SENTENCE_TEMPLATES = (
+    "AI systems should ensure {topic} throughout the entire lifecycle of the service.",
+    "Developers must document how {topic} risks are identified, measured and mitigated.",
+    "Organizations are expected to review {topic} controls before deploying high impact models.",
+    "Users affected by automated decisions should be informed about {topic} safeguards.",
+    "Independent audits help verify that {topic} requirements are continuously satisfied.",
+    "Guideline {section} describes recommended practices for {topic} in public services.",
+)
+
+LINES_PER_PAGE = 50
+LINE_HEIGHT = 14
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_lines(rng, page_number):
+    lines = [f"Section {page_number}. AI Ethics Guideline"]
+    while len(lines) < LINES_PER_PAGE:
+        template = rng.choice(SENTENCE_TEMPLATES)
+        lines.append(template.format(topic=rng.choice(TOPICS), section=f"{page_number}.{len(lines)}"))
+    return lines
+
+
+def _content_stream(lines):
+    commands = ["BT", "/F1 10 Tf", f"{LINE_HEIGHT} TL", "40 800 Td"]
+    for line in lines:
+        commands.append(f"({_escape(line)}) Tj T*")
+    commands.append("ET")
+    return "\n".join(commands).encode("latin-1")
+
+
+def write_synthetic_pdf(path, pages, seed=0):
+    """
+    영어 문장으로 구성된 합성 AI 윤리 가이드라인 PDF를 생성합니다.
+
+    외부 라이브러리 없이 PDF 구조를 직접 기록하며, 같은 seed와 페이지 수에는
+    항상 같은 파일을 만듭니다.
+
+    Args:
+        path (str): 저장할 PDF 경로
+        pages (int): 페이지 수
+        seed (int): 문장 생성 난수 시드
+
+    Returns:
+        str: 저장된 PDF 경로
+    """
+    rng = random.Random(seed)
+
+    # 객체 번호: 1 Catalog, 2 Pages, 3 Font, 이후 페이지마다 (Page, Contents)
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_number in range(1, pages + 1):
+        stream = _content_stream(_page_lines(rng, page_number))
+        page_id = len(objects) + 1
+        contents_id = page_id + 1
+        page_ids.append(page_id)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contents_id} 0 R >>".encode("latin-1")
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    with open(path, "wb") as f:
+        f.write(output)
+    return path
@@ -3,7 +3,24 @@
 """
 
 import logging
-from langchain_teddynote import logging as ls_logging
+import os
+
+LANGSMITH_PROJECT = "ai-ethics-evaluation-system"
+
+
+def is_langsmith_enabled():
+    """
+    LangSmith 추적 사용 여부를 반환합니다.
+
+    LANGSMITH_TRACING=true로 명시적으로 켜고 API 키가 있을 때만 사용합니다.
+    노드별 실행 지표(src.metrics)는 LangSmith 없이도 수집됩니다.
+
+    Returns:
+        bool: LangSmith 사용 여부
+    """
+    if os.getenv("LANGSMITH_TRACING", "").lower() not in ("true", "1"):
+        return False
+    return bool(os.getenv("LANGSMITH_API_KEY") or os.getenv("LANGCHAIN_API_KEY"))
 
 
 def setup_logging():
@@ -11,8 +28,10 @@ def setup_logging():
     # PDF 로깅 설정 - 오류 메시지만 표시
     logging.getLogger('pdfminer').setLevel(logging.ERROR)
     
-    # LangSmith 로깅 설정
-    ls_logging.langsmith("ai-ethics-evaluation-system")
+    # LangSmith 로깅 설정 (켠 경우에만 langchain_teddynote를 불러옴)
+    if is_langsmith_enabled():
+        from langchain_teddynote import logging as ls_logging
+        ls_logging.langsmith(os.getenv("LANGSMITH_PROJECT") or LANGSMITH_PROJECT)
     
     # 기본 로깅 설정
     logging.basicConfig(
@@ -20,4 +39,4 @@ def setup_logging():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    return logging.getLogger(__name__)
\ No newline at end of file
+    return logging.getLogger(__name__)
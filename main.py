@@ -4,6 +4,7 @@ AI 윤리 평가 시스템 - 메인 실행 파일
 """
 
 import argparse
+import json
 import sys
 import os
 from datetime import datetime
@@ -12,15 +13,21 @@ from dotenv import load_dotenv
 # 환경 변수 로드
 load_dotenv()
 
-# LangSmith 로깅 설정
+# 로깅 및 LangSmith(선택) 설정
 from config.logging_config import setup_logging
 setup_logging()
 
-from src.workflow.graph import evaluate_ai_service_ethics
+# 워크플로우, LLM, 검색 모듈은 LangChain/LangGraph를 불러오므로 명령을 실행할 때 가져옴
+# (--help와 인자 파싱은 이 비용을 치르지 않음, benchmarks/import_time.py 참고)
+from src.metrics import get_metrics_registry
 
 
-def main():
-    """메인 함수"""
+def build_parser():
+    """명령행 인자 파서를 생성합니다.
+
+    Returns:
+        argparse.ArgumentParser: 인자 파서
+    """
     parser = argparse.ArgumentParser(description="AI 서비스 윤리 평가 시스템")
     parser.add_argument("description", type=str, nargs="?",
                         help="평가할 AI 서비스에 대한 설명")
@@ -28,7 +35,54 @@ def main():
                         help="보고서를 저장할 파일 경로 (기본값: 'reports' 폴더)")
     parser.add_argument("--format", "-f", type=str, choices=["md", "txt"], default="md",
                         help="보고서 파일 형식 (md 또는 txt, 기본값: md)")
-    args = parser.parse_args()
+    parser.add_argument("--batch", "-b", type=str,
+                        help="여러 서비스 설명을 담은 JSONL/CSV 파일 경로 (배치 평가)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4,
+                        help="배치 평가 시 동시에 실행할 최대 평가 수 (기본값: 4)")
+    parser.add_argument("--risk-mode", type=str, choices=["combined", "per_category"],
+                        help="리스크 평가 모드 (combined: 단일 호출, per_category: 항목별 동시 평가)")
+    parser.add_argument("--report-mode", type=str, choices=["llm", "template"],
+                        help="보고서 생성 모드 (llm: LLM 작성, template: LLM 없이 구조화된 결과로 렌더링)")
+    parser.add_argument("--model-routing", type=str, choices=["cascade", "fixed"],
+                        help="모델 라우팅 정책 (cascade: 빠른 모델 우선, 고위험 플래그/검증 실패/경계 점수만 강한 모델, "
+                             "fixed: 노드별 고정 모델)")
+    parser.add_argument("--stream", action="store_true",
+                        help="노드 결과와 보고서를 생성되는 즉시 출력하고 파일에 기록합니다")
+    parser.add_argument("--metrics-out", type=str,
+                        help="노드별 실행 지표를 저장할 파일 경로 (.json 또는 Prometheus 형식 .prom)")
+    parser.add_argument("--list-incomplete", action="store_true",
+                        help="체크포인트에 남아 있는 미완료 평가 목록을 출력합니다")
+    parser.add_argument("--resume", type=str, metavar="THREAD_ID",
+                        help="미완료 평가를 이어서 실행합니다 (all이면 모든 미완료 평가)")
+    parser.add_argument("--build-context-packs", action="store_true",
+                        help="가이드라인 PDF에서 윤리 항목별 컨텍스트 팩을 미리 생성합니다")
+    parser.add_argument("--pdf-path", type=str,
+                        help="컨텍스트 팩을 생성할 가이드라인 PDF 파일 또는 디렉토리 "
+                             "(기본값: 환경 변수 PDF_PATH 또는 data 폴더의 기본 PDF)")
+    parser.add_argument("--pack-tokens", type=int,
+                        help="컨텍스트 팩의 항목별 최대 토큰 수 (기본값: 컨텍스트 팩 기본 예산)")
+    parser.add_argument("--explain-cache", action="store_true",
+                        help="평가가 끝난 뒤 노드별로 저장된 출력을 재사용했는지, 다시 실행했는지 출력합니다")
+    return parser
+
+
+def main():
+    """메인 함수"""
+    args = build_parser().parse_args()
+
+    # 컨텍스트 팩 생성
+    if args.build_context_packs:
+        return run_build_context_packs_command(args)
+
+    # 미완료 평가 조회 및 재개
+    if args.list_incomplete:
+        return run_list_incomplete_command()
+    if args.resume:
+        return run_resume_command(args)
+
+    # 배치 평가
+    if args.batch:
+        return run_batch_command(args)
 
     # 서비스 설명이 제공되지 않은 경우 예시 사용
     if args.description:
@@ -42,9 +96,15 @@ def main():
         """
         print("서비스 설명이 제공되지 않아 예시를 사용합니다.")
 
+    # 스트리밍 평가
+    if args.stream:
+        return run_stream_command(args, service_description)
+
     # 윤리 평가 실행
+    from src.workflow.engine import evaluate_ai_service_ethics
     try:
-        result = evaluate_ai_service_ethics(service_description)
+        result = evaluate_ai_service_ethics(service_description, risk_mode=args.risk_mode,
+                                            report_mode=args.report_mode, model_routing=args.model_routing)
         
         # 최종 보고서 출력
         print("\n===== AI 윤리 평가 최종 보고서 =====\n")
@@ -53,20 +113,293 @@ def main():
         # 보고서 파일로 저장
         save_report_to_file(result["final_report"], args.output, args.format, result["service_info"].get("service_name", "AI_Service") if result["service_info"] else "AI_Service")
         
+        if args.metrics_out:
+            save_metrics_to_file(args.metrics_out, result["metrics"])
+
+        if args.explain_cache:
+            print_cache_explanation(result["metrics"])
+        
         return 0
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         return 1
 
 
-def save_report_to_file(report_content, output_path=None, file_format="md", service_name="AI_Service"):
-    """보고서를 파일로 저장합니다.
+def print_node_result(node, update):
+    """스트리밍 평가에서 노드가 끝날 때마다 주요 결과를 출력합니다.
+
+    Args:
+        node (str): 완료된 노드 이름
+        update (dict): 노드가 갱신한 상태
+    """
+    if node == "analyze_service" and update.get("service_info"):
+        service_info = update["service_info"]
+        print(f"[서비스 분석] {service_info.get('service_name')} - {service_info.get('primary_function')}")
+    elif node == "assess_risks" and update.get("risk_assessment"):
+        risk_assessment = update["risk_assessment"]
+        scores = ", ".join(f"{item['category']} {item['score']}"
+                           for item in risk_assessment.get("risk_assessments", []))
+        print(f"[리스크 평가] 전체 {risk_assessment.get('overall_risk_score')}/5 "
+              f"| 최고 리스크: {risk_assessment.get('highest_risk_area')} | {scores}")
+    elif node == "suggest_improvements" and update.get("improvement_suggestions"):
+        print(f"[개선안] 우선 개선 영역: {update['improvement_suggestions'].get('priority_area')}")
+    elif node != "generate_report":
+        print(f"[{node}] 완료")
+
+    # 오류로 워크플로우가 종료된 경우 마지막 메시지 출력
+    if update.get("next") == "end" and node != "generate_report" and update.get("messages"):
+        print(f"[{node}] {update['messages'][-1].content}")
+
+
+def print_cache_explanation(metrics):
+    """노드별 메모이제이션 결과(재사용/재실행)와 LLM 호출 수를 출력합니다.
+
+    Args:
+        metrics (dict): 실행 지표 (RunMetrics.to_dict() 결과)
+    """
+    labels = {"reused": "재사용", "recomputed": "다시 실행"}
+    print("\n===== 노드 캐시 =====")
+    for record in metrics["nodes"]:
+        status = labels.get(record.get("cache"), "메모이제이션 대상 아님")
+        fingerprint = (record.get("fingerprint") or "")[:12] or "-"
+        print(f"{record['node']:<32} {status:<12} 지문 {fingerprint:<12} LLM 호출 {record['llm_calls']}회")
+    totals = metrics["totals"]
+    print(f"재사용 노드 {totals['node_cache_hits']}개, LLM 호출 {totals['llm_calls']}회")
+
+
+def run_stream_command(args, service_description):
+    """평가 진행 상황과 보고서 토큰을 도착하는 즉시 출력하고 보고서 파일에 이어 씁니다.
+
+    Args:
+        args (argparse.Namespace): 명령행 인자
+        service_description (str): 평가할 AI 서비스 설명
+
+    Returns:
+        int: 보고서가 생성되면 0, 아니면 1
+    """
+    from src.workflow.engine import get_default_evaluator
+
+    service_name = "AI_Service"
+    report_path = None
+    report_file = None
+    result = None
+
+    try:
+        for event in get_default_evaluator().stream(service_description, risk_mode=args.risk_mode,
+                                                     report_mode=args.report_mode,
+                                                     model_routing=args.model_routing):
+            if event["type"] == "node":
+                if event["node"] == "analyze_service" and event["update"].get("service_info"):
+                    service_name = event["update"]["service_info"].get("service_name", service_name)
+                print_node_result(event["node"], event["update"])
+            elif event["type"] == "token":
+                if report_file is None:
+                    print("\n===== AI 윤리 평가 최종 보고서 =====\n")
+                    report_path = resolve_report_path(args.output, args.format, service_name)
+                    report_file = open(report_path, "w", encoding="utf-8")
+                sys.stdout.write(event["text"])
+                sys.stdout.flush()
+                report_file.write(event["text"])
+                report_file.flush()
+            else:
+                result = event["result"]
+    except Exception as e:
+        print(f"\n오류 발생: {str(e)}")
+        return 1
+    finally:
+        if report_file is not None:
+            report_file.close()
+
+    if report_path is not None:
+        print(f"\n\n보고서가 저장되었습니다: {report_path}")
+
+    if result is not None and args.metrics_out:
+        save_metrics_to_file(args.metrics_out, result["metrics"])
+
+    if result is not None and args.explain_cache:
+        print_cache_explanation(result["metrics"])
+
+    return 0 if result is not None and result["final_report"] else 1
+
+
+def run_build_context_packs_command(args):
+    """가이드라인 PDF에서 윤리 항목별 컨텍스트 팩을 생성해 인덱스 옆에 저장합니다.
+
+    Args:
+        args (argparse.Namespace): 명령행 인자
+
+    Returns:
+        int: 성공하면 0, 실패하면 1
+    """
+    from src.nodes.risk import category_pack_queries
+    from src.retrieval import DEFAULT_PACK_TOKEN_BUDGET, build_guideline_context_packs
+
+    try:
+        context_packs, cache_path = build_guideline_context_packs(
+            category_pack_queries(),
+            pdf_path=args.pdf_path,
+            token_budget=args.pack_tokens or DEFAULT_PACK_TOKEN_BUDGET
+        )
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        return 1
+
+    for category, pack in context_packs.items():
+        print(f"[{category}] 청크 {pack['chunks']}개, 약 {pack['tokens']}토큰")
+    print(f"\n컨텍스트 팩이 저장되었습니다: {cache_path}")
+    return 0
+
+
+def run_list_incomplete_command():
+    """체크포인트에 남아 있는 미완료 평가 목록을 출력합니다.
+
+    Returns:
+        int: 항상 0
+    """
+    from src.workflow.engine import get_default_evaluator
+
+    runs = get_default_evaluator().list_incomplete_runs()
+    if not runs:
+        print("미완료 평가가 없습니다.")
+        return 0
+
+    for run in runs:
+        description = " ".join((run["service_description"] or "").split())
+        options = ", ".join(f"{key}={value}" for key, value in run["options"].items()) or "-"
+        print(f"{run['thread_id']} | {run['updated_at']} | 다음 노드: {', '.join(run['next'])} "
+              f"| 옵션: {options} | {description[:60]}")
+    return 0
+
+
+def run_resume_command(args):
+    """미완료 평가를 마지막으로 완료된 노드 다음부터 이어서 실행하고 보고서를 저장합니다.
+
+    Args:
+        args (argparse.Namespace): 명령행 인자 (resume: 스레드 ID 또는 all)
+
+    Returns:
+        int: 모든 평가가 보고서를 생성하면 0, 아니면 1
+    """
+    from src.workflow.engine import get_default_evaluator
+
+    evaluator = get_default_evaluator()
+    if args.resume == "all":
+        thread_ids = [run["thread_id"] for run in evaluator.list_incomplete_runs()]
+        if not thread_ids:
+            print("미완료 평가가 없습니다.")
+            return 0
+    else:
+        thread_ids = [args.resume]
+
+    failed = 0
+    for thread_id in thread_ids:
+        try:
+            result = evaluator.resume(thread_id)
+        except Exception as e:
+            print(f"[{thread_id}] 오류 발생: {str(e)}")
+            failed += 1
+            continue
+
+        if not result["final_report"]:
+            print(f"[{thread_id}] 워크플로우가 보고서를 생성하지 못하고 종료되었습니다.")
+            failed += 1
+            continue
+
+        print(f"\n===== AI 윤리 평가 최종 보고서 ({thread_id}) =====\n")
+        print(result["final_report"])
+        service_name = (result["service_info"] or {}).get("service_name", "AI_Service")
+        save_report_to_file(result["final_report"], args.output if len(thread_ids) == 1 else None,
+                            args.format, service_name)
+
+    if args.metrics_out:
+        save_metrics_to_file(args.metrics_out)
+    return 1 if failed else 0
+
+
+def run_batch_command(args):
+    """배치 입력 파일의 서비스들을 동시에 평가하고 서비스별 보고서를 저장합니다.
+
+    Args:
+        args (argparse.Namespace): 명령행 인자
+
+    Returns:
+        int: 모든 항목이 성공하면 0, 하나라도 실패하면 1
+    """
+    from src.workflow.batch import load_service_descriptions, run_batch
+
+    items = load_service_descriptions(args.batch)
+    if not items:
+        print("평가할 서비스 설명이 없습니다.")
+        return 1
+
+    # 배치 보고서는 항상 디렉토리에 저장
+    output_dir = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+    os.makedirs(output_dir, exist_ok=True)
+
+    total = len(items)
+    completed = []
+
+    def on_complete(item_result):
+        completed.append(item_result)
+        prefix = f"[{len(completed)}/{total}]"
+        result = item_result["result"]
+        if item_result["error"]:
+            print(f"{prefix} {item_result['id']} | 실패: {item_result['error']} | {item_result['latency']:.1f}s")
+            return
+
+        service_info = result["service_info"] or {}
+        risk_assessment = result["risk_assessment"] or {}
+        service_name = item_result["service_name"] or service_info.get("service_name", "AI_Service")
+        save_report_to_file(result["final_report"], output_dir, args.format,
+                            f"{item_result['id']}_{service_name}")
+        print(f"{prefix} {service_name} | overall_risk_score={risk_assessment.get('overall_risk_score')} "
+              f"| highest_risk_area={risk_assessment.get('highest_risk_area')} | {item_result['latency']:.1f}s")
+
+    run_batch(items, max_concurrency=args.concurrency, on_complete=on_complete,
+              risk_mode=args.risk_mode, report_mode=args.report_mode, model_routing=args.model_routing)
+
+    failed = sum(1 for item_result in completed if item_result["error"])
+    print(f"\n배치 평가 완료: 성공 {total - failed}건, 실패 {failed}건")
+
+    if args.metrics_out:
+        save_metrics_to_file(args.metrics_out)
+    return 1 if failed else 0
+
+
+def save_metrics_to_file(path, run_metrics=None):
+    """실행 지표를 파일로 저장합니다.
+
+    .prom 확장자는 누적 집계를 Prometheus 텍스트 형식으로, 그 밖에는 JSON으로 저장합니다.
+    단일 실행 지표가 주어지면 JSON에는 해당 실행의 노드별 지표를, 없으면 p50/p95/p99 집계를 기록합니다.
+
+    Args:
+        path (str): 저장할 파일 경로
+        run_metrics (dict, optional): 단일 실행 지표 (evaluate 결과의 metrics)
+    """
+    registry = get_metrics_registry()
+    if path.endswith(".prom"):
+        content = registry.to_prometheus()
+    elif run_metrics is not None:
+        content = json.dumps(run_metrics, ensure_ascii=False, indent=2)
+    else:
+        content = registry.to_json()
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+    print(f"실행 지표가 저장되었습니다: {path}")
+
+
+def resolve_report_path(output_path=None, file_format="md", service_name="AI_Service"):
+    """보고서를 저장할 파일 경로를 결정합니다.
     
     Args:
-        report_content (str): 보고서 내용
-        output_path (str): 저장할 파일 경로 (없으면 기본 경로 사용)
+        output_path (str): 저장할 파일 또는 디렉토리 경로 (없으면 기본 경로 사용)
         file_format (str): 파일 형식 (md 또는 txt)
         service_name (str): 서비스 이름 (파일명에 사용)
+
+    Returns:
+        str: 보고서 파일 경로
     """
     # 현재 날짜와 시간을 파일명에 포함
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -93,6 +426,20 @@ def save_report_to_file(report_content, output_path=None, file_format="md", serv
         else:
             # 확장자가 없는 경우 추가
             output_path += f".{file_format}"
+
+    return output_path
+
+
+def save_report_to_file(report_content, output_path=None, file_format="md", service_name="AI_Service"):
+    """보고서를 파일로 저장합니다.
+    
+    Args:
+        report_content (str): 보고서 내용
+        output_path (str): 저장할 파일 경로 (없으면 기본 경로 사용)
+        file_format (str): 파일 형식 (md 또는 txt)
+        service_name (str): 서비스 이름 (파일명에 사용)
+    """
+    output_path = resolve_report_path(output_path, file_format, service_name)
     
     # 파일 저장
     with open(output_path, "w", encoding="utf-8") as f:
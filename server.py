@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+AI 윤리 평가 시스템 - HTTP 서버 실행 파일
+"""
+
+import argparse
+import logging
+import sys
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로깅 및 LangSmith(선택) 설정
+from config.logging_config import setup_logging
+setup_logging()
+
+from src.server import JobManager, create_server
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="AI 서비스 윤리 평가 HTTP 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="바인딩할 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", "-p", type=int, default=8000,
+                        help="바인딩할 포트 (기본값: 8000)")
+    parser.add_argument("--workers", "-w", type=int, default=4,
+                        help="동시에 실행할 최대 평가 수 (기본값: 4)")
+    parser.add_argument("--max-queue", type=int, default=100,
+                        help="대기할 수 있는 최대 작업 수, 초과 시 429 응답 (기본값: 100)")
+    parser.add_argument("--pdf-path", type=str,
+                        help="AI 윤리 가이드라인 PDF 파일 또는 디렉토리 (여러 경로는 os.pathsep으로 구분)")
+    parser.add_argument("--fake", action="store_true",
+                        help="OpenAI/Tavily 대신 로컬 가짜 백엔드를 사용합니다 (로컬 테스트용)")
+    parser.add_argument("--fake-latency", type=float, default=0.0,
+                        help="가짜 LLM 호출당 지연 시간(초, 기본값: 0)")
+    args = parser.parse_args()
+
+    if args.fake:
+        from src.fakes import use_fake_backends
+        use_fake_backends(llm_latency=args.fake_latency)
+        logger.info("가짜 LLM/임베딩/검색 백엔드를 사용합니다.")
+
+    # 검색 인덱스와 워크플로우는 시작 시 한 번만 구성
+    from src.workflow.engine import EthicsEvaluator
+    evaluator = EthicsEvaluator(args.pdf_path)
+    job_manager = JobManager(evaluator, max_workers=args.workers, max_queue=args.max_queue)
+    server = create_server(job_manager, args.host, args.port)
+
+    logger.info(f"평가 서버 시작: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("서버 종료 중...")
+    finally:
+        server.server_close()
+        job_manager.shutdown(wait=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
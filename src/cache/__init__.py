@@ -0,0 +1,9 @@
+"""
+cache 패키지 초기화
+"""
+
+from src.cache.lru import LRUCache
+from src.cache.sqlite_store import SQLiteStore
+from src.cache.singleflight import SingleFlight
+
+__all__ = ['LRUCache', 'SQLiteStore', 'SingleFlight']
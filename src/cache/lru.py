@@ -0,0 +1,87 @@
+"""
+메모리 LRU 캐시
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    스레드 안전한 크기 제한 LRU 캐시
+
+    가장 오래 사용되지 않은 항목부터 제거합니다. 유효 시간을 지정하면 만료된 항목은
+    조회할 때 제거합니다.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=None):
+        """
+        Args:
+            max_entries (int): 보관할 최대 항목 수
+            ttl_seconds (float, optional): 항목 유효 시간(초). None이면 만료되지 않습니다.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        키에 해당하는 값을 반환하고 최근 사용 항목으로 표시합니다.
+
+        Args:
+            key: 캐시 키
+            default: 항목이 없을 때 반환할 값
+
+        Returns:
+            Any: 캐시된 값 또는 default
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at=None):
+        """
+        값을 저장하고 최대 크기를 넘으면 오래된 항목을 제거합니다.
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at (float, optional): 만료 시각(time.time() 기준). 영속 계층에서 올린 항목의
+                                          남은 유효 시간을 유지할 때 사용합니다. None이면 ttl_seconds로 계산합니다.
+        """
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """
+        항목을 제거합니다.
+
+        Args:
+            key: 캐시 키
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
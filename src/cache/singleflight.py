@@ -0,0 +1,61 @@
+"""
+동일 요청 병합(single-flight)
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나로 합칩니다.
+
+    첫 번째 호출만 함수를 실행하고, 실행 중에 들어온 같은 키의 호출은 그 결과
+    (또는 예외)를 함께 받습니다. 실행이 끝나면 키는 해제됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        키에 대한 진행 중인 호출이 있으면 기다리고, 없으면 func를 실행합니다.
+
+        Args:
+            key: 병합 기준 키
+            func (callable): 인자 없는 실행 함수
+
+        Returns:
+            tuple: (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result, False
@@ -0,0 +1,158 @@
+"""
+SQLite 기반 영속 키-값 저장소
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteStore:
+    """
+    TTL과 크기 제한을 지원하는 SQLite 키-값 저장소
+
+    값은 문자열로 저장하며, 만료된 항목과 최대 개수를 넘는 항목(마지막 접근이
+    가장 오래된 순)은 주기적으로 제거됩니다. 하나의 파일에 여러 테이블을 둘 수 있습니다.
+    """
+
+    # 이 횟수만큼 기록할 때마다 만료/크기 정리를 수행
+    EVICT_INTERVAL = 64
+
+    def __init__(self, path, table="entries", ttl_seconds=None, max_entries=None):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            table (str): 사용할 테이블 이름
+            ttl_seconds (float, optional): 항목 유효 시간(초). None이면 만료되지 않습니다.
+            max_entries (int, optional): 보관할 최대 항목 수. None이면 제한하지 않습니다.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"잘못된 테이블 이름입니다: {table}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)"
+            )
+
+    def get(self, key, include_expired=False):
+        """
+        유효한 항목의 값을 반환합니다.
+
+        Args:
+            key (str): 키
+            include_expired (bool): True면 만료된 항목도 삭제하지 않고 반환합니다.
+
+        Returns:
+            str | None: 저장된 값. 없거나 만료되었으면 None
+        """
+        entry = self.get_entry(key, include_expired)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key, include_expired=False):
+        """
+        유효한 항목의 값과 만료 시각을 반환합니다.
+
+        Args:
+            key (str): 키
+            include_expired (bool): True면 만료된 항목도 삭제하지 않고 반환합니다.
+
+        Returns:
+            tuple | None: (저장된 값, 만료 시각 또는 None). 없거나 만료되었으면 None
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < now and not include_expired:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return value, expires_at
+
+    def set(self, key, value, ttl_seconds=None):
+        """
+        값을 저장합니다.
+
+        Args:
+            key (str): 키
+            value (str): 저장할 값
+            ttl_seconds (float, optional): 이 항목에만 적용할 유효 시간(초)
+        """
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, created_at, accessed_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_INTERVAL == 0:
+                self._evict(now)
+
+    def delete(self, key):
+        """
+        항목을 제거합니다.
+
+        Args:
+            key (str): 키
+        """
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def evict(self):
+        """만료된 항목과 최대 개수를 넘는 항목을 즉시 제거합니다."""
+        with self._lock, self._conn:
+            self._evict(time.time())
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now):
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+        )
+        if self.max_entries is not None:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                logger.info(f"{self.table} 캐시 항목 {overflow}개 제거 (최대 {self.max_entries}개)")
@@ -0,0 +1,334 @@
+"""
+네트워크 없이 워크플로우를 실행하기 위한 결정적 가짜 백엔드
+
+OpenAI 채팅 모델/임베딩과 Tavily 검색을 같은 인터페이스의 로컬 구현으로 대체합니다.
+같은 입력에는 항상 같은 출력을 반환하며, 지연 시간과 분당 요청 한도(429 응답)를 설정해
+실제 API 호출을 흉내 낼 수 있습니다.
+벤치마크와 오프라인 실행에 사용합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.llm import set_model_factories
+from src.ratelimit import TokenBucket
+from src.retrieval import LOCAL_RAG_PROMPT, set_rag_prompt
+from src.search import SearchClient, set_search_tool
+from src.workflow import set_node_cache
+
+RISK_CATEGORY_NAMES = ("공정성", "프라이버시", "투명성", "안전성", "책임성")
+
+
+def _digest(text):
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16)
+
+
+def _score(text, category):
+    return _digest(f"{category}:{text}") % 5 + 1
+
+
+def _service_name(prompt):
+    match = re.search(r"## 분석 대상 AI 서비스\s+(\S+)", prompt)
+    name = match.group(1) if match else "AI_Service"
+    return re.sub(r"[^\w가-힣]", "", name) or "AI_Service"
+
+
+def _risk_item(prompt, category):
+    return {
+        "category": category,
+        "score": _score(prompt, category),
+        "rationale": f"{category} 항목의 평가 근거",
+        "risk_factors": [f"{category} 위험요소 1", f"{category} 위험요소 2"],
+        "evidence": f"{category} 관련 증거"
+    }
+
+
+def _analysis_response(prompt):
+    digest = _digest(prompt)
+    flags = ("critical_decisions", "vulnerable_users", "sensitive_topics",
+             "personal_data_processing", "severe_malfunction_risk")
+    return {
+        "service_name": _service_name(prompt),
+        "primary_function": "AI 기반 자동화 서비스",
+        "detailed_description": "서비스 기능 및 목적 상세 설명",
+        "target_users": "일반 사용자",
+        "data_sources": ["사용자 데이터", "공개 데이터"],
+        "model_type": "머신러닝",
+        "decision_impact": ("높음", "중간", "낮음")[digest % 3],
+        "user_interaction": "웹/모바일 앱",
+        "risk_flags": {flag: bool(digest >> index & 1) for index, flag in enumerate(flags)},
+        "additional_notes": ""
+    }
+
+
+def _risk_response(prompt):
+    items = [_risk_item(prompt, category) for category in RISK_CATEGORY_NAMES]
+    highest = max(items, key=lambda item: item["score"])
+    return {
+        "risk_assessments": items,
+        "overall_risk_score": round(sum(item["score"] for item in items) / len(items), 1),
+        "highest_risk_area": highest["category"],
+        "summary": "종합적인 리스크 평가 요약"
+    }
+
+
+def _improvement_response(prompt):
+    match = re.search(r'"priority_area": "([^"]+)"', prompt)
+    return {
+        "priority_area": match.group(1) if match else RISK_CATEGORY_NAMES[0],
+        "improvement_plan": [
+            {
+                "area": category,
+                "suggestions": [
+                    {
+                        "title": f"{category} 개선안 {index}",
+                        "description": "상세 설명",
+                        "difficulty": ("상", "중", "하")[index % 3],
+                        "expected_impact": "기대효과"
+                    }
+                    for index in range(1, 4)
+                ]
+            }
+            for category in RISK_CATEGORY_NAMES
+        ],
+        "implementation_roadmap": "전체 개선안 로드맵 요약"
+    }
+
+
+def _report_response(prompt):
+    return (
+        "# SUMMARY\n"
+        "가짜 백엔드로 생성된 AI 윤리 평가 보고서입니다.\n\n"
+        "## 서비스 개요\n서비스 개요 설명\n\n"
+        "## 윤리적 리스크 평가 결과\n리스크 평가 결과 설명\n\n"
+        "## 개선안\n개선안 설명\n\n"
+        "## Executive Summary\n경영진 요약\n"
+    )
+
+
+def fake_response(prompt):
+    """
+    워크플로우 노드 프롬프트에 맞는 결정적 응답을 생성합니다.
+
+    프롬프트 제목으로 노드를 구분해 각 노드가 기대하는 JSON 또는 마크다운을 반환합니다.
+
+    Args:
+        prompt (str): 렌더링된 프롬프트
+
+    Returns:
+        str: 응답 텍스트
+    """
+    if "분석 에이전트" in prompt:
+        return "```json\n" + json.dumps(_analysis_response(prompt), ensure_ascii=False) + "\n```"
+    if "리스크 진단" in prompt:
+        match = re.search(r"평가 대상 항목: (\S+?)\(", prompt)
+        if match:
+            return json.dumps(_risk_item(prompt, match.group(1)), ensure_ascii=False)
+        return json.dumps(_risk_response(prompt), ensure_ascii=False)
+    if "개선안 제안" in prompt:
+        return json.dumps(_improvement_response(prompt), ensure_ascii=False)
+    return _report_response(prompt)
+
+
+class FakeRateLimitError(Exception):
+    """가짜 백엔드의 요청 한도를 넘었을 때 발생합니다 (OpenAI RateLimitError처럼 status_code 429)."""
+
+    status_code = 429
+
+
+class FakeQuota:
+    """
+    제공자의 분당 요청 한도를 흉내 내는 할당량
+
+    분당 한도 비율로 연속해서 채워지는 버킷에서 요청마다 1을 차감하고,
+    남은 양이 없으면 FakeRateLimitError(429)를 발생시킵니다. 여러 스레드에서 공유합니다.
+    """
+
+    def __init__(self, per_minute, burst_seconds=10):
+        """
+        Args:
+            per_minute (float): 분당 요청 한도
+            burst_seconds (float): 한 번에 몰아 쓸 수 있는 양 (분당 한도의 몇 초 분량인지)
+        """
+        self.bucket = TokenBucket(per_minute, per_minute * burst_seconds / 60.0, time.monotonic())
+        self.accepted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def check(self):
+        """
+        요청 하나를 차감합니다.
+
+        Raises:
+            FakeRateLimitError: 한도를 넘은 경우
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.bucket.wait_time(1, now) > 0:
+                self.rejected += 1
+                raise FakeRateLimitError("Rate limit reached for fake model (429)")
+            self.bucket.consume(1, now)
+            self.accepted += 1
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    ChatOpenAI 대신 사용하는 결정적 채팅 모델
+
+    latency초 + 출력 토큰당 latency_per_token초 만큼 대기한 뒤 응답합니다.
+    quota가 있으면 호출마다 할당량을 차감하고, 넘으면 429 오류를 발생시킵니다.
+    """
+
+    model_name: str = "fake"
+    temperature: Optional[float] = None
+    latency: float = 0.0
+    latency_per_token: float = 0.0
+    quota: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @staticmethod
+    def _prompt_text(messages) -> str:
+        return "\n".join(str(message.content) for message in messages)
+
+    def _build_result(self, prompt) -> ChatResult:
+        content = fake_response(prompt)
+        usage = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": len(prompt) // 4 + len(content) // 4
+        }
+        message = AIMessage(content=content, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _delay(self, content) -> float:
+        return self.latency + self.latency_per_token * (len(content) // 4)
+
+    def _check_quota(self):
+        if self.quota is not None:
+            self.quota.check()
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self._check_quota()
+        result = self._build_result(self._prompt_text(messages))
+        time.sleep(self._delay(result.generations[0].message.content))
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self._check_quota()
+        result = self._build_result(self._prompt_text(messages))
+        await asyncio.sleep(self._delay(result.generations[0].message.content))
+        return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self._check_quota()
+        result = self._build_result(self._prompt_text(messages))
+        message = result.generations[0].message
+        time.sleep(self.latency)
+        for token in re.findall(r"\S+\s*|\s+", message.content):
+            time.sleep(self.latency_per_token)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        # 마지막 청크에 토큰 사용량 전달 (OpenAI stream_usage와 같은 방식)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=message.usage_metadata))
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """
+    OpenAIEmbeddings 대신 사용하는 결정적 임베딩
+
+    호출당 latency초 + 텍스트당 latency_per_text초 만큼 대기합니다.
+    """
+
+    latency: float = 0.0
+    latency_per_text: float = 0.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency + self.latency_per_text * len(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency + self.latency_per_text)
+        return super().embed_query(text)
+
+
+class FakeSearchTool:
+    """
+    TavilySearch 대신 사용하는 결정적 검색 도구
+    """
+
+    def __init__(self, latency=0.0):
+        """
+        Args:
+            latency (float): 검색 한 번당 지연 시간(초)
+        """
+        self.latency = latency
+
+    def search(self, query, topic="general", max_results=3, format_output=False, **kwargs):
+        time.sleep(self.latency)
+        results = [
+            {
+                "title": f"{query} 관련 문서 {index}",
+                "url": f"https://example.com/{_digest(query) % 100000}/{index}",
+                "content": f"{query}에 대한 검색 결과 {index}입니다. " * 5
+            }
+            for index in range(1, max_results + 1)
+        ]
+        if not format_output:
+            return results
+        return [
+            f"<document><title>{r['title']}</title><url>{r['url']}</url><content>{r['content']}</content></document>"
+            for r in results
+        ]
+
+
+def use_fake_backends(llm_latency=0.0, llm_latency_per_token=0.0, embedding_latency=0.0,
+                      embedding_latency_per_text=0.0, search_latency=0.0, embedding_size=256,
+                      llm_quota=None):
+    """
+    프로세스 전체의 채팅 모델, 임베딩, 검색 도구를 가짜 백엔드로 교체합니다.
+
+    평가 엔진을 생성하기 전에 호출해야 합니다. 검색 결과 캐시와 노드 출력 캐시는 사용하지 않습니다
+    (가짜 출력이 영속 캐시에 남아 실제 실행에서 재사용되지 않도록).
+
+    Args:
+        llm_latency (float): LLM 호출당 지연 시간(초)
+        llm_latency_per_token (float): 출력 토큰당 추가 지연 시간(초)
+        embedding_latency (float): 임베딩 호출당 지연 시간(초)
+        embedding_latency_per_text (float): 임베딩 텍스트당 추가 지연 시간(초)
+        search_latency (float): 검색 호출당 지연 시간(초)
+        embedding_size (int): 임베딩 차원
+        llm_quota (FakeQuota, optional): 모든 채팅 모델이 공유하는 요청 한도
+    """
+    set_model_factories(
+        chat_model_factory=lambda model, temperature: FakeChatModel(
+            model_name=model,
+            temperature=temperature,
+            latency=llm_latency,
+            latency_per_token=llm_latency_per_token,
+            quota=llm_quota
+        ),
+        embeddings_factory=lambda model: FakeEmbeddings(
+            size=embedding_size,
+            latency=embedding_latency,
+            latency_per_text=embedding_latency_per_text
+        ),
+        backend="fake"
+    )
+    set_search_tool(SearchClient(FakeSearchTool(latency=search_latency)))
+    set_node_cache(None)
+    set_rag_prompt(LOCAL_RAG_PROMPT)
@@ -0,0 +1,40 @@
+"""
+패키지 지연 로딩 유틸리티
+"""
+
+import importlib
+
+
+def lazy_exports(package_name, exports):
+    """
+    패키지가 공개하는 이름을 처음 접근할 때 하위 모듈에서 불러오도록 합니다 (PEP 562).
+
+    LangChain, LangGraph, OpenAI 클라이언트처럼 불러오는 데 오래 걸리는 의존성은
+    해당 이름을 실제로 사용하는 시점에만 로드되므로, 인자 파싱이나 --help처럼
+    워크플로우를 실행하지 않는 경로는 이 비용을 치르지 않습니다.
+
+    사용 예:
+        __getattr__, __dir__, __all__ = lazy_exports(__name__, {"setup_pdf_retrieval": "pdf_retriever"})
+
+    Args:
+        package_name (str): 패키지 이름 (__name__)
+        exports (dict): 공개 이름 -> 해당 이름을 정의한 하위 모듈 이름
+
+    Returns:
+        tuple: (모듈 __getattr__ 함수, 모듈 __dir__ 함수, __all__ 목록)
+    """
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package_name}.{submodule}"), name)
+        # 이후 접근은 일반 속성 조회로 처리
+        setattr(package, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(package)) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -0,0 +1,29 @@
+"""
+llm 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
+"""
+
+from src.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'get_chat_model': 'clients',
+    'get_embeddings': 'clients',
+    'get_http_client': 'clients',
+    'set_model_factories': 'clients',
+    'get_model_backend': 'clients',
+    'LLMResponseCache': 'cache',
+    'get_llm_cache': 'cache',
+    'set_llm_cache': 'cache',
+    'get_llm_cache_stats': 'cache',
+    'invoke_llm': 'invoke',
+    'ainvoke_llm': 'invoke',
+    'batch_llm': 'invoke',
+    'abatch_llm': 'invoke',
+    'stream_llm': 'invoke',
+    'astream_llm': 'invoke',
+    'count_tokens': 'tokens',
+    'truncate_to_tokens': 'tokens',
+    'get_context_window': 'tokens',
+    'context_budget': 'tokens'
+})
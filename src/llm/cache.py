@@ -0,0 +1,190 @@
+"""
+LLM 응답 캐시
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from src.cache import LRUCache, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 캐시 파일
+DEFAULT_LLM_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "llm_cache.sqlite"
+)
+
+# 응답 기본 유효 시간 (7일). 같은 프롬프트라도 모델 응답은 바뀔 수 있으므로 영구히 보관하지 않음
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 60 * 60
+
+# 영속 계층 기본 최대 항목 수 (넘으면 오래 사용하지 않은 항목부터 삭제)
+DEFAULT_LLM_CACHE_MAX_ENTRIES = 10000
+
+
+class LLMResponseCache:
+    """
+    모델 구현과 이름, 온도, 렌더링된 프롬프트 해시를 키로 하는 LLM 응답 캐시
+
+    메모리 LRU 계층을 먼저 조회하고, 없으면 SQLite 영속 계층(TTL, 최대 개수 제한)을
+    조회합니다. 영속 계층에서 찾은 응답은 남은 유효 시간과 함께 메모리 계층으로 올립니다.
+    """
+
+    def __init__(self, path=None, ttl_seconds=DEFAULT_LLM_CACHE_TTL, max_entries=DEFAULT_LLM_CACHE_MAX_ENTRIES,
+                 memory_entries=512, persistent=True):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+            ttl_seconds (float, optional): 항목 유효 시간(초). 메모리와 영속 계층에 모두 적용됩니다.
+                                           None이면 만료되지 않습니다.
+            max_entries (int, optional): 영속 계층 최대 항목 수. None이면 제한하지 않습니다.
+            memory_entries (int): 메모리 계층 최대 항목 수
+            persistent (bool): SQLite 영속 계층 사용 여부
+        """
+        self.memory = LRUCache(memory_entries, ttl_seconds=ttl_seconds)
+        self.store = SQLiteStore(
+            path or DEFAULT_LLM_CACHE_PATH,
+            table="llm_responses",
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries
+        ) if persistent else None
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+    @staticmethod
+    def make_key(model, temperature, prompt):
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            model (str): 모델 식별자 (구현 클래스와 모델 이름, 예: ChatOpenAI/gpt-4)
+            temperature (float | None): 샘플링 온도
+            prompt (str): 렌더링된 프롬프트
+
+        Returns:
+            str: 캐시 키
+        """
+        prompt_hash = hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+        return json.dumps([model, temperature, prompt_hash])
+
+    def get(self, key):
+        """
+        캐시된 응답 텍스트를 반환합니다.
+
+        Args:
+            key (str): 캐시 키
+
+        Returns:
+            str | None: 캐시된 응답. 없으면 None
+        """
+        content = self.memory.get(key)
+        if content is not None:
+            self._count("memory_hits")
+            return content
+
+        if self.store is not None:
+            entry = self.store.get_entry(key)
+            if entry is not None:
+                content, expires_at = entry
+                self.memory.set(key, content, expires_at=expires_at)
+                self._count("disk_hits")
+                return content
+
+        self._count("misses")
+        return None
+
+    def set(self, key, content):
+        """
+        응답 텍스트를 저장합니다.
+
+        Args:
+            key (str): 캐시 키
+            content (str): 응답 텍스트
+        """
+        self.memory.set(key, content)
+        if self.store is not None:
+            self.store.set(key, content)
+        self._count("writes")
+
+    def stats(self):
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            dict: 계층별 적중 수, 미스 수, 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+_cache_lock = threading.Lock()
+_cache = None
+_cache_configured = False
+
+
+def _create_cache_from_env():
+    mode = os.getenv("LLM_CACHE", "sqlite").lower()
+    if mode in ("off", "false", "0", "none"):
+        return None
+
+    ttl = os.getenv("LLM_CACHE_TTL")
+    max_entries = os.getenv("LLM_CACHE_MAX_ENTRIES")
+    return LLMResponseCache(
+        path=os.getenv("LLM_CACHE_PATH"),
+        ttl_seconds=float(ttl) if ttl else DEFAULT_LLM_CACHE_TTL,
+        max_entries=int(max_entries) if max_entries else DEFAULT_LLM_CACHE_MAX_ENTRIES,
+        persistent=mode != "memory"
+    )
+
+
+def get_llm_cache():
+    """
+    프로세스 전체에서 공유되는 LLM 응답 캐시를 반환합니다.
+
+    환경 변수 LLM_CACHE(sqlite/memory/off), LLM_CACHE_PATH, LLM_CACHE_TTL(기본 7일),
+    LLM_CACHE_MAX_ENTRIES(기본 10000)로 설정합니다.
+
+    Returns:
+        LLMResponseCache | None: 캐시. 비활성화된 경우 None
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            _cache = _create_cache_from_env()
+            _cache_configured = True
+        return _cache
+
+
+def set_llm_cache(cache):
+    """
+    LLM 응답 캐시를 교체합니다.
+
+    Args:
+        cache (LLMResponseCache | None): 사용할 캐시. None이면 캐시를 끕니다.
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def get_llm_cache_stats():
+    """
+    현재 LLM 응답 캐시의 적중 통계를 반환합니다.
+
+    Returns:
+        dict: 캐시 통계. 캐시가 비활성화된 경우 빈 딕셔너리
+    """
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,127 @@
+"""
+LLM 및 임베딩 클라이언트 관리
+"""
+
+import logging
+import os
+import threading
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_http_client = None
+_chat_models = {}
+_embeddings = {}
+_chat_model_factory = None
+_embeddings_factory = None
+_model_backend = "openai"
+
+
+def get_http_client():
+    """
+    OpenAI 호출에 공유되는 HTTP 커넥션 풀을 반환합니다.
+
+    커넥션 수는 환경 변수 OPENAI_MAX_CONNECTIONS로 조정할 수 있습니다.
+
+    Returns:
+        httpx.Client: 공유 HTTP 클라이언트
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=httpx.Timeout(120.0, connect=10.0)
+            )
+        return _http_client
+
+
+def set_model_factories(chat_model_factory=None, embeddings_factory=None, backend=None):
+    """
+    채팅 모델과 임베딩 생성 함수를 교체합니다.
+
+    벤치마크나 네트워크 없는 실행에서 OpenAI 대신 로컬 모델을 쓰기 위한 것으로,
+    이미 생성된 모델 인스턴스는 버립니다.
+
+    Args:
+        chat_model_factory (callable, optional): (model, temperature)를 받아 채팅 모델을 반환하는 함수.
+                                                 None이면 ChatOpenAI를 사용합니다.
+        embeddings_factory (callable, optional): (model)을 받아 임베딩 객체를 반환하는 함수.
+                                                 None이면 OpenAIEmbeddings를 사용합니다.
+        backend (str, optional): 모델 백엔드 이름 (예: "fake"). 노드 출력 캐시 지문에 들어가므로
+                                 백엔드마다 다른 이름을 지정해야 합니다. 생략하면 생성 함수가 없을 때
+                                 "openai", 있을 때 생성 함수의 모듈과 이름을 사용합니다.
+    """
+    global _chat_model_factory, _embeddings_factory, _model_backend
+    with _lock:
+        _chat_model_factory = chat_model_factory
+        _embeddings_factory = embeddings_factory
+        if backend is None:
+            factories = [factory for factory in (chat_model_factory, embeddings_factory) if factory is not None]
+            backend = "+".join(f"{factory.__module__}.{factory.__qualname__}" for factory in factories) or "openai"
+        _model_backend = backend
+        _chat_models.clear()
+        _embeddings.clear()
+
+
+def get_model_backend():
+    """
+    현재 채팅 모델/임베딩을 만드는 백엔드 이름을 반환합니다.
+
+    Returns:
+        str: "openai" 또는 set_model_factories()로 지정한 백엔드 이름
+    """
+    with _lock:
+        return _model_backend
+
+
+def get_chat_model(model, temperature=None):
+    """
+    모델별로 한 번만 생성되는 ChatOpenAI 인스턴스를 반환합니다.
+
+    Args:
+        model (str): 모델 이름 (예: gpt-4, gpt-3.5-turbo)
+        temperature (float, optional): 샘플링 온도. None이면 모델 기본값을 사용합니다.
+
+    Returns:
+        ChatOpenAI: 공유 채팅 모델
+    """
+    key = (model, temperature)
+    http_client = get_http_client()
+    with _lock:
+        if key not in _chat_models and _chat_model_factory is not None:
+            _chat_models[key] = _chat_model_factory(model, temperature)
+        if key not in _chat_models:
+            logger.info(f"LLM 클라이언트 생성: {model}")
+            # 스트리밍 호출에서도 토큰 사용량을 받도록 stream_usage를 켬
+            # 재시도는 공유 호출 스케줄러(src.ratelimit)가 맡으므로 클라이언트 자체 재시도는 끔
+            kwargs = {"model": model, "http_client": http_client, "stream_usage": True, "max_retries": 0}
+            if temperature is not None:
+                kwargs["temperature"] = temperature
+            _chat_models[key] = ChatOpenAI(**kwargs)
+        return _chat_models[key]
+
+
+def get_embeddings(model="text-embedding-3-small"):
+    """
+    모델별로 한 번만 생성되는 OpenAIEmbeddings 인스턴스를 반환합니다.
+
+    Args:
+        model (str): 임베딩 모델 이름
+
+    Returns:
+        OpenAIEmbeddings: 공유 임베딩 모델
+    """
+    http_client = get_http_client()
+    with _lock:
+        if model not in _embeddings and _embeddings_factory is not None:
+            _embeddings[model] = _embeddings_factory(model)
+        if model not in _embeddings:
+            _embeddings[model] = OpenAIEmbeddings(model=model, http_client=http_client, max_retries=0)
+        return _embeddings[model]
@@ -0,0 +1,285 @@
+"""
+캐시를 거치는 LLM 호출 함수
+
+캐시에 없는 호출은 공유 호출 스케줄러(src.ratelimit)를 거쳐 모델별 요청/토큰 한도 안에서 보냅니다.
+"""
+
+import logging
+import time
+from langchain_core.messages import AIMessage
+
+from src.llm.cache import get_llm_cache
+from src.metrics import record_llm_call
+from src.ratelimit.scheduler import DEFAULT_OUTPUT_TOKENS, PROVIDER_OPENAI, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+def _model_name(llm):
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+def _cache_key(cache, llm, prompt):
+    # 같은 모델 이름이라도 구현(예: 벤치마크용 가짜 모델)이 다르면 다른 응답으로 취급
+    model_id = f"{type(llm).__name__}/{_model_name(llm)}"
+    return cache.make_key(model_id, getattr(llm, "temperature", None), prompt)
+
+
+def _limits(llm, prompts):
+    # (공유 호출 스케줄러, 모델 이름, 프롬프트별 예상 토큰 수)
+    limiter = get_rate_limiter()
+    model = _model_name(llm)
+    return limiter, model, limiter.estimate_tokens(PROVIDER_OPENAI, model, prompts, DEFAULT_OUTPUT_TOKENS)
+
+
+def _usage_tokens(response):
+    # 실제 사용 토큰 수 (응답에 사용량이 없으면 예상치를 그대로 둠)
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+def _store(cache, key, response, validate):
+    # 검증에 실패한 응답은 캐시하지 않아 다음 실행에서 다시 호출되도록 함
+    if validate is not None:
+        try:
+            validate(response.content)
+        except Exception:
+            return
+    cache.set(key, response.content)
+
+
+def _call(llm, prompt):
+    limiter, model, tokens = _limits(llm, [prompt])
+    start = time.perf_counter()
+    response = limiter.call(lambda: llm.invoke(prompt), PROVIDER_OPENAI, model,
+                            tokens=tokens[0], usage=_usage_tokens)
+    record_llm_call(prompt, response, time.perf_counter() - start)
+    return response
+
+
+async def _acall(llm, prompt):
+    limiter, model, tokens = _limits(llm, [prompt])
+    start = time.perf_counter()
+    response = await limiter.acall(lambda: llm.ainvoke(prompt), PROVIDER_OPENAI, model,
+                                   tokens=tokens[0], usage=_usage_tokens)
+    record_llm_call(prompt, response, time.perf_counter() - start)
+    return response
+
+
+def _cached(prompt, content):
+    record_llm_call(prompt, cached=True)
+    return AIMessage(content=content)
+
+
+def invoke_llm(llm, prompt, validate=None):
+    """
+    응답 캐시를 조회한 뒤 없을 때만 LLM을 호출합니다.
+
+    Args:
+        llm: 채팅 모델
+        prompt (str): 렌더링된 프롬프트
+        validate (callable, optional): 응답 텍스트를 검사하는 함수. 예외가 나면 캐시하지 않습니다.
+
+    Returns:
+        AIMessage: LLM 응답 (캐시 적중 시 캐시된 내용)
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return _call(llm, prompt)
+
+    key = _cache_key(cache, llm, prompt)
+    content = cache.get(key)
+    if content is not None:
+        return _cached(prompt, content)
+
+    response = _call(llm, prompt)
+    _store(cache, key, response, validate)
+    return response
+
+
+async def ainvoke_llm(llm, prompt, validate=None):
+    """
+    invoke_llm()의 비동기 버전입니다.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return await _acall(llm, prompt)
+
+    key = _cache_key(cache, llm, prompt)
+    content = cache.get(key)
+    if content is not None:
+        return _cached(prompt, content)
+
+    response = await _acall(llm, prompt)
+    _store(cache, key, response, validate)
+    return response
+
+
+def _split_cached(cache, llm, prompts):
+    keys = [_cache_key(cache, llm, prompt) for prompt in prompts]
+    results = [None] * len(prompts)
+    pending = []
+    for index, key in enumerate(keys):
+        content = cache.get(key)
+        if content is not None:
+            results[index] = _cached(prompts[index], content)
+        else:
+            pending.append(index)
+    return keys, results, pending
+
+
+def _merge_batch(cache, keys, results, pending, responses, validate):
+    for index, response in zip(pending, responses):
+        results[index] = response
+        if not isinstance(response, Exception):
+            _store(cache, keys[index], response, validate)
+    return results
+
+
+def _record_batch(prompts, responses, elapsed):
+    # 배치 호출은 개별 소요 시간을 알 수 없으므로 전체 시간을 첫 호출에만 기록
+    for index, (prompt, response) in enumerate(zip(prompts, responses)):
+        if not isinstance(response, Exception):
+            record_llm_call(prompt, response, elapsed if index == 0 else 0.0)
+
+
+def _batch(llm, prompts):
+    # 429/일시적 오류가 난 프롬프트만 스케줄러가 다시 보냄
+    limiter, model, tokens = _limits(llm, prompts)
+    start = time.perf_counter()
+    responses = limiter.call_batch(
+        lambda indexes: llm.batch([prompts[i] for i in indexes], return_exceptions=True),
+        PROVIDER_OPENAI, model, tokens=tokens, count=len(prompts), usage=_usage_tokens
+    )
+    _record_batch(prompts, responses, time.perf_counter() - start)
+    return responses
+
+
+async def _abatch(llm, prompts):
+    limiter, model, tokens = _limits(llm, prompts)
+    start = time.perf_counter()
+    responses = await limiter.acall_batch(
+        lambda indexes: llm.abatch([prompts[i] for i in indexes], return_exceptions=True),
+        PROVIDER_OPENAI, model, tokens=tokens, count=len(prompts), usage=_usage_tokens
+    )
+    _record_batch(prompts, responses, time.perf_counter() - start)
+    return responses
+
+
+def batch_llm(llm, prompts, validate=None):
+    """
+    여러 프롬프트를 동시에 호출합니다. 캐시에 없는 프롬프트만 LLM에 전달됩니다.
+
+    Args:
+        llm: 채팅 모델
+        prompts (list): 렌더링된 프롬프트 목록
+        validate (callable, optional): 응답 텍스트 검사 함수
+
+    Returns:
+        list: 프롬프트 순서대로 AIMessage 또는 호출 중 발생한 예외
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return _batch(llm, prompts)
+
+    keys, results, pending = _split_cached(cache, llm, prompts)
+    responses = _batch(llm, [prompts[i] for i in pending]) if pending else []
+    return _merge_batch(cache, keys, results, pending, responses, validate)
+
+
+async def abatch_llm(llm, prompts, validate=None):
+    """
+    batch_llm()의 비동기 버전입니다.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return await _abatch(llm, prompts)
+
+    keys, results, pending = _split_cached(cache, llm, prompts)
+    responses = await _abatch(llm, [prompts[i] for i in pending]) if pending else []
+    return _merge_batch(cache, keys, results, pending, responses, validate)
+
+
+def _emit_cached(prompt, content, on_token):
+    response = _cached(prompt, content)
+    if on_token is not None:
+        on_token(content)
+    return response
+
+
+def _merge_chunks(full, chunk, on_token):
+    if on_token is not None and chunk.content:
+        on_token(chunk.content)
+    return chunk if full is None else full + chunk
+
+
+def stream_llm(llm, prompt, on_token=None, validate=None):
+    """
+    LLM 응답을 토큰 단위로 스트리밍하면서 전체 응답을 모아 반환합니다.
+
+    캐시에 응답이 있으면 LLM을 호출하지 않고 캐시된 내용을 한 번에 전달합니다.
+
+    Args:
+        llm: 채팅 모델
+        prompt (str): 렌더링된 프롬프트
+        on_token (callable, optional): 토큰 텍스트가 도착할 때마다 호출되는 함수
+        validate (callable, optional): 응답 텍스트 검사 함수
+
+    Returns:
+        AIMessage | AIMessageChunk: 전체 응답
+    """
+    cache = get_llm_cache()
+    key = _cache_key(cache, llm, prompt) if cache is not None else None
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return _emit_cached(prompt, content, on_token)
+
+    limiter, model, tokens = _limits(llm, [prompt])
+    full = None
+
+    def consume():
+        nonlocal full
+        for chunk in llm.stream(prompt):
+            full = _merge_chunks(full, chunk, on_token)
+        return full if full is not None else AIMessage(content="")
+
+    start = time.perf_counter()
+    # 토큰이 이미 전달된 뒤에는 다시 시도하지 않음
+    response = limiter.call(consume, PROVIDER_OPENAI, model, tokens=tokens[0], usage=_usage_tokens,
+                            can_retry=lambda: full is None)
+    record_llm_call(prompt, response, time.perf_counter() - start)
+
+    if cache is not None:
+        _store(cache, key, response, validate)
+    return response
+
+
+async def astream_llm(llm, prompt, on_token=None, validate=None):
+    """
+    stream_llm()의 비동기 버전입니다.
+    """
+    cache = get_llm_cache()
+    key = _cache_key(cache, llm, prompt) if cache is not None else None
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return _emit_cached(prompt, content, on_token)
+
+    limiter, model, tokens = _limits(llm, [prompt])
+    full = None
+
+    async def consume():
+        nonlocal full
+        async for chunk in llm.astream(prompt):
+            full = _merge_chunks(full, chunk, on_token)
+        return full if full is not None else AIMessage(content="")
+
+    start = time.perf_counter()
+    response = await limiter.acall(consume, PROVIDER_OPENAI, model, tokens=tokens[0], usage=_usage_tokens,
+                                   can_retry=lambda: full is None)
+    record_llm_call(prompt, response, time.perf_counter() - start)
+
+    if cache is not None:
+        _store(cache, key, response, validate)
+    return response
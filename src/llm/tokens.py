@@ -0,0 +1,149 @@
+"""
+모델별 토큰 수 계산
+"""
+
+import logging
+import re
+import threading
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# 모델별 컨텍스트 윈도우 크기(토큰)
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# 토큰화 규칙을 모르는 모델에 사용하는 인코딩
+DEFAULT_ENCODING = "cl100k_base"
+
+_ASCII_PATTERN = re.compile(r"[\x00-\x7f]")
+
+_lock = threading.Lock()
+_encodings = {}
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 텍스트의 토큰 수를 추정합니다.
+
+    영문은 4글자당 1토큰, 한글 등 그 밖의 문자는 글자당 1토큰으로 계산합니다.
+
+    Args:
+        text (str): 입력 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    ascii_count = len(_ASCII_PATTERN.findall(text))
+    return (ascii_count + 3) // 4 + len(text) - ascii_count
+
+
+def get_encoding(model):
+    """
+    모델의 tiktoken 인코딩을 반환합니다.
+
+    인코딩 파일을 받을 수 없는 환경(오프라인)이면 None을 반환하며, 같은 인코딩을 쓰는
+    모델끼리 결과를 공유하고 실패 결과도 캐시해 다시 시도하지 않습니다.
+
+    Args:
+        model (str): 모델 이름
+
+    Returns:
+        tiktoken.Encoding | None: 인코딩. 사용할 수 없으면 None
+    """
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        encoding_name = DEFAULT_ENCODING
+
+    # 병렬 노드가 동시에 처음 호출해도 인코딩 파일은 한 번만 받음
+    with _lock:
+        if encoding_name not in _encodings:
+            try:
+                _encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+            except Exception as e:
+                logger.warning(f"{encoding_name} 토크나이저를 불러오지 못해 토큰 수를 추정합니다: {str(e)}")
+                _encodings[encoding_name] = None
+        return _encodings[encoding_name]
+
+
+def count_tokens(text, model="gpt-4"):
+    """
+    모델 기준 텍스트의 토큰 수를 계산합니다.
+
+    Args:
+        text (str): 입력 텍스트
+        model (str): 모델 이름
+
+    Returns:
+        int: 토큰 수 (토크나이저를 쓸 수 없으면 추정값)
+    """
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens, model="gpt-4"):
+    """
+    텍스트를 앞에서부터 최대 토큰 수만큼 남기고 자릅니다.
+
+    Args:
+        text (str): 입력 텍스트
+        max_tokens (int): 최대 토큰 수
+        model (str): 모델 이름
+
+    Returns:
+        str: 잘린 텍스트
+    """
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    # 추정 토큰 수가 예산 안에 들 때까지 글자 수를 비례해서 줄임
+    while text and estimate_tokens(text) > max_tokens:
+        text = text[:max(0, min(len(text) - 1, len(text) * max_tokens // estimate_tokens(text)))]
+    return text
+
+
+def get_context_window(model):
+    """
+    모델의 컨텍스트 윈도우 크기를 반환합니다.
+
+    Args:
+        model (str): 모델 이름
+
+    Returns:
+        int: 컨텍스트 윈도우 크기(토큰)
+    """
+    return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+
+def context_budget(model, cap, prompt_tokens=0, reserve_tokens=1024):
+    """
+    프롬프트에 넣을 컨텍스트의 토큰 예산을 계산합니다.
+
+    노드별 상한(cap)과, 모델 컨텍스트 윈도우에서 나머지 프롬프트와 응답용 토큰을 뺀 값 중
+    작은 값을 사용합니다.
+
+    Args:
+        model (str): 모델 이름
+        cap (int): 노드별 컨텍스트 토큰 상한
+        prompt_tokens (int): 컨텍스트를 제외한 프롬프트 토큰 수
+        reserve_tokens (int): 응답용으로 남겨 둘 토큰 수
+
+    Returns:
+        int: 컨텍스트 토큰 예산
+    """
+    return max(0, min(cap, get_context_window(model) - prompt_tokens - reserve_tokens))
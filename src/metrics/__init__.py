@@ -0,0 +1,33 @@
+"""
+metrics 패키지 초기화
+"""
+
+from src.metrics.collector import (
+    RunMetrics,
+    collect_run_metrics,
+    node_scope,
+    record_llm_call,
+    record_timing,
+    record_json_parse,
+    record_context_pack,
+    record_node_cache,
+    record_model_tier,
+    record_rate_limit
+)
+from src.metrics.registry import MetricsRegistry, get_metrics_registry, percentile
+
+__all__ = [
+    'RunMetrics',
+    'collect_run_metrics',
+    'node_scope',
+    'record_llm_call',
+    'record_timing',
+    'record_json_parse',
+    'record_context_pack',
+    'record_node_cache',
+    'record_model_tier',
+    'record_rate_limit',
+    'MetricsRegistry',
+    'get_metrics_registry',
+    'percentile'
+]
@@ -0,0 +1,281 @@
+"""
+평가 실행별 노드 지표 수집
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# 노드별로 누적되는 수치 지표
+NODE_COUNTERS = (
+    "llm_calls",
+    "llm_cache_hits",
+    "node_cache_hits",
+    "model_escalations",
+    "llm_seconds",
+    "prompt_tokens",
+    "completion_tokens",
+    "prompt_chars",
+    "retrieval_seconds",
+    "search_seconds",
+    "context_tokens",
+    "context_dropped_tokens",
+    "rate_limit_wait_seconds",
+    "rate_limit_retries",
+)
+
+_current_run = contextvars.ContextVar("current_run_metrics", default=None)
+_current_node = contextvars.ContextVar("current_node_metrics", default=None)
+
+
+class RunMetrics:
+    """
+    한 번의 평가 실행 동안 노드별 지표를 모읍니다.
+
+    노드 실행 시간, LLM 토큰/호출 시간, 검색 시간, 프롬프트 길이,
+    JSON 파싱 성공 여부를 노드 단위로 기록합니다. 병렬 노드와 배치 호출에서
+    동시에 기록될 수 있으므로 잠금으로 보호합니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.total_seconds = None
+        self.nodes = []
+        self._lock = threading.Lock()
+
+    def start_node(self, name):
+        """
+        노드 기록을 새로 만듭니다.
+
+        Args:
+            name (str): 노드 이름
+
+        Returns:
+            dict: 노드 지표 기록
+        """
+        record = {"node": name, "wall_seconds": 0.0, "json_parse_ok": None, "error": None,
+                  "cache": None, "fingerprint": None,
+                  "model_tier": None, "model": None, "escalation_reason": None}
+        record.update({counter: 0 for counter in NODE_COUNTERS})
+        with self._lock:
+            self.nodes.append(record)
+        return record
+
+    def add(self, record, **values):
+        """
+        노드 기록에 수치를 더합니다.
+
+        Args:
+            record (dict): 노드 지표 기록
+            **values: 더할 지표 값
+        """
+        with self._lock:
+            for key, value in values.items():
+                record[key] += value
+
+    def set(self, record, **values):
+        """
+        노드 기록의 값을 설정합니다.
+
+        Args:
+            record (dict): 노드 지표 기록
+            **values: 설정할 지표 값
+        """
+        with self._lock:
+            record.update(values)
+
+    def finish(self):
+        """실행 전체 소요 시간을 확정합니다."""
+        self.total_seconds = time.time() - self.started_at
+
+    def to_dict(self):
+        """
+        지표를 직렬화 가능한 딕셔너리로 반환합니다.
+
+        Returns:
+            dict: 실행 전체 시간, 노드별 지표, 합계
+        """
+        with self._lock:
+            nodes = [dict(record) for record in self.nodes]
+
+        totals = {counter: sum(record[counter] for record in nodes) for counter in NODE_COUNTERS}
+        totals["rate_limit_wait_seconds"] = round(totals["rate_limit_wait_seconds"], 4)
+        totals["json_parse_failures"] = sum(1 for record in nodes if record["json_parse_ok"] is False)
+        for record in nodes:
+            for key in ("wall_seconds", "llm_seconds", "retrieval_seconds", "search_seconds", "rate_limit_wait_seconds"):
+                record[key] = round(record[key], 4)
+
+        return {
+            "total_seconds": round(self.total_seconds, 4) if self.total_seconds is not None else None,
+            "nodes": nodes,
+            "totals": totals
+        }
+
+
+@contextmanager
+def collect_run_metrics():
+    """
+    블록 안에서 실행되는 노드의 지표를 새 RunMetrics에 모읍니다.
+
+    Yields:
+        RunMetrics: 수집 중인 실행 지표
+    """
+    run_metrics = RunMetrics()
+    token = _current_run.set(run_metrics)
+    try:
+        yield run_metrics
+    finally:
+        run_metrics.finish()
+        _current_run.reset(token)
+
+
+@contextmanager
+def node_scope(name):
+    """
+    노드 실행 구간을 측정하고, 그 안의 LLM/검색 기록을 해당 노드에 연결합니다.
+
+    수집 중인 실행이 없으면 아무것도 기록하지 않습니다.
+
+    Args:
+        name (str): 노드 이름
+    """
+    run_metrics = _current_run.get()
+    if run_metrics is None:
+        yield None
+        return
+
+    record = run_metrics.start_node(name)
+    token = _current_node.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        run_metrics.set(record, error=str(e))
+        raise
+    finally:
+        run_metrics.add(record, wall_seconds=time.perf_counter() - start)
+        _current_node.reset(token)
+
+
+def _current():
+    run_metrics = _current_run.get()
+    record = _current_node.get()
+    if run_metrics is None or record is None:
+        return None, None
+    return run_metrics, record
+
+
+def record_llm_call(prompt, response=None, elapsed=0.0, cached=False):
+    """
+    현재 노드에 LLM 호출 한 건을 기록합니다.
+
+    Args:
+        prompt (str): 렌더링된 프롬프트
+        response (AIMessage, optional): LLM 응답 (usage_metadata에서 토큰 수를 읽음)
+        elapsed (float): 호출 소요 시간(초)
+        cached (bool): 응답 캐시 적중 여부
+    """
+    run_metrics, record = _current()
+    if record is None:
+        return
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    run_metrics.add(
+        record,
+        llm_calls=0 if cached else 1,
+        llm_cache_hits=1 if cached else 0,
+        llm_seconds=elapsed,
+        prompt_chars=len(str(prompt)),
+        prompt_tokens=usage.get("input_tokens", 0),
+        completion_tokens=usage.get("output_tokens", 0)
+    )
+
+
+def record_timing(kind, elapsed):
+    """
+    현재 노드에 검색 소요 시간을 기록합니다.
+
+    Args:
+        kind (str): "retrieval"(PDF 검색) 또는 "search"(웹 검색)
+        elapsed (float): 소요 시간(초)
+    """
+    run_metrics, record = _current()
+    if record is not None:
+        run_metrics.add(record, **{f"{kind}_seconds": elapsed})
+
+
+def record_json_parse(success):
+    """
+    현재 노드의 JSON 파싱 성공 여부를 기록합니다.
+
+    Args:
+        success (bool): 파싱 성공 여부
+    """
+    run_metrics, record = _current()
+    if record is not None:
+        previous = record["json_parse_ok"]
+        run_metrics.set(record, json_parse_ok=success if previous is None else previous and success)
+
+
+def record_context_pack(packed_tokens, dropped_tokens):
+    """
+    현재 노드에 프롬프트 컨텍스트로 담은 토큰 수와 예산 때문에 버린 토큰 수를 기록합니다.
+
+    Args:
+        packed_tokens (int): 담은 토큰 수
+        dropped_tokens (int): 버린 토큰 수
+    """
+    run_metrics, record = _current()
+    if record is not None:
+        run_metrics.add(record, context_tokens=packed_tokens, context_dropped_tokens=dropped_tokens)
+
+
+def record_node_cache(status, fingerprint):
+    """
+    현재 노드의 메모이제이션 결과를 기록합니다.
+
+    Args:
+        status (str): "reused"(저장된 출력 재사용) 또는 "recomputed"(다시 실행)
+        fingerprint (str): 노드 입력 지문
+    """
+    run_metrics, record = _current()
+    if record is not None:
+        run_metrics.set(record, cache=status, fingerprint=fingerprint)
+        if status == "reused":
+            run_metrics.add(record, node_cache_hits=1)
+
+
+def record_model_tier(tier, model, reason=None):
+    """
+    현재 노드에 응답을 만든 모델 등급을 기록합니다.
+
+    한 노드에서 여러 번 기록되면 strong 등급이 우선합니다.
+
+    Args:
+        tier (str): "fast", "strong" 또는 "fixed"
+        model (str): 모델 이름
+        reason (str, optional): 강한 모델로 올린 이유. 있으면 model_escalations를 1 늘립니다.
+    """
+    run_metrics, record = _current()
+    if record is None:
+        return
+
+    if record["model_tier"] != "strong" or tier == "strong":
+        run_metrics.set(record, model_tier=tier, model=model)
+    if reason is not None:
+        run_metrics.set(record, escalation_reason=reason)
+        run_metrics.add(record, model_escalations=1)
+
+
+def record_rate_limit(wait_seconds=0.0, retries=0):
+    """
+    현재 노드에 API 호출 한도 때문에 기다린 시간과 재시도 횟수를 기록합니다.
+
+    Args:
+        wait_seconds (float): 호출 스케줄러에서 기다린 시간(초)
+        retries (int): 429/일시적 오류로 다시 시도한 횟수
+    """
+    run_metrics, record = _current()
+    if record is not None and (wait_seconds or retries):
+        run_metrics.add(record, rate_limit_wait_seconds=wait_seconds, rate_limit_retries=retries)
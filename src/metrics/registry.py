@@ -0,0 +1,190 @@
+"""
+여러 실행에 걸친 지표 집계 및 내보내기
+"""
+
+import json
+import threading
+from collections import defaultdict, deque
+
+# 노드별로 분포(p50/p95/p99)를 계산하는 지표
+DISTRIBUTION_METRICS = (
+    "wall_seconds",
+    "llm_seconds",
+    "retrieval_seconds",
+    "search_seconds",
+    "prompt_chars",
+    "prompt_tokens",
+    "completion_tokens",
+    "context_tokens",
+    "rate_limit_wait_seconds",
+)
+
+# 노드별 누적 합계만 유지하는 지표
+COUNTER_METRICS = (
+    "llm_calls",
+    "llm_cache_hits",
+    "node_cache_hits",
+    "model_escalations",
+    "prompt_tokens",
+    "completion_tokens",
+    "context_tokens",
+    "context_dropped_tokens",
+    "rate_limit_retries",
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRIC_PREFIX = "ethics_eval"
+
+
+def percentile(values, q):
+    """
+    선형 보간으로 백분위 값을 계산합니다.
+
+    Args:
+        values (list): 숫자 목록
+        q (float): 0~1 사이 분위
+
+    Returns:
+        float | None: 백분위 값. 값이 없으면 None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class MetricsRegistry:
+    """
+    실행별 지표(RunMetrics.to_dict())를 모아 노드별 분포와 합계를 제공합니다.
+
+    메모리 사용을 제한하기 위해 지표마다 최근 max_samples개의 표본만 유지합니다.
+    """
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._counters = defaultdict(float)
+        self._runs = 0
+        self._run_seconds = deque(maxlen=max_samples)
+
+    def observe(self, run_metrics):
+        """
+        한 번의 실행 지표를 집계에 추가합니다.
+
+        Args:
+            run_metrics (dict): RunMetrics.to_dict() 결과
+        """
+        with self._lock:
+            self._runs += 1
+            if run_metrics.get("total_seconds") is not None:
+                self._run_seconds.append(run_metrics["total_seconds"])
+            for record in run_metrics["nodes"]:
+                node = record["node"]
+                for metric in DISTRIBUTION_METRICS:
+                    self._samples[(node, metric)].append(record[metric])
+                for metric in COUNTER_METRICS:
+                    self._counters[(node, metric)] += record[metric]
+                self._counters[(node, "runs")] += 1
+                if record["json_parse_ok"] is False:
+                    self._counters[(node, "json_parse_failures")] += 1
+                if record["error"]:
+                    self._counters[(node, "errors")] += 1
+
+    def summary(self):
+        """
+        노드별 지표 분포와 합계를 반환합니다.
+
+        Returns:
+            dict: {"runs", "run_seconds", "nodes": {노드: {지표: {p50, p95, p99, mean}, ...}}}
+        """
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            counters = dict(self._counters)
+            runs = self._runs
+            run_seconds = list(self._run_seconds)
+
+        nodes = defaultdict(dict)
+        for (node, metric), values in samples.items():
+            nodes[node][metric] = _describe(values)
+        for (node, counter), value in counters.items():
+            nodes[node][f"{counter}_total"] = value
+
+        return {"runs": runs, "run_seconds": _describe(run_seconds), "nodes": dict(nodes)}
+
+    def to_json(self, indent=2):
+        """
+        집계 결과를 JSON 문자열로 내보냅니다.
+
+        Returns:
+            str: JSON 문자열
+        """
+        return json.dumps(self.summary(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self):
+        """
+        집계 결과를 Prometheus 텍스트 형식으로 내보냅니다.
+
+        Returns:
+            str: Prometheus exposition 형식 텍스트
+        """
+        summary = self.summary()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_runs_total 완료된 평가 실행 수",
+            f"# TYPE {METRIC_PREFIX}_runs_total counter",
+            f"{METRIC_PREFIX}_runs_total {summary['runs']}",
+        ]
+
+        for metric in DISTRIBUTION_METRICS:
+            name = f"{METRIC_PREFIX}_node_{metric}"
+            lines.append(f"# TYPE {name} summary")
+            for node, metrics in sorted(summary["nodes"].items()):
+                description = metrics.get(metric)
+                if not description or description["count"] == 0:
+                    continue
+                for q in QUANTILES:
+                    value = description[_quantile_key(q)]
+                    lines.append(f'{name}{{node="{node}",quantile="{q}"}} {_format(value)}')
+                lines.append(f'{name}_sum{{node="{node}"}} {_format(description["sum"])}')
+                lines.append(f'{name}_count{{node="{node}"}} {description["count"]}')
+
+        for counter in COUNTER_METRICS + ("runs", "json_parse_failures", "errors"):
+            name = f"{METRIC_PREFIX}_node_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for node, metrics in sorted(summary["nodes"].items()):
+                lines.append(f'{name}{{node="{node}"}} {_format(metrics.get(f"{counter}_total", 0))}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _quantile_key(q):
+    return f"p{int(q * 100)}"
+
+
+def _format(value):
+    return f"{value:.6g}"
+
+
+def _describe(values):
+    description = {"count": len(values), "sum": sum(values)}
+    description["mean"] = description["sum"] / len(values) if values else None
+    for q in QUANTILES:
+        description[_quantile_key(q)] = percentile(values, q)
+    return description
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry():
+    """
+    프로세스 전체에서 공유되는 지표 집계기를 반환합니다.
+
+    Returns:
+        MetricsRegistry: 공유 집계기
+    """
+    return _registry
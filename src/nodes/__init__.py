@@ -1,17 +1,26 @@
 """
 nodes 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
 """
 
-from src.nodes.service_info import search_service_info
-from src.nodes.analysis import analyze_service
-from src.nodes.risk import assess_risks
-from src.nodes.improvement import suggest_improvements
-from src.nodes.report import generate_report
+from src.lazy import lazy_exports
 
-__all__ = [
-    'search_service_info',
-    'analyze_service',
-    'assess_risks',
-    'suggest_improvements',
-    'generate_report'
-]
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'search_service_info': 'service_info',
+    'analyze_service': 'analysis',
+    'retrieve_risk_guidelines': 'risk',
+    'assess_risks': 'risk',
+    'search_best_practices': 'improvement',
+    'retrieve_improvement_guidelines': 'improvement',
+    'suggest_improvements': 'improvement',
+    'generate_report': 'report',
+    'search_service_info_async': 'service_info',
+    'analyze_service_async': 'analysis',
+    'retrieve_risk_guidelines_async': 'risk',
+    'assess_risks_async': 'risk',
+    'search_best_practices_async': 'improvement',
+    'retrieve_improvement_guidelines_async': 'improvement',
+    'suggest_improvements_async': 'improvement',
+    'generate_report_async': 'report'
+})
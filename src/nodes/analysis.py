@@ -2,29 +2,20 @@
 서비스 분석 노드
 """
 
-import json
 import logging
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from src.types import GraphState
+from src.metrics import record_json_parse
+from src.nodes.routing import invoke_routed, ainvoke_routed, escalation_reason
+from src.nodes.utils import parse_json_response
 
 logger = logging.getLogger(__name__)
 
-def analyze_service(state: GraphState) -> GraphState:
-    """
-    AI 서비스의 특성과 기능을 분석합니다.
-    
-    Args:
-        state (GraphState): 현재 그래프 상태
-        
-    Returns:
-        GraphState: 업데이트된 그래프 상태
-    """
-    logger.info("서비스 분석 시작")
-    llm = ChatOpenAI(model="gpt-4")
+# fixed 라우팅 정책에서 사용하는 모델 (cascade 정책은 src.nodes.routing 참고)
+ANALYSIS_MODEL = "gpt-4"
 
-    prompt = ChatPromptTemplate.from_template("""
+ANALYSIS_PROMPT = ChatPromptTemplate.from_template("""
     # AI 서비스 분석 에이전트
 
     당신은 AI 서비스의 특성과 기능을 분석하여 윤리적 리스크 평가의 기초가 될 정보를 제공하는 전문가입니다.
@@ -72,34 +63,73 @@ def analyze_service(state: GraphState) -> GraphState:
     JSON 형식만 반환하세요.
     """)
 
-    response = llm.invoke(
-        prompt.format(
-            service_description=state["service_description"],
-            context=state["context"]
-        )
+
+def _build_prompt(state: GraphState) -> str:
+    return ANALYSIS_PROMPT.format(
+        service_description=state["service_description"],
+        context=state["context"]
     )
 
-    try:
-        json_str = response.content
-        if "```json" in json_str:
-            json_str = json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in json_str:
-            json_str = json_str.split("```")[1].split("```")[0].strip()
 
-        service_info = json.loads(json_str)
-        logger.info(f"서비스 분석 완료: {service_info['service_name']}")
+def _validate_response(content):
+    # 빠른 모델 응답에 이후 노드가 사용하는 필드가 없으면 강한 모델로 다시 호출
+    service_info = parse_json_response(content)
+    missing = [key for key in ("service_name", "primary_function", "target_users", "risk_flags")
+               if key not in service_info]
+    if missing:
+        raise ValueError(f"필수 항목 누락: {', '.join(missing)}")
+    return service_info
+
 
-        messages = state.get("messages", []).copy()
-        messages.append(AIMessage(content=f"AI 서비스 분석이 완료되었습니다: {service_info['service_name']}"))
+def _process_response(response) -> GraphState:
+    try:
+        service_info = parse_json_response(response.content)
+        record_json_parse(True)
+        logger.info(f"서비스 분석 완료: {service_info['service_name']}")
 
         return {
-            **state,
             "service_info": service_info,
-            "messages": messages,
+            "messages": [AIMessage(content=f"AI 서비스 분석이 완료되었습니다: {service_info['service_name']}")],
             "next": "assess_risks"
         }
     except Exception as e:
+        record_json_parse(False)
         logger.error(f"서비스 분석 중 오류 발생: {str(e)}")
-        messages = state.get("messages", []).copy()
-        messages.append(AIMessage(content=f"서비스 분석 중 오류가 발생했습니다: {str(e)}"))
-        return {**state, "messages": messages, "next": "end"}
\ No newline at end of file
+        return {"messages": [AIMessage(content=f"서비스 분석 중 오류가 발생했습니다: {str(e)}")], "next": "end"}
+
+
+def analyze_service(state: GraphState, config=None) -> GraphState:
+    """
+    AI 서비스의 특성과 기능을 분석합니다.
+
+    cascade 라우팅 정책에서는 빠른 모델로 먼저 분석하고, 응답이 JSON 검증에 실패하거나
+    분석 결과의 risk_flags에 중요한 의사결정/취약 계층 사용자가 표시되면 강한 모델로 다시 분석합니다.
+    
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (model_routing 옵션)
+        
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("서비스 분석 시작")
+    response = invoke_routed(_build_prompt(state), config, ANALYSIS_MODEL, validate=_validate_response,
+                             escalate_if=escalation_reason)
+    return _process_response(response)
+
+
+async def analyze_service_async(state: GraphState, config=None) -> GraphState:
+    """
+    analyze_service()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (model_routing 옵션)
+
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("서비스 분석 시작")
+    response = await ainvoke_routed(_build_prompt(state), config, ANALYSIS_MODEL, validate=_validate_response,
+                                    escalate_if=escalation_reason)
+    return _process_response(response)
@@ -4,66 +4,29 @@
 
 import json
 import logging
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_teddynote.tools.tavily import TavilySearch
 from langchain_opentutorial.rag.utils import format_docs
 from src.types import GraphState
+from src.llm import context_budget
+from src.metrics import record_json_parse
+from src.retrieval import DEFAULT_PACK_TOKEN_BUDGET, pack_context
+from src.search import get_search_tool
+from src.nodes.routing import invoke_routed, ainvoke_routed
+from src.nodes.utils import parse_json_response, log_elapsed, get_context_pack
 
 logger = logging.getLogger(__name__)
 
-def suggest_improvements(state: GraphState, pdf_retriever) -> GraphState:
-    """
-    AI 서비스의 윤리적 리스크에 대한 개선안을 제안합니다.
-    
-    Args:
-        state (GraphState): 현재 그래프 상태
-        pdf_retriever: PDF 문서 검색기
-        
-    Returns:
-        GraphState: 업데이트된 그래프 상태
-    """
-    logger.info("개선안 제안 시작")
-    service_info = state["service_info"]
-    risk_assessment = state["risk_assessment"]
-
-    # 가장 높은 리스크 영역 확인
-    highest_risk_area = risk_assessment["highest_risk_area"]
-    logger.info(f"최고 리스크 영역: {highest_risk_area}")
-
-    # 관련 사례 검색 (Tavily) - 결과 크기 줄이기
-    tavily_tool = TavilySearch()
-    search_query = f"AI ethics {highest_risk_area} best practices {service_info['primary_function']}"
-
-    search_result = tavily_tool.search(
-        query=search_query,
-        topic="general",
-        max_results=2,  # 제한된 결과 수
-        format_output=True,
-    )
+# fixed 라우팅 정책에서 사용하는 더 가벼운 모델이자 컨텍스트 토큰 예산 기준 모델
+IMPROVEMENT_MODEL = "gpt-3.5-turbo"
 
-    # 검색 결과 텍스트 크기 제한
-    max_context_length = 1500  # 더 작은 크기로 제한
-    best_practices_context = "\n".join(search_result)
-    if len(best_practices_context) > max_context_length:
-        best_practices_context = best_practices_context[:max_context_length] + "..."
+# 프롬프트에 넣을 컨텍스트의 토큰 상한
+# (가이드라인은 컨텍스트 팩과 같은 예산을 사용해 팩 유무와 관계없이 프롬프트 크기를 맞춤)
+BEST_PRACTICES_CONTEXT_TOKENS = 400
+GUIDELINES_CONTEXT_TOKENS = DEFAULT_PACK_TOKEN_BUDGET
 
-    # AI 윤리 가이드라인 검색 (RAG)
-    query = f"AI 윤리에서 {highest_risk_area} 개선 방법"
-    retrieved_docs = pdf_retriever.invoke(query)
-
-    # PDF 컨텍스트 크기 제한
-    ethics_guidelines_context = format_docs(retrieved_docs)
-    max_pdf_length = 1000  # 더 작은 크기로 제한
-    if len(ethics_guidelines_context) > max_pdf_length:
-        ethics_guidelines_context = ethics_guidelines_context[:max_pdf_length] + "..."
-
-    # 더 가벼운 모델 사용
-    llm = ChatOpenAI(model="gpt-3.5-turbo")
-
-    # 간소화된 프롬프트
-    improvement_prompt = """
+# 간소화된 프롬프트
+IMPROVEMENT_PROMPT = ChatPromptTemplate.from_template("""
     # AI 윤리 개선안 제안 에이전트
 
     당신은 AI 서비스의 윤리적 리스크를 개선하는 전문가입니다. 평가된 리스크를 기반으로 구체적인 개선안을 제안하세요.
@@ -106,7 +69,48 @@ def suggest_improvements(state: GraphState, pdf_retriever) -> GraphState:
       "implementation_roadmap": "전체 개선안 로드맵 요약"
     }}
     ```
+    """)
+
+
+def _build_search_query(service_info, highest_risk_area) -> str:
+    return f"AI ethics {highest_risk_area} best practices {service_info['primary_function']}"
+
+
+def build_guideline_query(highest_risk_area) -> str:
     """
+    개선 가이드라인 PDF 검색 쿼리를 생성합니다.
+
+    Args:
+        highest_risk_area (str): 가장 높은 리스크 영역
+
+    Returns:
+        str: 검색 쿼리
+    """
+    return f"AI 윤리에서 {highest_risk_area} 개선 방법"
+
+
+def _format_best_practices(search_result, query) -> str:
+    # 검색 결과를 토큰 예산 안에서 관련도 높은 결과부터 담음
+    return pack_context(
+        search_result,
+        context_budget(IMPROVEMENT_MODEL, BEST_PRACTICES_CONTEXT_TOKENS),
+        model=IMPROVEMENT_MODEL,
+        query=query
+    )["text"]
+
+
+def _format_guidelines(retrieved_docs, query) -> str:
+    # PDF 청크를 토큰 예산 안에서 관련도 높은 청크부터 담음
+    return pack_context(
+        [format_docs([doc]) for doc in retrieved_docs],
+        context_budget(IMPROVEMENT_MODEL, GUIDELINES_CONTEXT_TOKENS),
+        model=IMPROVEMENT_MODEL,
+        query=query
+    )["text"]
+
+
+def _build_prompt(service_info, risk_assessment, best_practices_context, ethics_guidelines_context) -> str:
+    highest_risk_area = risk_assessment["highest_risk_area"]
 
     # JSON 데이터 간소화 - 필요한 필드만 포함
     service_info_slim = {
@@ -125,44 +129,201 @@ def suggest_improvements(state: GraphState, pdf_retriever) -> GraphState:
     # 필수 평가 항목만 포함
     if "risk_assessments" in risk_assessment:
         high_risk_items = [item for item in risk_assessment["risk_assessments"]
-                          if item["category"] == highest_risk_area or item.get("score", 0) >= 4]
+                          if item["category"] == highest_risk_area or (item.get("score") or 0) >= 4]
         if high_risk_items:
             risk_assessment_slim["risk_assessments"] = high_risk_items
 
     service_info_str = json.dumps(service_info_slim, ensure_ascii=False)
     risk_assessment_str = json.dumps(risk_assessment_slim, ensure_ascii=False)
 
-    response = llm.invoke(
-        ChatPromptTemplate.from_template(improvement_prompt).format(
-            service_info=service_info_str,
-            risk_assessment=risk_assessment_str,
-            best_practices=best_practices_context,
-            ethics_guidelines=ethics_guidelines_context,
-            highest_risk_area=highest_risk_area
-        )
+    return IMPROVEMENT_PROMPT.format(
+        service_info=service_info_str,
+        risk_assessment=risk_assessment_str,
+        best_practices=best_practices_context,
+        ethics_guidelines=ethics_guidelines_context,
+        highest_risk_area=highest_risk_area
     )
 
-    try:
-        json_str = response.content
-        if "```json" in json_str:
-            json_str = json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in json_str:
-            json_str = json_str.split("```")[1].split("```")[0].strip()
 
-        improvement_suggestions = json.loads(json_str)
-        logger.info(f"개선안 작성 완료. 우선 개선 영역: {improvement_suggestions['priority_area']}")
+def _validate_response(content):
+    # 빠른 모델 응답에 보고서 노드가 사용하는 필드가 없으면 강한 모델로 다시 호출
+    improvement_suggestions = parse_json_response(content)
+    missing = [key for key in ("priority_area", "improvement_plan") if key not in improvement_suggestions]
+    if missing:
+        raise ValueError(f"필수 항목 누락: {', '.join(missing)}")
+    return improvement_suggestions
 
-        messages = state.get("messages", []).copy()
-        messages.append(AIMessage(content=f"윤리적 리스크 개선안 작성 완료. 최우선 개선 영역: {highest_risk_area}"))
+
+def _process_response(state: GraphState, response) -> GraphState:
+    highest_risk_area = state["risk_assessment"]["highest_risk_area"]
+    try:
+        improvement_suggestions = parse_json_response(response.content)
+        record_json_parse(True)
+        logger.info(f"개선안 작성 완료. 우선 개선 영역: {improvement_suggestions['priority_area']}")
 
         return {
-            **state,
             "improvement_suggestions": improvement_suggestions,
-            "messages": messages,
+            "messages": [AIMessage(content=f"윤리적 리스크 개선안 작성 완료. 최우선 개선 영역: {highest_risk_area}")],
             "next": "generate_report"
         }
     except Exception as e:
+        record_json_parse(False)
         logger.error(f"개선안 작성 중 오류 발생: {str(e)}")
-        messages = state.get("messages", []).copy()
-        messages.append(AIMessage(content=f"개선안 작성 중 오류가 발생했습니다: {str(e)}"))
-        return {**state, "messages": messages, "next": "end"}
\ No newline at end of file
+        return {"messages": [AIMessage(content=f"개선안 작성 중 오류가 발생했습니다: {str(e)}")], "next": "end"}
+
+
+def search_best_practices(state: GraphState) -> GraphState:
+    """
+    최고 리스크 영역의 업계 모범 사례를 웹에서 검색합니다.
+
+    retrieve_improvement_guidelines와 병렬로 실행되며 best_practices_context 키만 반환합니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+
+    Returns:
+        GraphState: best_practices_context가 담긴 상태 변경분
+    """
+    highest_risk_area = state["risk_assessment"]["highest_risk_area"]
+
+    # 관련 사례 검색 (Tavily) - 결과 크기 줄이기
+    search_query = _build_search_query(state["service_info"], highest_risk_area)
+    with log_elapsed(logger, "모범 사례 검색"):
+        search_result = get_search_tool().search(
+            query=search_query,
+            topic="general",
+            max_results=2,  # 제한된 결과 수
+            format_output=True,
+        )
+    return {"best_practices_context": _format_best_practices(search_result, search_query)}
+
+
+async def search_best_practices_async(state: GraphState) -> GraphState:
+    """
+    search_best_practices()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+
+    Returns:
+        GraphState: best_practices_context가 담긴 상태 변경분
+    """
+    highest_risk_area = state["risk_assessment"]["highest_risk_area"]
+
+    # 관련 사례 검색 (Tavily) - 결과 크기 줄이기
+    search_query = _build_search_query(state["service_info"], highest_risk_area)
+    with log_elapsed(logger, "모범 사례 검색"):
+        search_result = await get_search_tool().asearch(
+            query=search_query,
+            topic="general",
+            max_results=2,  # 제한된 결과 수
+            format_output=True,
+        )
+    return {"best_practices_context": _format_best_practices(search_result, search_query)}
+
+
+def retrieve_improvement_guidelines(state: GraphState, pdf_retriever) -> GraphState:
+    """
+    최고 리스크 영역의 개선 방법을 AI 윤리 가이드라인 PDF에서 검색합니다.
+
+    search_best_practices와 병렬로 실행되며 guidelines_context 키만 반환합니다.
+    해당 영역의 컨텍스트 팩이 있으면 검색하지 않고 팩을 사용합니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        pdf_retriever: PDF 문서 검색기
+
+    Returns:
+        GraphState: guidelines_context가 담긴 상태 변경분
+    """
+    highest_risk_area = state["risk_assessment"]["highest_risk_area"]
+
+    # 미리 생성된 항목별 컨텍스트 팩이 있으면 검색 없이 사용
+    pack = get_context_pack(pdf_retriever, highest_risk_area)
+    if pack is not None:
+        return {"guidelines_context": pack}
+
+    # AI 윤리 가이드라인 검색 (RAG)
+    query = build_guideline_query(highest_risk_area)
+    with log_elapsed(logger, "개선 가이드라인 검색", metric="retrieval"):
+        retrieved_docs = pdf_retriever.invoke(query)
+    return {"guidelines_context": _format_guidelines(retrieved_docs, query)}
+
+
+async def retrieve_improvement_guidelines_async(state: GraphState, pdf_retriever) -> GraphState:
+    """
+    retrieve_improvement_guidelines()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        pdf_retriever: PDF 문서 검색기
+
+    Returns:
+        GraphState: guidelines_context가 담긴 상태 변경분
+    """
+    highest_risk_area = state["risk_assessment"]["highest_risk_area"]
+
+    # 미리 생성된 항목별 컨텍스트 팩이 있으면 검색 없이 사용
+    pack = get_context_pack(pdf_retriever, highest_risk_area)
+    if pack is not None:
+        return {"guidelines_context": pack}
+
+    # AI 윤리 가이드라인 검색 (RAG)
+    query = build_guideline_query(highest_risk_area)
+    with log_elapsed(logger, "개선 가이드라인 검색", metric="retrieval"):
+        retrieved_docs = await pdf_retriever.ainvoke(query)
+    return {"guidelines_context": _format_guidelines(retrieved_docs, query)}
+
+
+def suggest_improvements(state: GraphState, config=None) -> GraphState:
+    """
+    AI 서비스의 윤리적 리스크에 대한 개선안을 제안합니다.
+
+    모범 사례와 가이드라인 컨텍스트는 병렬 검색 노드가 미리 채워 둔 값을 사용합니다.
+    cascade 라우팅 정책에서는 중요한 의사결정이나 취약 계층 플래그가 있는 서비스와
+    검증에 실패한 응답에만 강한 모델을 사용합니다.
+    
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (model_routing 옵션)
+        
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("개선안 제안 시작")
+    logger.info(f"최고 리스크 영역: {state['risk_assessment']['highest_risk_area']}")
+
+    response = invoke_routed(
+        _build_prompt(state["service_info"], state["risk_assessment"],
+                      state["best_practices_context"], state["guidelines_context"]),
+        config,
+        IMPROVEMENT_MODEL,
+        service_info=state["service_info"],
+        validate=_validate_response
+    )
+    return _process_response(state, response)
+
+
+async def suggest_improvements_async(state: GraphState, config=None) -> GraphState:
+    """
+    suggest_improvements()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (model_routing 옵션)
+
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("개선안 제안 시작")
+    logger.info(f"최고 리스크 영역: {state['risk_assessment']['highest_risk_area']}")
+
+    response = await ainvoke_routed(
+        _build_prompt(state["service_info"], state["risk_assessment"],
+                      state["best_practices_context"], state["guidelines_context"]),
+        config,
+        IMPROVEMENT_MODEL,
+        service_info=state["service_info"],
+        validate=_validate_response
+    )
+    return _process_response(state, response)
@@ -4,33 +4,29 @@
 
 import json
 import logging
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from src.types import GraphState
+from src.llm import count_tokens, context_budget
+from src.metrics import record_context_pack
+from src.nodes.report_template import render_report_sections
+from src.nodes.routing import stream_routed, astream_routed
+from src.nodes.utils import get_node_stream_writer, get_run_option
 
 logger = logging.getLogger(__name__)
 
-def generate_report(state: GraphState) -> GraphState:
-    """
-    AI 서비스에 대한 윤리적 평가 결과를 종합한 보고서를 생성합니다.
-    
-    Args:
-        state (GraphState): 현재 그래프 상태
-        
-    Returns:
-        GraphState: 업데이트된 그래프 상태
-    """
-    logger.info("최종 보고서 생성 시작")
-    service_info = state["service_info"]
-    risk_assessment = state["risk_assessment"]
-    improvement_suggestions = state["improvement_suggestions"]
+# fixed 라우팅 정책에서 사용하는 가벼운 모델이자 컨텍스트 토큰 예산 기준 모델
+REPORT_MODEL = "gpt-3.5-turbo"
 
-    # 가벼운 모델 사용
-    llm = ChatOpenAI(model="gpt-3.5-turbo")
+# 보고서 프롬프트에 넣을 개선 제안의 토큰 상한
+REPORT_IMPROVEMENT_TOKENS = 1500
 
-    # 간소화된 프롬프트
-    report_prompt = """
+# 보고서 생성 방식
+REPORT_MODE_LLM = "llm"
+REPORT_MODE_TEMPLATE = "template"
+
+# 간소화된 프롬프트
+REPORT_PROMPT = ChatPromptTemplate.from_template("""
     # AI 윤리 평가 보고서 생성기
 
     당신은 AI 서비스의 윤리적 평가 결과를 전문적인 보고서로 작성하는 전문가입니다.
@@ -51,7 +47,66 @@ def generate_report(state: GraphState) -> GraphState:
     4. 경영진을 위한 요약(Executive Summary)을 포함하세요.
 
     마크다운 형식으로 보고서를 작성하세요. 반드시 "SUMMARY" 단락이 최상단에 위치해야 합니다.
+    """)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _fit_improvement_plan(improvement_suggestions, token_budget):
     """
+    개선 제안을 토큰 예산 안에 들어가도록 줄인 복사본을 반환합니다.
+
+    우선 개선 영역의 계획부터 담고, 각 영역의 제안은 순서대로 예산에 맞는 것만 담습니다.
+    제안을 하나도 담지 못한 영역은 제외합니다.
+
+    Args:
+        improvement_suggestions (dict): 개선안 (improvement_plan 포함)
+        token_budget (int): 최대 토큰 수
+
+    Returns:
+        dict: 예산에 맞춘 개선안
+    """
+    plans = improvement_suggestions["improvement_plan"]
+    priority_area = improvement_suggestions.get("priority_area")
+    # 정렬은 안정적이므로 우선 영역 이외 계획의 순서는 유지됨
+    plans = sorted(plans, key=lambda plan: plan.get("area") != priority_area)
+
+    fitted = {**improvement_suggestions, "improvement_plan": []}
+    used = count_tokens(_dumps(fitted), REPORT_MODEL)
+    dropped = 0
+    for plan in plans:
+        suggestions = plan.get("suggestions")
+        kept = {**plan, "suggestions": []} if suggestions is not None else plan
+        cost = count_tokens(_dumps(kept), REPORT_MODEL)
+        if used + cost > token_budget:
+            dropped += count_tokens(_dumps(plan), REPORT_MODEL)
+            continue
+
+        plan_tokens = cost
+        for suggestion in suggestions or []:
+            suggestion_tokens = count_tokens(_dumps(suggestion), REPORT_MODEL)
+            if used + plan_tokens + suggestion_tokens > token_budget:
+                dropped += suggestion_tokens
+                continue
+            kept["suggestions"].append(suggestion)
+            plan_tokens += suggestion_tokens
+
+        if suggestions and not kept["suggestions"]:
+            dropped += cost
+            continue
+        fitted["improvement_plan"].append(kept)
+        used += plan_tokens
+
+    record_context_pack(used, dropped)
+    return fitted
+
+
+def _build_prompt(state: GraphState) -> str:
+    service_info = state["service_info"]
+    risk_assessment = state["risk_assessment"]
+    improvement_suggestions = state["improvement_suggestions"]
 
     # JSON 데이터 간소화 - 필요한 필드만 포함
     service_info_slim = {
@@ -78,36 +133,113 @@ def generate_report(state: GraphState) -> GraphState:
     service_info_str = json.dumps(service_info_slim, ensure_ascii=False)
     risk_assessment_str = json.dumps(risk_assessment_slim, ensure_ascii=False)
 
-    # improvement_suggestions도 간소화
+    # improvement_suggestions도 간소화 (상태를 변경하지 않도록 복사본을 사용)
     if "improvement_plan" in improvement_suggestions:
-        # 계획에서 최대 2개 항목만 포함
-        if len(improvement_suggestions["improvement_plan"]) > 2:
-            improvement_suggestions["improvement_plan"] = improvement_suggestions["improvement_plan"][:2]
-
-        # 각 영역의 제안사항도 최대 2개로 제한
-        for plan in improvement_suggestions["improvement_plan"]:
-            if "suggestions" in plan and len(plan["suggestions"]) > 2:
-                plan["suggestions"] = plan["suggestions"][:2]
-
-    improvement_suggestions_str = json.dumps(improvement_suggestions, ensure_ascii=False)
-
-    response = llm.invoke(
-        ChatPromptTemplate.from_template(report_prompt).format(
+        prompt_tokens = count_tokens(REPORT_PROMPT.format(
             service_info=service_info_str,
             risk_assessment=risk_assessment_str,
-            improvement_suggestions=improvement_suggestions_str
+            improvement_suggestions=""
+        ), REPORT_MODEL)
+        improvement_suggestions = _fit_improvement_plan(
+            improvement_suggestions,
+            context_budget(REPORT_MODEL, REPORT_IMPROVEMENT_TOKENS, prompt_tokens=prompt_tokens)
         )
+
+    improvement_suggestions_str = json.dumps(improvement_suggestions, ensure_ascii=False)
+
+    return REPORT_PROMPT.format(
+        service_info=service_info_str,
+        risk_assessment=risk_assessment_str,
+        improvement_suggestions=improvement_suggestions_str
     )
 
-    final_report = response.content
-    logger.info("최종 보고서 생성 완료")
 
-    messages = state.get("messages", []).copy()
-    messages.append(AIMessage(content="AI 윤리 평가 최종 보고서가 생성되었습니다."))
+def _token_handler():
+    # 스트리밍 실행이면 보고서 토큰을 custom 스트림으로 전달
+    writer = get_node_stream_writer()
+    if writer is None:
+        return None
+    return lambda text: writer({"report_token": text})
+
+
+def _get_report_mode(config) -> str:
+    report_mode = get_run_option(config, "report_mode", REPORT_MODE_LLM)
+    if report_mode not in (REPORT_MODE_LLM, REPORT_MODE_TEMPLATE):
+        logger.warning(f"알 수 없는 보고서 모드 '{report_mode}', {REPORT_MODE_LLM} 모드로 실행합니다.")
+        return REPORT_MODE_LLM
+    return report_mode
+
+
+def _render_template_report(state: GraphState) -> str:
+    # 템플릿 보고서도 스트리밍 실행에서는 섹션 단위로 전달
+    on_token = _token_handler()
+    sections = render_report_sections(
+        state["service_info"],
+        state["risk_assessment"],
+        state["improvement_suggestions"]
+    )
+    if on_token is not None:
+        for section in sections:
+            on_token(section)
+    return "".join(sections)
+
+
+def _process_report(final_report: str) -> GraphState:
+    logger.info("최종 보고서 생성 완료")
 
     return {
-        **state,
         "final_report": final_report,
-        "messages": messages,
+        "messages": [AIMessage(content="AI 윤리 평가 최종 보고서가 생성되었습니다.")],
         "next": "end"
-    }
\ No newline at end of file
+    }
+
+
+def generate_report(state: GraphState, config=None) -> GraphState:
+    """
+    AI 서비스에 대한 윤리적 평가 결과를 종합한 보고서를 생성합니다.
+
+    실행 옵션 report_mode로 생성 방식을 고릅니다.
+    - llm (기본값): LLM이 보고서를 작성하며 토큰 단위로 스트리밍됩니다.
+    - template: LLM 호출 없이 구조화된 결과로 보고서를 렌더링합니다. 개선안을 잘라내지 않으며
+      같은 입력에는 항상 같은 보고서를 만듭니다.
+
+    llm 모드의 모델은 실행 옵션 model_routing으로 고릅니다. cascade 정책에서는 중요한 의사결정이나
+    취약 계층 플래그가 있는 서비스에만 강한 모델을 사용합니다.
+
+    그래프를 stream_mode="custom"으로 실행하면 보고서가 {"report_token": 텍스트} 형태로
+    생성되는 즉시 전달됩니다.
+    
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (configurable.report_mode, model_routing)
+        
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("최종 보고서 생성 시작")
+    if _get_report_mode(config) == REPORT_MODE_TEMPLATE:
+        return _process_report(_render_template_report(state))
+
+    response = stream_routed(_build_prompt(state), config, REPORT_MODEL,
+                             service_info=state["service_info"], on_token=_token_handler())
+    return _process_report(response.content)
+
+
+async def generate_report_async(state: GraphState, config=None) -> GraphState:
+    """
+    generate_report()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (configurable.report_mode, model_routing)
+
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("최종 보고서 생성 시작")
+    if _get_report_mode(config) == REPORT_MODE_TEMPLATE:
+        return _process_report(_render_template_report(state))
+
+    response = await astream_routed(_build_prompt(state), config, REPORT_MODEL,
+                                    service_info=state["service_info"], on_token=_token_handler())
+    return _process_report(response.content)
@@ -0,0 +1,206 @@
+"""
+템플릿 기반 보고서 렌더러
+
+LLM 호출 없이 구조화된 상태(service_info, risk_assessment, improvement_suggestions)로
+마크다운 보고서를 생성합니다. 같은 입력에는 항상 같은 바이트의 보고서를 만듭니다.
+"""
+
+RISK_FLAG_LABELS = {
+    "critical_decisions": "중요한 의사결정에 관여",
+    "vulnerable_users": "취약 계층 사용자 대상",
+    "sensitive_topics": "민감한 주제 다룸",
+    "personal_data_processing": "개인정보 처리",
+    "severe_malfunction_risk": "오작동 시 심각한 피해 가능",
+}
+
+
+def _cell(value):
+    # 마크다운 표 셀이 깨지지 않도록 줄바꿈과 구분자 처리
+    if value is None or value == "":
+        return "-"
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(item) for item in value)
+    return str(value).replace("|", "\\|").replace("\r", " ").replace("\n", " ").strip()
+
+
+def _score_text(score):
+    return "평가 실패" if score is None else f"{score}/5"
+
+
+def risk_level(score):
+    """
+    리스크 점수를 수준으로 변환합니다.
+
+    Args:
+        score (float | None): 1-5점 리스크 점수
+
+    Returns:
+        str: 높음/중간/낮음 또는 알 수 없음
+    """
+    if score is None:
+        return "알 수 없음"
+    if score >= 4:
+        return "높음"
+    if score >= 2.5:
+        return "중간"
+    return "낮음"
+
+
+def _summary_section(service_info, risk_assessment, improvement_suggestions):
+    overall = risk_assessment.get("overall_risk_score")
+    lines = [
+        "## SUMMARY",
+        "",
+        f"- 평가 대상: {service_info.get('service_name', '-')} ({_cell(service_info.get('primary_function'))})",
+        f"- 전체 리스크 점수: {_score_text(overall)} (리스크 수준: {risk_level(overall)})",
+        f"- 가장 높은 리스크 영역: {risk_assessment.get('highest_risk_area', '-')}",
+        f"- 우선 개선 영역: {improvement_suggestions.get('priority_area', '-')}",
+    ]
+    if risk_assessment.get("summary"):
+        lines.append(f"- 요약: {_cell(risk_assessment['summary'])}")
+    return lines
+
+
+def _overview_section(service_info):
+    rows = [
+        ("서비스 이름", service_info.get("service_name")),
+        ("주요 기능", service_info.get("primary_function")),
+        ("대상 사용자", service_info.get("target_users")),
+        ("데이터 소스", service_info.get("data_sources")),
+        ("모델 유형", service_info.get("model_type")),
+        ("의사결정 영향", service_info.get("decision_impact")),
+        ("사용자 상호작용", service_info.get("user_interaction")),
+    ]
+    lines = ["## 서비스 개요", "", "| 항목 | 내용 |", "|------|------|"]
+    lines.extend(f"| {label} | {_cell(value)} |" for label, value in rows)
+
+    if service_info.get("detailed_description"):
+        lines.extend(["", service_info["detailed_description"].strip()])
+
+    risk_flags = service_info.get("risk_flags") or {}
+    if risk_flags:
+        lines.extend(["", "### 리스크 플래그", ""])
+        for flag, label in RISK_FLAG_LABELS.items():
+            if flag in risk_flags:
+                lines.append(f"- {label}: {'예' if risk_flags[flag] else '아니오'}")
+
+    if service_info.get("additional_notes"):
+        lines.extend(["", f"추가 고려사항: {service_info['additional_notes'].strip()}"])
+    return lines
+
+
+def _risk_section(risk_assessment):
+    items = risk_assessment.get("risk_assessments", [])
+    lines = [
+        "## 윤리적 리스크 평가 결과",
+        "",
+        "| 항목 | 점수 | 수준 | 평가 근거 |",
+        "|------|------|------|-----------|",
+    ]
+    lines.extend(
+        f"| {_cell(item.get('category'))} | {_score_text(item.get('score'))} "
+        f"| {risk_level(item.get('score'))} | {_cell(item.get('rationale'))} |"
+        for item in items
+    )
+    lines.append(f"| **전체** | **{_score_text(risk_assessment.get('overall_risk_score'))}** "
+                 f"| {risk_level(risk_assessment.get('overall_risk_score'))} | - |")
+
+    lines.extend(["", "### 항목별 위험 요소"])
+    for item in items:
+        lines.extend(["", f"#### {item.get('category')} ({_score_text(item.get('score'))})", ""])
+        factors = item.get("risk_factors") or []
+        lines.extend(f"- {_cell(factor)}" for factor in factors)
+        if not factors:
+            lines.append("- 확인된 위험 요소 없음")
+        if item.get("evidence"):
+            lines.extend(["", f"근거: {_cell(item['evidence'])}"])
+    return lines
+
+
+def _improvement_section(improvement_suggestions):
+    lines = [
+        "## 개선안",
+        "",
+        f"우선 개선 영역: **{improvement_suggestions.get('priority_area', '-')}**",
+    ]
+    for plan in improvement_suggestions.get("improvement_plan", []):
+        lines.extend([
+            "",
+            f"### {plan.get('area', '-')}",
+            "",
+            "| 개선안 | 설명 | 난이도 | 기대효과 |",
+            "|--------|------|--------|----------|",
+        ])
+        lines.extend(
+            f"| {_cell(suggestion.get('title'))} | {_cell(suggestion.get('description'))} "
+            f"| {_cell(suggestion.get('difficulty'))} | {_cell(suggestion.get('expected_impact'))} |"
+            for suggestion in plan.get("suggestions", [])
+        )
+
+    lines.extend(["", "## 구현 로드맵", "", (improvement_suggestions.get("implementation_roadmap") or "-").strip()])
+    return lines
+
+
+def _executive_section(service_info, risk_assessment, improvement_suggestions):
+    items = [item for item in risk_assessment.get("risk_assessments", []) if item.get("score") is not None]
+    high_items = [item["category"] for item in items if item["score"] >= 4]
+    suggestion_count = sum(len(plan.get("suggestions", []))
+                           for plan in improvement_suggestions.get("improvement_plan", []))
+
+    lines = [
+        "## Executive Summary",
+        "",
+        f"{service_info.get('service_name', '평가 대상 서비스')}의 전체 윤리 리스크는 "
+        f"{_score_text(risk_assessment.get('overall_risk_score'))}로 "
+        f"'{risk_level(risk_assessment.get('overall_risk_score'))}' 수준입니다.",
+    ]
+    if high_items:
+        lines.append(f"높은 리스크(4점 이상) 항목은 {', '.join(high_items)}입니다.")
+    else:
+        lines.append("4점 이상의 높은 리스크 항목은 없습니다.")
+    lines.append(
+        f"{len(improvement_suggestions.get('improvement_plan', []))}개 영역에 걸쳐 {suggestion_count}개의 개선안을 "
+        f"제시하며, {improvement_suggestions.get('priority_area', '-')} 영역을 우선 개선할 것을 권고합니다."
+    )
+    return lines
+
+
+def render_report_sections(service_info, risk_assessment, improvement_suggestions):
+    """
+    보고서를 섹션 단위 마크다운 문자열 목록으로 생성합니다.
+
+    Args:
+        service_info (dict): 서비스 분석 결과
+        risk_assessment (dict): 리스크 평가 결과
+        improvement_suggestions (dict): 개선안
+
+    Returns:
+        list: 섹션별 마크다운 문자열 (이어 붙이면 전체 보고서)
+    """
+    title = [f"# {service_info.get('service_name', 'AI 서비스')} AI 윤리 평가 보고서"]
+    sections = [
+        title,
+        _summary_section(service_info, risk_assessment, improvement_suggestions),
+        _overview_section(service_info),
+        _risk_section(risk_assessment),
+        _improvement_section(improvement_suggestions),
+        _executive_section(service_info, risk_assessment, improvement_suggestions),
+    ]
+    return ["\n".join(lines) + "\n\n" for lines in sections[:-1]] + ["\n".join(sections[-1]) + "\n"]
+
+
+def render_report(service_info, risk_assessment, improvement_suggestions):
+    """
+    구조화된 평가 결과로 마크다운 보고서를 생성합니다.
+
+    개선안은 잘라내지 않고 모두 포함합니다.
+
+    Args:
+        service_info (dict): 서비스 분석 결과
+        risk_assessment (dict): 리스크 평가 결과
+        improvement_suggestions (dict): 개선안
+
+    Returns:
+        str: 마크다운 보고서
+    """
+    return "".join(render_report_sections(service_info, risk_assessment, improvement_suggestions))
@@ -4,37 +4,48 @@
 
 import json
 import logging
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_opentutorial.rag.utils import format_docs
 from src.types import GraphState
+from src.llm import count_tokens, context_budget
+from src.metrics import record_json_parse
+from src.retrieval import pack_context
+from src.nodes.routing import invoke_routed, ainvoke_routed, batch_routed, abatch_routed
+from src.nodes.utils import parse_json_response, log_elapsed, get_run_option, get_context_pack
+from src.nodes.improvement import build_guideline_query
 
 logger = logging.getLogger(__name__)
 
-def assess_risks(state: GraphState, pdf_retriever, pdf_chain) -> GraphState:
-    """
-    AI 서비스의 윤리적 리스크를 평가합니다.
-    
-    Args:
-        state (GraphState): 현재 그래프 상태
-        pdf_retriever: PDF 문서 검색기
-        pdf_chain: PDF 처리 체인
-        
-    Returns:
-        GraphState: 업데이트된 그래프 상태
-    """
-    logger.info("윤리적 리스크 평가 시작")
-    service_info = state["service_info"]
+# fixed 라우팅 정책에서 사용하는 모델이자 컨텍스트 토큰 예산 기준 모델
+RISK_MODEL = "gpt-4"
+
+# 리스크 평가 프롬프트에 넣을 가이드라인 컨텍스트의 토큰 상한
+RISK_CONTEXT_TOKENS = 3000
+
+# cascade 라우팅 정책에서 빠른 모델의 점수가 이 범위(양 끝 포함)에 있으면 강한 모델로 다시 평가
+# ('높음' 수준 기준인 4점에 바로 걸친 점수: 항목 점수는 4점, 전체 점수는 3.8~4.2점)
+BORDERLINE_SCORE_RANGE = (3.75, 4.25)
 
-    # PDF에서 관련 내용 검색
-    query = f"AI 윤리 원칙과 {service_info['primary_function']} 관련 리스크"
-    retrieved_docs = pdf_retriever.invoke(query)
-    ethics_context = format_docs(retrieved_docs)
+# 리스크 평가 모드
+# combined: 한 번의 LLM 호출로 모든 항목을 평가
+# per_category: 항목별 검색과 LLM 호출을 동시에 실행한 뒤 결과를 병합
+RISK_MODE_COMBINED = "combined"
+RISK_MODE_PER_CATEGORY = "per_category"
 
-    llm = ChatOpenAI(model="gpt-4")
+# 평가 항목: 한글 이름 -> (영문 이름, 평가 기준)
+RISK_CATEGORIES = {
+    "공정성": ("Fairness", "서비스가 다양한 인구 집단에 대해 차별 없이 작동하는지 평가"),
+    "프라이버시": ("Privacy", "개인정보 보호 수준 평가"),
+    "투명성": ("Transparency", "AI 시스템의 작동 방식과 의사결정에 대한 투명성 평가"),
+    "안전성": ("Safety", "서비스 사용으로 인한 잠재적 위험 평가"),
+    "책임성": ("Accountability", "문제 발생 시 책임 소재와 해결 방안 평가"),
+}
 
-    risk_assessment_prompt = """
+# 컨텍스트 팩 사용 시 항목별로 덧붙이는 서비스 관련 검색 결과 수
+PACK_SERVICE_DOCS = 3
+
+RISK_ASSESSMENT_PROMPT = ChatPromptTemplate.from_template("""
     # AI 윤리 리스크 진단 에이전트
 
     당신은 AI 서비스의 윤리적 리스크를 평가하는 전문가입니다. EU AI Act와 AI 윤리 원칙에 따라
@@ -91,46 +102,457 @@ def assess_risks(state: GraphState, pdf_retriever, pdf_chain) -> GraphState:
       "summary": "종합적인 리스크 평가 요약"
     }}
     ```
-    """
+    """)
+
 
+CATEGORY_RISK_PROMPT = ChatPromptTemplate.from_template("""
+    # AI 윤리 리스크 진단 에이전트
+
+    당신은 AI 서비스의 윤리적 리스크를 평가하는 전문가입니다. EU AI Act와 AI 윤리 원칙에 따라
+    주어진 AI 서비스의 윤리적 리스크를 아래 한 가지 항목에 대해서만 진단하세요.
+
+    ## 서비스 정보
+    {service_info}
+
+    ## AI 윤리 관련 컨텍스트
+    {ethics_context}
+
+    ## 평가 대상 항목: {category}({category_en})
+    - {criteria}
+
+    1-5점 척도(1: 매우 낮은 리스크, 5: 매우 높은 리스크)로 평가하고, 상세한 근거를 제시하세요.
+
+    ## 출력 형식
+    다음 JSON 구조로 평가 결과를 반환하세요:
+
+    ```json
+    {{
+      "category": "{category}",
+      "score": 3,
+      "rationale": "평가 근거 상세 설명",
+      "risk_factors": ["위험요소 1", "위험요소 2"],
+      "evidence": "발견된 증거"
+    }}
+    ```
+
+    JSON 형식만 반환하세요.
+    """)
+
+
+def _build_query(service_info) -> str:
+    return f"AI 윤리 원칙과 {service_info['primary_function']} 관련 리스크"
+
+
+def _build_prompt(service_info, ethics_context) -> str:
     service_info_str = json.dumps(service_info, ensure_ascii=False)
+    return RISK_ASSESSMENT_PROMPT.format(
+        service_info=service_info_str,
+        ethics_context=ethics_context
+    )
 
-    response = llm.invoke(
-        ChatPromptTemplate.from_template(risk_assessment_prompt).format(
-            service_info=service_info_str,
-            ethics_context=ethics_context
-        )
+
+def _build_category_query(service_info, category) -> str:
+    category_en = RISK_CATEGORIES[category][0]
+    return f"AI 윤리 {category}({category_en}) 원칙과 {service_info['primary_function']} 관련 리스크"
+
+
+def _build_category_prompt(service_info, category, ethics_context) -> str:
+    category_en, criteria = RISK_CATEGORIES[category]
+    return CATEGORY_RISK_PROMPT.format(
+        service_info=json.dumps(service_info, ensure_ascii=False),
+        ethics_context=ethics_context,
+        category=category,
+        category_en=category_en,
+        criteria=criteria
     )
 
+
+def _check_category_content(content):
+    item = parse_json_response(content)
+    score = item.get("score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 1 <= score <= 5:
+        raise ValueError(f"잘못된 점수: {score!r}")
+    return item
+
+
+def _parse_category_content(content):
     try:
-        json_str = response.content
-        if "```json" in json_str:
-            json_str = json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in json_str:
-            json_str = json_str.split("```")[1].split("```")[0].strip()
-
-        risk_assessment = json.loads(json_str)
-        logger.info(f"리스크 평가 완료: 전체 점수={risk_assessment['overall_risk_score']}")
-
-        messages = state.get("messages", []).copy()
-
-        summary_message = (
-            f"윤리적 리스크 평가 완료:\n"
-            f"전체 리스크 점수: {risk_assessment['overall_risk_score']}/5\n"
-            f"가장 높은 리스크 영역: {risk_assessment['highest_risk_area']}\n"
-            f"요약: {risk_assessment['summary']}"
-        )
+        item = _check_category_content(content)
+    except Exception:
+        record_json_parse(False)
+        raise
+    record_json_parse(True)
+    return item
+
+
+def _validate_assessment(content):
+    # 빠른 모델 응답에 보고서와 개선안 노드가 사용하는 필드가 없으면 강한 모델로 다시 평가
+    risk_assessment = parse_json_response(content)
+    missing = [key for key in ("risk_assessments", "overall_risk_score", "highest_risk_area", "summary")
+               if key not in risk_assessment]
+    if missing:
+        raise ValueError(f"필수 항목 누락: {', '.join(missing)}")
+    return risk_assessment
+
+
+def _is_borderline(score):
+    low, high = BORDERLINE_SCORE_RANGE
+    return isinstance(score, (int, float)) and not isinstance(score, bool) and low <= score <= high
+
+
+def _borderline_reason(items):
+    borderline = [f"{item.get('category')} {item.get('score')}점" for item in items if _is_borderline(item.get("score"))]
+    return f"borderline: {', '.join(borderline)}" if borderline else None
+
+
+def _assessment_borderline(risk_assessment):
+    # 한 항목이 아닌 전체 점수가 경계에 걸친 경우에만 전체 평가를 다시 받음
+    score = risk_assessment.get("overall_risk_score")
+    return f"borderline: 전체 {score}점" if _is_borderline(score) else None
+
+
+def _category_borderline(item):
+    return _borderline_reason([item])
+
+
+def is_degraded_assessment(output):
+    """
+    노드 출력의 리스크 평가에 평가하지 못한 항목(score가 None)이 있는지 확인합니다.
+
+    429나 파싱 실패는 다시 실행하면 성공할 수 있으므로 노드 출력 캐시에 저장하지 않는 데 사용합니다.
+
+    Args:
+        output (dict): assess_risks 노드 출력
+
+    Returns:
+        bool: 실패한 항목이 있으면 True
+    """
+    risk_assessment = output.get("risk_assessment") or {}
+    return any(item.get("score") is None for item in risk_assessment.get("risk_assessments") or [])
+
+
+def _parse_category_result(category, response):
+    if isinstance(response, Exception):
+        raise response
+
+    item = _parse_category_content(response.content)
+    score = item["score"]
+
+    # 항목 이름은 모델 출력이 아닌 요청한 항목으로 고정
+    return {
+        "category": category,
+        "score": score,
+        "rationale": item.get("rationale", ""),
+        "risk_factors": item.get("risk_factors", []),
+        "evidence": item.get("evidence", "")
+    }
+
+
+def merge_category_assessments(responses):
+    """
+    항목별 평가 응답을 기존 risk_assessment JSON 구조로 병합합니다.
+
+    overall_risk_score와 highest_risk_area는 모델 출력을 쓰지 않고 항목 점수로
+    직접 계산합니다. 파싱에 실패한 항목은 score가 None으로 기록되고 계산에서 제외됩니다.
+
+    Args:
+        responses (dict): 항목 이름 -> LLM 응답 또는 예외
+
+    Returns:
+        dict: risk_assessment 결과
+
+    Raises:
+        ValueError: 모든 항목의 평가가 실패한 경우
+    """
+    risk_assessments = []
+    for category, response in responses.items():
+        try:
+            risk_assessments.append(_parse_category_result(category, response))
+        except Exception as e:
+            logger.error(f"{category} 항목 평가 실패: {str(e)}")
+            risk_assessments.append({
+                "category": category,
+                "score": None,
+                "rationale": f"평가 실패: {str(e)}",
+                "risk_factors": [],
+                "evidence": ""
+            })
+
+    scored = [item for item in risk_assessments if item["score"] is not None]
+    if not scored:
+        raise ValueError("모든 리스크 항목의 평가에 실패했습니다.")
+
+    overall_risk_score = round(sum(item["score"] for item in scored) / len(scored), 1)
+    highest = max(scored, key=lambda item: item["score"])
+    failed = [item["category"] for item in risk_assessments if item["score"] is None]
+
+    summary = (
+        f"{len(scored)}개 항목의 평균 리스크 점수는 {overall_risk_score}/5이며, "
+        f"가장 높은 리스크 영역은 {highest['category']}({highest['score']}점)입니다. "
+        f"{highest['rationale']}"
+    )
+    if failed:
+        summary += f" (평가 실패 항목: {', '.join(failed)})"
+
+    return {
+        "risk_assessments": risk_assessments,
+        "overall_risk_score": overall_risk_score,
+        "highest_risk_area": highest["category"],
+        "summary": summary
+    }
+
+
+def _build_update(risk_assessment) -> GraphState:
+    logger.info(f"리스크 평가 완료: 전체 점수={risk_assessment['overall_risk_score']}")
+
+    summary_message = (
+        f"윤리적 리스크 평가 완료:\n"
+        f"전체 리스크 점수: {risk_assessment['overall_risk_score']}/5\n"
+        f"가장 높은 리스크 영역: {risk_assessment['highest_risk_area']}\n"
+        f"요약: {risk_assessment['summary']}"
+    )
 
-        messages.append(AIMessage(content=summary_message))
+    return {
+        "risk_assessment": risk_assessment,
+        "messages": [AIMessage(content=summary_message)],
+        "next": "suggest_improvements"
+    }
 
-        return {
-            **state,
-            "risk_assessment": risk_assessment,
-            "messages": messages,
-            "next": "suggest_improvements"
-        }
+
+def _build_error_update(error) -> GraphState:
+    logger.error(f"리스크 평가 중 오류 발생: {str(error)}")
+    return {"messages": [AIMessage(content=f"리스크 평가 중 오류가 발생했습니다: {str(error)}")], "next": "end"}
+
+
+def _process_response(response) -> GraphState:
+    try:
+        risk_assessment = parse_json_response(response.content)
+    except Exception as e:
+        record_json_parse(False)
+        return _build_error_update(e)
+    record_json_parse(True)
+    try:
+        return _build_update(risk_assessment)
     except Exception as e:
-        logger.error(f"리스크 평가 중 오류 발생: {str(e)}")
-        messages = state.get("messages", []).copy()
-        messages.append(AIMessage(content=f"리스크 평가 중 오류가 발생했습니다: {str(e)}"))
-        return {**state, "messages": messages, "next": "end"}
\ No newline at end of file
+        return _build_error_update(e)
+
+
+def _process_category_responses(responses) -> GraphState:
+    try:
+        return _build_update(merge_category_assessments(responses))
+    except Exception as e:
+        return _build_error_update(e)
+
+
+def _get_risk_mode(config) -> str:
+    mode = get_run_option(config, "risk_mode", RISK_MODE_COMBINED)
+    if mode not in (RISK_MODE_COMBINED, RISK_MODE_PER_CATEGORY):
+        logger.warning(f"알 수 없는 리스크 평가 모드 '{mode}', {RISK_MODE_COMBINED} 모드로 실행합니다.")
+        return RISK_MODE_COMBINED
+    return mode
+
+
+def category_pack_queries():
+    """
+    항목별 컨텍스트 팩 생성에 사용할 검색 쿼리를 반환합니다.
+
+    서비스와 무관한 항목 일반 쿼리와 개선 가이드라인 쿼리로 구성되며,
+    build_guideline_context_packs()에 전달합니다.
+
+    Returns:
+        dict: 항목 이름 -> 검색 쿼리 목록
+    """
+    return {
+        category: [
+            f"AI 윤리 {category}({category_en}) 원칙",
+            f"{category} {criteria}",
+            build_guideline_query(category)
+        ]
+        for category, (category_en, criteria) in RISK_CATEGORIES.items()
+    }
+
+
+def _pack_guidelines(service_info, snippets, query):
+    # 서비스 정보가 담긴 프롬프트의 나머지 부분을 뺀 토큰 예산 안에서 관련도 높은 조각부터 담음
+    prompt_tokens = count_tokens(_build_prompt(service_info, ""), RISK_MODEL)
+    budget = context_budget(RISK_MODEL, RISK_CONTEXT_TOKENS, prompt_tokens=prompt_tokens)
+    return pack_context(snippets, budget, model=RISK_MODEL, query=query)["text"]
+
+
+def _format_guidelines(service_info, docs, query):
+    return _pack_guidelines(service_info, [format_docs([doc]) for doc in docs], query)
+
+
+def _has_category_packs(pdf_retriever):
+    return all(get_context_pack(pdf_retriever, category) is not None for category in RISK_CATEGORIES)
+
+
+def _pack_category_contexts(pdf_retriever, service_info, service_docs, query):
+    # 항목별 팩(항목 일반 가이드라인)에 팩에 없는 서비스 관련 검색 결과를 덧붙임
+    contexts = {}
+    for category in RISK_CATEGORIES:
+        pack = get_context_pack(pdf_retriever, category)
+        extra_docs = [doc for doc in service_docs if doc.page_content not in pack][:PACK_SERVICE_DOCS]
+        contexts[category] = _pack_guidelines(
+            service_info, [pack] + [format_docs([doc]) for doc in extra_docs], query
+        )
+    return contexts
+
+
+def _run_queries(pdf_retriever, risk_queries):
+    # 개선 가이드라인 쿼리는 최고 리스크 영역이 정해진 뒤에 쓰이지만 후보가 평가 항목뿐이므로 함께 준비
+    # (컨텍스트 팩이 있는 항목은 검색하지 않으므로 제외)
+    return list(risk_queries) + [build_guideline_query(category) for category in RISK_CATEGORIES
+                                 if get_context_pack(pdf_retriever, category) is None]
+
+
+def _prefetch_queries(pdf_retriever, queries):
+    # 검색기가 지원하면 이번 실행의 검색 쿼리 임베딩을 한 번의 요청으로 미리 계산
+    prefetch = getattr(pdf_retriever, "prefetch_queries", None)
+    if prefetch is not None:
+        prefetch(_run_queries(pdf_retriever, queries))
+
+
+async def _aprefetch_queries(pdf_retriever, queries):
+    prefetch = getattr(pdf_retriever, "aprefetch_queries", None)
+    if prefetch is not None:
+        await prefetch(_run_queries(pdf_retriever, queries))
+
+
+def retrieve_risk_guidelines(state: GraphState, pdf_retriever, config=None) -> GraphState:
+    """
+    리스크 평가에 사용할 AI 윤리 가이드라인을 PDF에서 검색합니다.
+
+    서비스 분석 결과(primary_function)만 있으면 실행할 수 있으며,
+    검색 결과는 ethics_context 키로만 반환합니다. per_category 모드에서는
+    항목별 쿼리를 동시에 검색해 category_contexts 키로 반환합니다.
+    항목별 컨텍스트 팩이 있으면 항목별 검색 대신 팩에 서비스 관련 검색 결과(쿼리 1개)를 덧붙입니다.
+
+    검색 전에 이번 실행에 필요한 쿼리(개선 가이드라인 쿼리 포함)의 임베딩을
+    한 번의 요청으로 미리 계산합니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        pdf_retriever: PDF 문서 검색기
+        config (RunnableConfig, optional): 실행 설정 (risk_mode 옵션)
+
+    Returns:
+        GraphState: 검색 컨텍스트가 담긴 상태 변경분
+    """
+    service_info = state["service_info"]
+    per_category = _get_risk_mode(config) == RISK_MODE_PER_CATEGORY
+    if per_category and not _has_category_packs(pdf_retriever):
+        with log_elapsed(logger, "항목별 리스크 가이드라인 검색", metric="retrieval"):
+            queries = [_build_category_query(service_info, category) for category in RISK_CATEGORIES]
+            _prefetch_queries(pdf_retriever, queries)
+            results = pdf_retriever.batch(queries)
+        return {"category_contexts": {
+            category: _format_guidelines(service_info, docs, category_query)
+            for category, category_query, docs in zip(RISK_CATEGORIES, queries, results)
+        }}
+
+    with log_elapsed(logger, "리스크 가이드라인 검색", metric="retrieval"):
+        query = _build_query(service_info)
+        _prefetch_queries(pdf_retriever, [query])
+        retrieved_docs = pdf_retriever.invoke(query)
+    if per_category:
+        return {"category_contexts": _pack_category_contexts(pdf_retriever, service_info, retrieved_docs, query)}
+    return {"ethics_context": _format_guidelines(service_info, retrieved_docs, query)}
+
+
+async def retrieve_risk_guidelines_async(state: GraphState, pdf_retriever, config=None) -> GraphState:
+    """
+    retrieve_risk_guidelines()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        pdf_retriever: PDF 문서 검색기
+        config (RunnableConfig, optional): 실행 설정 (risk_mode 옵션)
+
+    Returns:
+        GraphState: 검색 컨텍스트가 담긴 상태 변경분
+    """
+    service_info = state["service_info"]
+    per_category = _get_risk_mode(config) == RISK_MODE_PER_CATEGORY
+    if per_category and not _has_category_packs(pdf_retriever):
+        with log_elapsed(logger, "항목별 리스크 가이드라인 검색", metric="retrieval"):
+            queries = [_build_category_query(service_info, category) for category in RISK_CATEGORIES]
+            await _aprefetch_queries(pdf_retriever, queries)
+            results = await pdf_retriever.abatch(queries)
+        return {"category_contexts": {
+            category: _format_guidelines(service_info, docs, category_query)
+            for category, category_query, docs in zip(RISK_CATEGORIES, queries, results)
+        }}
+
+    with log_elapsed(logger, "리스크 가이드라인 검색", metric="retrieval"):
+        query = _build_query(service_info)
+        await _aprefetch_queries(pdf_retriever, [query])
+        retrieved_docs = await pdf_retriever.ainvoke(query)
+    if per_category:
+        return {"category_contexts": _pack_category_contexts(pdf_retriever, service_info, retrieved_docs, query)}
+    return {"ethics_context": _format_guidelines(service_info, retrieved_docs, query)}
+
+
+def assess_risks(state: GraphState, config=None) -> GraphState:
+    """
+    AI 서비스의 윤리적 리스크를 평가합니다.
+
+    가이드라인 컨텍스트는 retrieve_risk_guidelines 노드가 미리 검색해 둔 값을 사용합니다.
+    per_category 모드에서는 항목별 LLM 호출을 동시에 실행하고, 전체 점수와
+    최고 리스크 영역을 항목 점수로 직접 계산합니다.
+
+    cascade 라우팅 정책에서는 서비스에 중요한 의사결정이나 취약 계층 플래그가 있으면 처음부터
+    강한 모델을 사용하고, 빠른 모델의 응답이 검증에 실패하거나 점수가 BORDERLINE_SCORE_RANGE에
+    있으면 강한 모델로 다시 평가합니다. per_category 모드에서는 경계에 걸린 항목만,
+    combined 모드에서는 전체 점수가 경계에 걸린 경우에만 다시 평가합니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (risk_mode, model_routing 옵션)
+        
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("윤리적 리스크 평가 시작")
+    service_info = state["service_info"]
+
+    if _get_risk_mode(config) == RISK_MODE_PER_CATEGORY:
+        category_contexts = state["category_contexts"]
+        prompts = [_build_category_prompt(service_info, category, category_contexts[category])
+                   for category in RISK_CATEGORIES]
+        responses = batch_routed(prompts, config, RISK_MODEL, service_info=service_info,
+                                 validate=_check_category_content, escalate_if=_category_borderline)
+        return _process_category_responses(dict(zip(RISK_CATEGORIES, responses)))
+
+    response = invoke_routed(_build_prompt(service_info, state["ethics_context"]), config, RISK_MODEL,
+                             service_info=service_info, validate=_validate_assessment,
+                             escalate_if=_assessment_borderline)
+    return _process_response(response)
+
+
+async def assess_risks_async(state: GraphState, config=None) -> GraphState:
+    """
+    assess_risks()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+        config (RunnableConfig, optional): 실행 설정 (risk_mode, model_routing 옵션)
+
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    logger.info("윤리적 리스크 평가 시작")
+    service_info = state["service_info"]
+
+    if _get_risk_mode(config) == RISK_MODE_PER_CATEGORY:
+        category_contexts = state["category_contexts"]
+        prompts = [_build_category_prompt(service_info, category, category_contexts[category])
+                   for category in RISK_CATEGORIES]
+        responses = await abatch_routed(prompts, config, RISK_MODEL, service_info=service_info,
+                                        validate=_check_category_content, escalate_if=_category_borderline)
+        return _process_category_responses(dict(zip(RISK_CATEGORIES, responses)))
+
+    response = await ainvoke_routed(_build_prompt(service_info, state["ethics_context"]), config, RISK_MODEL,
+                                    service_info=service_info, validate=_validate_assessment,
+                                    escalate_if=_assessment_borderline)
+    return _process_response(response)
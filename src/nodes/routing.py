@@ -0,0 +1,259 @@
+"""
+노드별 모델 라우팅 (빠른 모델 우선 캐스케이드)
+
+cascade 정책에서는 LLM 노드가 빠른 모델로 먼저 응답을 받고, 다음 경우에만 강한 모델로
+다시 호출합니다.
+- 서비스 분석 결과의 risk_flags에 중요한 의사결정(critical_decisions)이나 취약 계층 사용자
+  (vulnerable_users)가 표시된 경우: 이후 노드는 처음부터 강한 모델을 사용하고,
+  서비스 분석 노드는 빠른 모델의 분석 결과에 플래그가 있으면 강한 모델로 다시 분석
+- 빠른 모델의 응답이 검증(JSON 파싱, 필수 필드)에 실패한 경우
+- 노드가 지정한 재검토 조건(예: 리스크 점수가 수준 경계에 걸친 경우)에 해당하는 경우
+
+fixed 정책은 각 노드에 고정된 모델(ANALYSIS_MODEL 등)을 그대로 사용합니다.
+노드마다 응답을 만든 모델 등급(fast/strong/fixed)과 강한 모델로 올린 이유를 실행 지표에 기록합니다.
+"""
+
+import logging
+
+from src.llm import get_chat_model, invoke_llm, ainvoke_llm, batch_llm, abatch_llm, stream_llm, astream_llm
+from src.metrics import record_model_tier
+from src.nodes.utils import get_run_option
+
+logger = logging.getLogger(__name__)
+
+MODEL_ROUTING_CASCADE = "cascade"
+MODEL_ROUTING_FIXED = "fixed"
+MODEL_ROUTING_POLICIES = (MODEL_ROUTING_CASCADE, MODEL_ROUTING_FIXED)
+
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+TIER_FIXED = "fixed"
+
+DEFAULT_FAST_MODEL = "gpt-3.5-turbo"
+DEFAULT_STRONG_MODEL = "gpt-4"
+
+# 처음부터 강한 모델을 사용하는 서비스 리스크 플래그
+ESCALATION_FLAGS = ("critical_decisions", "vulnerable_users")
+
+# 노드 메모이제이션 지문에 포함할 라우팅 옵션 (이름, 기본값)
+ROUTING_OPTIONS = (
+    ("model_routing", MODEL_ROUTING_CASCADE),
+    ("fast_model", DEFAULT_FAST_MODEL),
+    ("strong_model", DEFAULT_STRONG_MODEL),
+)
+
+
+def get_model_routing(config) -> str:
+    """
+    실행 옵션 model_routing(없으면 환경 변수 MODEL_ROUTING, 기본값 cascade)을 읽습니다.
+
+    Args:
+        config (RunnableConfig | None): 노드에 전달된 실행 설정
+
+    Returns:
+        str: cascade 또는 fixed
+    """
+    policy = get_run_option(config, "model_routing", MODEL_ROUTING_CASCADE)
+    if policy not in MODEL_ROUTING_POLICIES:
+        logger.warning(f"알 수 없는 모델 라우팅 정책 '{policy}', {MODEL_ROUTING_CASCADE} 정책으로 실행합니다.")
+        return MODEL_ROUTING_CASCADE
+    return policy
+
+
+def escalation_flags(service_info):
+    """
+    서비스 분석 결과에서 강한 모델이 필요한 리스크 플래그를 찾습니다.
+
+    Args:
+        service_info (dict | None): 서비스 분석 결과
+
+    Returns:
+        list: 설정된 플래그 이름 목록
+    """
+    risk_flags = (service_info or {}).get("risk_flags") or {}
+    return [flag for flag in ESCALATION_FLAGS if risk_flags.get(flag) is True]
+
+
+def escalation_reason(service_info):
+    """
+    서비스 분석 결과에 강한 모델이 필요한 리스크 플래그가 있으면 그 이유를 반환합니다.
+
+    서비스 분석 노드의 재검토 조건(escalate_if)으로도 사용합니다.
+
+    Args:
+        service_info (dict | None): 서비스 분석 결과
+
+    Returns:
+        str | None: 강한 모델로 올리는 이유 또는 None
+    """
+    flags = escalation_flags(service_info)
+    return f"risk_flags: {', '.join(flags)}" if flags else None
+
+
+def routed_models(config=None):
+    """
+    cascade 정책에서 사용하는 빠른 모델과 강한 모델을 반환합니다.
+
+    Args:
+        config (RunnableConfig | None): 실행 설정 (없으면 FAST_MODEL, STRONG_MODEL 환경 변수)
+
+    Returns:
+        tuple: (빠른 모델, 강한 모델)
+    """
+    return (get_run_option(config, "fast_model", DEFAULT_FAST_MODEL),
+            get_run_option(config, "strong_model", DEFAULT_STRONG_MODEL))
+
+
+def _plan(config, fixed_model, service_info):
+    # (첫 호출 모델, 첫 호출 등급, 강한 모델로 올릴 모델 또는 None)
+    if get_model_routing(config) == MODEL_ROUTING_FIXED:
+        return fixed_model, TIER_FIXED, None
+
+    fast_model, strong_model = routed_models(config)
+    reason = escalation_reason(service_info)
+    if reason:
+        record_model_tier(TIER_STRONG, strong_model, reason=reason)
+        return strong_model, TIER_STRONG, None
+    return fast_model, TIER_FAST, strong_model
+
+
+def _review(response, validate, escalate_if):
+    # 빠른 모델 응답을 강한 모델로 다시 받아야 하면 그 이유를, 아니면 None을 반환
+    if isinstance(response, Exception):
+        return f"error: {response}"
+    if validate is None:
+        return None
+    try:
+        parsed = validate(response.content)
+    except Exception as e:
+        return f"validation: {e}"
+    return escalate_if(parsed) if escalate_if is not None else None
+
+
+def _escalate(strong_model, reason):
+    logger.info(f"강한 모델({strong_model})로 다시 호출합니다: {reason}")
+    record_model_tier(TIER_STRONG, strong_model, reason=reason)
+    return get_chat_model(strong_model)
+
+
+def invoke_routed(prompt, config, fixed_model, service_info=None, validate=None, escalate_if=None):
+    """
+    라우팅 정책에 따라 모델을 골라 LLM을 호출합니다 (응답 캐시 사용).
+
+    Args:
+        prompt (str): 렌더링된 프롬프트
+        config (RunnableConfig | None): 노드에 전달된 실행 설정
+        fixed_model (str): fixed 정책에서 사용할 노드 고정 모델
+        service_info (dict, optional): 서비스 분석 결과 (risk_flags로 첫 모델을 결정)
+        validate (callable, optional): 응답 텍스트를 파싱/검증하는 함수. 예외가 나면 강한 모델로 다시 호출합니다.
+        escalate_if (callable, optional): validate 결과를 받아 강한 모델이 필요한 이유(str) 또는 None을 반환하는 함수
+
+    Returns:
+        AIMessage: 최종 응답
+    """
+    model, tier, strong_model = _plan(config, fixed_model, service_info)
+    response = invoke_llm(get_chat_model(model), prompt, validate=validate)
+    reason = _review(response, validate, escalate_if) if strong_model else None
+    if reason is None:
+        record_model_tier(tier, model)
+        return response
+    return invoke_llm(_escalate(strong_model, reason), prompt, validate=validate)
+
+
+async def ainvoke_routed(prompt, config, fixed_model, service_info=None, validate=None, escalate_if=None):
+    """
+    invoke_routed()의 비동기 버전입니다.
+    """
+    model, tier, strong_model = _plan(config, fixed_model, service_info)
+    response = await ainvoke_llm(get_chat_model(model), prompt, validate=validate)
+    reason = _review(response, validate, escalate_if) if strong_model else None
+    if reason is None:
+        record_model_tier(tier, model)
+        return response
+    return await ainvoke_llm(_escalate(strong_model, reason), prompt, validate=validate)
+
+
+def _batch_reviews(responses, validate, escalate_if):
+    return {index: reason for index, reason in
+            ((index, _review(response, validate, escalate_if)) for index, response in enumerate(responses))
+            if reason is not None}
+
+
+def batch_routed(prompts, config, fixed_model, service_info=None, validate=None, escalate_if=None):
+    """
+    여러 프롬프트를 라우팅 정책에 따라 동시에 호출합니다.
+
+    cascade 정책에서는 빠른 모델로 모두 호출한 뒤 재검토가 필요한 프롬프트만 강한 모델로 다시 호출합니다.
+
+    Args:
+        prompts (list): 렌더링된 프롬프트 목록
+        config (RunnableConfig | None): 노드에 전달된 실행 설정
+        fixed_model (str): fixed 정책에서 사용할 노드 고정 모델
+        service_info (dict, optional): 서비스 분석 결과
+        validate (callable, optional): 응답 텍스트 검증 함수
+        escalate_if (callable, optional): 검증 결과로 강한 모델이 필요한 이유를 반환하는 함수
+
+    Returns:
+        list: 프롬프트 순서대로 AIMessage 또는 호출 중 발생한 예외
+    """
+    model, tier, strong_model = _plan(config, fixed_model, service_info)
+    responses = batch_llm(get_chat_model(model), prompts, validate=validate)
+    reviews = _batch_reviews(responses, validate, escalate_if) if strong_model else {}
+    record_model_tier(tier, model)
+    if not reviews:
+        return responses
+
+    indexes = sorted(reviews)
+    llm = _escalate(strong_model, "; ".join(reviews[index] for index in indexes))
+    for index, response in zip(indexes, batch_llm(llm, [prompts[i] for i in indexes], validate=validate)):
+        responses[index] = response
+    return responses
+
+
+async def abatch_routed(prompts, config, fixed_model, service_info=None, validate=None, escalate_if=None):
+    """
+    batch_routed()의 비동기 버전입니다.
+    """
+    model, tier, strong_model = _plan(config, fixed_model, service_info)
+    responses = await abatch_llm(get_chat_model(model), prompts, validate=validate)
+    reviews = _batch_reviews(responses, validate, escalate_if) if strong_model else {}
+    record_model_tier(tier, model)
+    if not reviews:
+        return responses
+
+    indexes = sorted(reviews)
+    llm = _escalate(strong_model, "; ".join(reviews[index] for index in indexes))
+    escalated = await abatch_llm(llm, [prompts[i] for i in indexes], validate=validate)
+    for index, response in zip(indexes, escalated):
+        responses[index] = response
+    return responses
+
+
+def stream_routed(prompt, config, fixed_model, service_info=None, on_token=None):
+    """
+    라우팅 정책에 따라 모델을 골라 응답을 스트리밍합니다.
+
+    토큰이 이미 전달된 뒤에는 다시 호출할 수 없으므로 risk_flags로만 모델을 결정합니다.
+
+    Args:
+        prompt (str): 렌더링된 프롬프트
+        config (RunnableConfig | None): 노드에 전달된 실행 설정
+        fixed_model (str): fixed 정책에서 사용할 노드 고정 모델
+        service_info (dict, optional): 서비스 분석 결과
+        on_token (callable, optional): 토큰 텍스트가 도착할 때마다 호출되는 함수
+
+    Returns:
+        AIMessage | AIMessageChunk: 전체 응답
+    """
+    model, tier, _ = _plan(config, fixed_model, service_info)
+    record_model_tier(tier, model)
+    return stream_llm(get_chat_model(model), prompt, on_token=on_token)
+
+
+async def astream_routed(prompt, config, fixed_model, service_info=None, on_token=None):
+    """
+    stream_routed()의 비동기 버전입니다.
+    """
+    model, tier, _ = _plan(config, fixed_model, service_info)
+    record_model_tier(tier, model)
+    return await astream_llm(get_chat_model(model), prompt, on_token=on_token)
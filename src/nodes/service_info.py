@@ -3,11 +3,39 @@
 """
 
 import logging
-from langchain_teddynote.tools.tavily import TavilySearch
 from src.types import GraphState
+from src.llm import context_budget
+from src.retrieval import pack_context
+from src.search import get_search_tool
+from src.nodes.analysis import ANALYSIS_MODEL
 
 logger = logging.getLogger(__name__)
 
+# 서비스 분석 프롬프트에 넣을 검색 결과의 토큰 상한
+SERVICE_CONTEXT_TOKENS = 1000
+
+
+def _build_query(state: GraphState) -> str:
+    return state["service_description"] + " AI service features ethics risks"
+
+
+def _process_results(search_result, search_query) -> GraphState:
+    # 검색 결과를 상태에 저장
+    # 컨텍스트 길이 초과 오류를 방지하기 위해 분석 모델 기준 토큰 예산 안에서 관련도 높은 결과부터 담음
+    packed = pack_context(
+        search_result,
+        context_budget(ANALYSIS_MODEL, SERVICE_CONTEXT_TOKENS),
+        model=ANALYSIS_MODEL,
+        query=search_query
+    )
+    logger.info(f"검색 컨텍스트: {packed['packed_tokens']}토큰 사용, {packed['dropped_tokens']}토큰 제외")
+
+    return {
+        "context": packed["text"],
+        "next": "analyze_service"
+    }
+
+
 def search_service_info(state: GraphState) -> GraphState:
     """
     웹 검색을 통해 AI 서비스에 대한 정보를 수집합니다.
@@ -16,10 +44,10 @@ def search_service_info(state: GraphState) -> GraphState:
         state (GraphState): 현재 그래프 상태
         
     Returns:
-        GraphState: 업데이트된 그래프 상태
+        GraphState: 상태 변경분 (바뀐 키만 포함)
     """
-    tavily_tool = TavilySearch()
-    search_query = state["service_description"] + " AI service features ethics risks"
+    tavily_tool = get_search_tool()
+    search_query = _build_query(state)
 
     logger.info(f"검색 중: {search_query}")
 
@@ -30,17 +58,29 @@ def search_service_info(state: GraphState) -> GraphState:
         format_output=True,
     )
 
-    # 검색 결과를 상태에 저장
-    # 컨텍스트 길이 초과 오류를 방지하기 위해 컨텍스트 크기 제한
-    context = "\n".join(search_result)
-    
-    # 컨텍스트를 적절한 크기(예: 4000자)로 자릅니다.
-    max_context_length = 4000
-    if len(context) > max_context_length:
-        context = context[:max_context_length] + "..." # 잘림을 나타내기 위해 말줄임표 추가
+    return _process_results(search_result, search_query)
 
-    return {
-        **state,
-        "context": context,
-        "next": "analyze_service"
-    }
\ No newline at end of file
+
+async def search_service_info_async(state: GraphState) -> GraphState:
+    """
+    search_service_info()의 비동기 버전입니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+
+    Returns:
+        GraphState: 상태 변경분 (바뀐 키만 포함)
+    """
+    tavily_tool = get_search_tool()
+    search_query = _build_query(state)
+
+    logger.info(f"검색 중: {search_query}")
+
+    search_result = await tavily_tool.asearch(
+        query=search_query,
+        topic="general",
+        max_results=5,
+        format_output=True,
+    )
+
+    return _process_results(search_result, search_query)
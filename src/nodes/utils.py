@@ -0,0 +1,101 @@
+"""
+노드 공통 유틸리티
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from langgraph.config import get_stream_writer
+
+from src.metrics import record_timing
+from src.retrieval import get_pack_context
+
+
+def parse_json_response(content):
+    """
+    LLM 응답에서 JSON 블록을 추출해 파싱합니다.
+
+    Args:
+        content (str): LLM 응답 텍스트 (```json 코드 블록 포함 가능)
+
+    Returns:
+        Any: 파싱된 JSON 객체
+    """
+    json_str = content
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[1].split("```")[0].strip()
+    elif "```" in json_str:
+        json_str = json_str.split("```")[1].split("```")[0].strip()
+
+    return json.loads(json_str)
+
+
+@contextmanager
+def log_elapsed(logger, label, metric=None):
+    """
+    블록 실행 시간을 측정해 로그로 남깁니다.
+
+    Args:
+        logger (logging.Logger): 기록할 로거
+        label (str): 로그에 표시할 작업 이름
+        metric (str, optional): 현재 노드 지표에 시간을 더할 항목 (예: "retrieval")
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if metric is not None:
+            record_timing(metric, elapsed)
+        logger.info(f"{label} 완료 ({elapsed:.2f}초)")
+
+
+def get_run_option(config, name, default=None):
+    """
+    실행별 옵션 값을 읽습니다.
+
+    config["configurable"]에 값이 있으면 그 값을, 없으면 같은 이름의 대문자
+    환경 변수를, 둘 다 없으면 기본값을 반환합니다.
+
+    Args:
+        config (RunnableConfig | None): 노드에 전달된 실행 설정
+        name (str): 옵션 이름 (예: risk_mode)
+        default: 기본값
+
+    Returns:
+        Any: 옵션 값
+    """
+    value = ((config or {}).get("configurable") or {}).get(name)
+    if value is None:
+        value = os.getenv(name.upper()) or default
+    return value
+
+
+def get_node_stream_writer():
+    """
+    LangGraph custom 스트림에 값을 보내는 함수를 반환합니다.
+
+    그래프 밖에서 노드 함수를 직접 호출한 경우처럼 실행 컨텍스트가 없으면 None을 반환합니다.
+
+    Returns:
+        callable | None: 스트림 writer
+    """
+    try:
+        return get_stream_writer()
+    except (RuntimeError, KeyError):
+        return None
+
+
+def get_context_pack(pdf_retriever, category):
+    """
+    검색기에 미리 생성된 항목별 컨텍스트 팩이 있으면 반환합니다.
+
+    Args:
+        pdf_retriever: PDF 문서 검색기
+        category (str): 윤리 평가 항목 이름
+
+    Returns:
+        str | None: 팩 텍스트. 팩이 없으면 None (실시간 검색 필요)
+    """
+    return get_pack_context(getattr(pdf_retriever, "context_packs", None), category)
@@ -0,0 +1,24 @@
+"""
+ratelimit 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
+"""
+
+from src.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'TokenBucket': 'bucket',
+    'RateLimitScheduler': 'scheduler',
+    'get_rate_limiter': 'scheduler',
+    'set_rate_limiter': 'scheduler',
+    'parse_rate_limits': 'scheduler',
+    'request_priority': 'priority',
+    'get_request_priority': 'priority',
+    'is_rate_limit_error': 'scheduler',
+    'PROVIDER_OPENAI': 'scheduler',
+    'PROVIDER_TAVILY': 'scheduler',
+    'PRIORITY_INTERACTIVE': 'priority',
+    'PRIORITY_BATCH': 'priority',
+    'PRIORITIES': 'priority',
+    'RateLimitedEmbeddings': 'embeddings'
+})
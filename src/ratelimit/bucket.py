@@ -0,0 +1,69 @@
+"""
+분당 한도를 따르는 토큰 버킷
+"""
+
+
+class TokenBucket:
+    """
+    분당 한도(요청 수 또는 토큰 수)를 초당 비율로 채우는 토큰 버킷
+
+    버킷 크기(capacity)만큼 한 번에 몰아 쓸 수 있고, 이후에는 분당 한도 비율로만
+    사용할 수 있습니다. 버킷 크기보다 큰 요청은 버킷이 가득 찼을 때 허용하고 부족분을
+    빚으로 남겨 다음 요청이 그만큼 더 기다리게 합니다. 잠금은 호출하는 쪽(RateLimitScheduler)이 잡습니다.
+    """
+
+    def __init__(self, per_minute, capacity, now):
+        """
+        Args:
+            per_minute (float): 분당 한도
+            capacity (float): 버킷 크기 (한 번에 쓸 수 있는 최대량)
+            now (float): 현재 시각 (단조 시계, 초)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, capacity)
+        self.level = self.capacity
+        self.updated = now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        amount만큼 쓰려면 기다려야 하는 시간을 반환합니다.
+
+        Args:
+            amount (float): 사용할 양
+            now (float): 현재 시각
+
+        Returns:
+            float: 대기 시간(초). 바로 쓸 수 있으면 0
+        """
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def consume(self, amount, now):
+        """
+        amount만큼 사용합니다. 버킷 크기보다 큰 요청은 부족분이 빚으로 남습니다.
+
+        Args:
+            amount (float): 사용할 양
+            now (float): 현재 시각
+        """
+        self._refill(now)
+        self.level -= amount
+
+    def adjust(self, amount, now):
+        """
+        예상과 실제 사용량의 차이를 반영합니다.
+
+        Args:
+            amount (float): 추가로 사용한 양 (음수이면 돌려받음)
+            now (float): 현재 시각
+        """
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
@@ -0,0 +1,50 @@
+"""
+호출 스케줄러를 거치는 임베딩 래퍼
+"""
+
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.ratelimit.scheduler import PROVIDER_OPENAI, get_rate_limiter
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """
+    임베딩 요청을 공유 호출 스케줄러(get_rate_limiter())의 한도 안에서 보내는 래퍼
+
+    문서 임베딩(색인 생성)과 쿼리 임베딩 모두 제공자(openai)와 임베딩 모델의 요청/토큰 버킷을
+    차감하고, 429와 일시적 오류는 스케줄러가 다시 시도합니다.
+    """
+
+    def __init__(self, embeddings, model):
+        """
+        Args:
+            embeddings (Embeddings): 실제 임베딩 객체
+            model (str): 임베딩 모델 이름 (한도 범위와 토크나이저 선택에 사용)
+        """
+        self.embeddings = embeddings
+        self.model = model
+
+    def _tokens(self, limiter, texts):
+        return sum(limiter.estimate_tokens(PROVIDER_OPENAI, self.model, texts))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        limiter = get_rate_limiter()
+        return limiter.call(lambda: self.embeddings.embed_documents(texts),
+                            PROVIDER_OPENAI, self.model, tokens=self._tokens(limiter, texts))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        limiter = get_rate_limiter()
+        return await limiter.acall(lambda: self.embeddings.aembed_documents(texts),
+                                   PROVIDER_OPENAI, self.model, tokens=self._tokens(limiter, texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        limiter = get_rate_limiter()
+        return limiter.call(lambda: self.embeddings.embed_query(text),
+                            PROVIDER_OPENAI, self.model, tokens=self._tokens(limiter, [text]))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        limiter = get_rate_limiter()
+        return await limiter.acall(lambda: self.embeddings.aembed_query(text),
+                                   PROVIDER_OPENAI, self.model, tokens=self._tokens(limiter, [text]))
@@ -0,0 +1,48 @@
+"""
+API 호출 우선순위
+
+서버의 대화형 평가 요청이 배치 평가보다 먼저 호출 한도를 쓰도록, 평가 실행마다
+우선순위를 컨텍스트 변수로 지정합니다. 호출 스케줄러(src.ratelimit.scheduler)는
+같은 한도를 기다리는 호출을 우선순위와 도착 순서대로 진행합니다.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# 앞에 있을수록 먼저 진행
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+_priority = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    블록 안에서 시작하는 API 호출의 우선순위를 지정합니다.
+
+    그래프 노드와 asyncio 태스크는 호출한 쪽의 컨텍스트를 물려받으므로 평가 실행을
+    이 블록 안에서 시작하면 그 실행의 모든 호출에 적용됩니다.
+
+    Args:
+        priority (str): "interactive" 또는 "batch"
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"알 수 없는 우선순위입니다: {priority} ({', '.join(PRIORITIES)} 중 하나)")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_request_priority():
+    """
+    현재 컨텍스트의 호출 우선순위를 반환합니다.
+
+    Returns:
+        str: "interactive"(기본값) 또는 "batch"
+    """
+    return _priority.get()
@@ -0,0 +1,592 @@
+"""
+프로세스 전체 API 호출 스케줄러
+
+OpenAI(채팅, 임베딩)와 Tavily 검색 호출은 모두 하나의 스케줄러를 거칩니다.
+- 제공자(openai, tavily)와 모델(gpt-4 등)마다 요청 버킷(RPM)과 토큰 버킷(TPM)을 두고,
+  호출 전에 렌더링된 프롬프트로 예상 토큰 수를 계산해 두 버킷이 모두 허용할 때까지 기다립니다.
+  응답을 받으면 실제 사용량으로 토큰 버킷을 보정합니다.
+- 대기 중인 호출은 우선순위(interactive가 batch보다 먼저, src.ratelimit.priority 참고)와
+  도착 순서대로 진행합니다.
+- 429 응답을 받으면 해당 모델(없으면 제공자)의 모든 호출을 지터가 있는 백오프 시간만큼 함께
+  멈춰, 동시 실행 중인 평가들이 각자 재시도하며 한도를 다시 넘는 것을 막습니다.
+
+한도는 환경 변수 RATE_LIMITS(예: "gpt-4:500/40000,openai:-/200000,tavily:100")로 설정하며,
+설정하지 않은 범위는 버킷 없이 429 백오프만 적용합니다.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+
+from src.metrics import record_rate_limit
+from src.ratelimit.bucket import TokenBucket
+from src.ratelimit.priority import PRIORITIES, get_request_priority
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_OPENAI = "openai"
+PROVIDER_TAVILY = "tavily"
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+# 버킷 크기: 분당 한도의 몇 초 분량까지 한 번에 쓸 수 있는지
+DEFAULT_BURST_SECONDS = 10
+
+# 채팅 호출의 응답 토큰 예상치 (응답을 받으면 실제 사용량으로 보정)
+DEFAULT_OUTPUT_TOKENS = 1000
+
+# 예외 클래스 이름으로 판별 (openai, tavily를 불러오지 않기 위함)
+RATE_LIMIT_ERROR_NAMES = frozenset(("RateLimitError", "UsageLimitExceededError"))
+TRANSIENT_ERROR_NAMES = frozenset(("APIConnectionError", "APITimeoutError", "InternalServerError",
+                                   "ConnectError", "ReadTimeout", "TimeoutError"))
+
+
+def parse_rate_limits(spec):
+    """
+    한도 설정 문자열을 해석합니다.
+
+    "범위:RPM/TPM"을 쉼표로 구분합니다. 범위는 제공자(openai, tavily) 또는 모델 이름이며,
+    TPM은 생략할 수 있고 "-"는 한도 없음을 뜻합니다.
+
+    Args:
+        spec (str): 예: "gpt-4:500/40000,openai:-/200000,tavily:100"
+
+    Returns:
+        dict: 범위 -> (분당 요청 수 또는 None, 분당 토큰 수 또는 None)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    limits = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        scope, _, values = entry.rpartition(":")
+        if not scope:
+            raise ValueError(f"한도 설정 형식이 잘못되었습니다: {entry} (범위:RPM/TPM)")
+        rpm, _, tpm = values.partition("/")
+        limits[scope.strip()] = tuple(
+            float(value) if value.strip() not in ("", "-") else None for value in (rpm, tpm)
+        )
+    return limits
+
+
+def _error_names(error):
+    return {cls.__name__ for cls in type(error).__mro__}
+
+
+def _status_code(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit_error(error):
+    """
+    제공자의 요청 한도 초과(429) 오류인지 확인합니다.
+
+    Args:
+        error (Exception): 호출 중 발생한 예외
+
+    Returns:
+        bool: 한도 초과 오류 여부
+    """
+    return bool(_error_names(error) & RATE_LIMIT_ERROR_NAMES) or _status_code(error) == 429
+
+
+def is_transient_error(error):
+    """
+    다시 시도하면 성공할 수 있는 일시적 오류(연결 실패, 시간 초과, 5xx)인지 확인합니다.
+
+    Args:
+        error (Exception): 호출 중 발생한 예외
+
+    Returns:
+        bool: 일시적 오류 여부
+    """
+    status = _status_code(error)
+    return bool(_error_names(error) & TRANSIENT_ERROR_NAMES) or status == 408 or (status or 0) >= 500
+
+
+def retry_after_seconds(error):
+    """
+    429 응답의 Retry-After(또는 retry-after-ms) 헤더 값을 반환합니다.
+
+    Args:
+        error (Exception): 호출 중 발생한 예외
+
+    Returns:
+        float | None: 제공자가 제안한 대기 시간(초). 없으면 None
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return float(headers.get(name)) * scale
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class RateLimitScheduler:
+    """
+    제공자/모델별 요청·토큰 버킷과 우선순위 대기열을 가진 호출 스케줄러
+
+    call()/acall()은 버킷이 허용할 때까지 기다린 뒤 함수를 실행하고, 429나 일시적 오류가
+    나면 지터가 있는 지수 백오프로 다시 시도합니다. 여러 스레드와 이벤트 루프에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, limits=None, max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, burst_seconds=DEFAULT_BURST_SECONDS):
+        """
+        Args:
+            limits (dict, optional): 범위 -> (분당 요청 수, 분당 토큰 수). parse_rate_limits() 결과
+            max_retries (int): 429/일시적 오류의 최대 재시도 횟수
+            base_delay (float): 첫 재시도 대기 시간(초)
+            max_delay (float): 재시도 대기 시간 상한(초, 지터 적용 전)
+            burst_seconds (float): 버킷 크기 (분당 한도의 몇 초 분량을 한 번에 쓸 수 있는지)
+        """
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        now = time.monotonic()
+        self._buckets = {
+            scope: tuple(
+                TokenBucket(limit, limit * burst_seconds / 60.0, now) if limit else None
+                for limit in (rpm, tpm)
+            )
+            for scope, (rpm, tpm) in self.limits.items()
+        }
+        # 버킷이 있는 범위. 대기 순서는 이 범위를 함께 쓰는 호출 사이에서만 지킴
+        self._limited = frozenset(scope for scope, buckets in self._buckets.items() if any(buckets))
+        self._paused_until = {}
+        self._waiting = {}
+        self._async_waiters = {}
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {"requests": 0, "waits": 0, "wait_seconds": 0.0, "rate_limited": 0, "retries": 0}
+
+    @staticmethod
+    def _scopes(provider, model):
+        return frozenset(scope for scope in (provider, model) if scope)
+
+    def uses_tokens(self, provider, model=None):
+        """
+        제공자나 모델에 토큰 한도가 설정되어 있는지 확인합니다.
+
+        Args:
+            provider (str): 제공자 이름
+            model (str, optional): 모델 이름
+
+        Returns:
+            bool: 토큰 버킷 존재 여부
+        """
+        return any(self._buckets.get(scope, (None, None))[1] is not None for scope in self._scopes(provider, model))
+
+    def estimate_tokens(self, provider, model, texts, output_tokens=0):
+        """
+        렌더링된 프롬프트(또는 임베딩할 텍스트)의 예상 토큰 수를 계산합니다.
+
+        토큰 한도가 없는 범위는 계산하지 않고 0을 반환합니다.
+
+        Args:
+            provider (str): 제공자 이름
+            model (str): 모델 이름 (토크나이저 선택)
+            texts (list): 요청별 텍스트 목록
+            output_tokens (int): 요청별 응답 토큰 예상치
+
+        Returns:
+            list: 요청별 예상 토큰 수
+        """
+        if not self.uses_tokens(provider, model):
+            return [0] * len(texts)
+        from src.llm.tokens import count_tokens
+        return [count_tokens(str(text), model or "gpt-4") + output_tokens for text in texts]
+
+    def _wait_time(self, scopes, requests, tokens, now):
+        wait = 0.0
+        for scope in scopes:
+            wait = max(wait, self._paused_until.get(scope, 0.0) - now)
+            request_bucket, token_bucket = self._buckets.get(scope, (None, None))
+            if request_bucket is not None:
+                wait = max(wait, request_bucket.wait_time(requests, now))
+            if token_bucket is not None and tokens:
+                wait = max(wait, token_bucket.wait_time(tokens, now))
+        return wait
+
+    def _consume(self, scopes, requests, tokens, now):
+        for scope in scopes:
+            request_bucket, token_bucket = self._buckets.get(scope, (None, None))
+            if request_bucket is not None:
+                request_bucket.consume(requests, now)
+            if token_bucket is not None and tokens:
+                token_bucket.consume(tokens, now)
+        self._stats["requests"] += requests
+
+    def _paused(self, scopes, now):
+        return any(self._paused_until.get(scope, 0.0) > now for scope in scopes)
+
+    def _contends(self, scopes, other_scopes, now):
+        # 한도가 있는 범위를 함께 쓰는 호출끼리만 순서를 지킴.
+        # 버킷이 없는 제공자 범위(예: 모델별 한도만 설정한 openai)나 429로 멈춘 모델의 호출은 다른 호출을 막지 않음
+        return not (scopes & other_scopes).isdisjoint(self._limited) and not self._paused(other_scopes, now)
+
+    def _blocked(self, ticket, scopes, now):
+        # 같은 한도를 기다리는 더 높은 우선순위(또는 먼저 온) 호출이 있으면 양보
+        return any(other < ticket and self._contends(scopes, other_scopes, now)
+                   for other, other_scopes in self._waiting.items())
+
+    def _notify_all(self):
+        # 스레드에서 기다리는 호출과 이벤트 루프에서 기다리는 호출을 모두 깨움 (self._cond를 잡은 상태에서 호출)
+        self._cond.notify_all()
+        for loop, event in self._async_waiters.values():
+            loop.call_soon_threadsafe(event.set)
+
+    def _admit(self, ticket, scopes, requests, tokens):
+        # 차례가 되어 버킷을 차감했으면 (True, 0), 아니면 (False, 다시 확인할 때까지의 시간 또는 깨울 때까지 None)
+        now = time.monotonic()
+        if self._blocked(ticket, scopes, now):
+            return False, None
+        wait = self._wait_time(scopes, requests, tokens, now)
+        if wait > 0:
+            return False, wait
+        self._consume(scopes, requests, tokens, now)
+        return True, 0.0
+
+    def _enqueue(self, priority, scopes):
+        # 우선순위와 도착 순서로 정렬되는 대기 번호를 발급해 대기열에 등록 (self._cond를 잡은 상태에서 호출)
+        ticket = (PRIORITIES.index(priority or get_request_priority()), next(self._tickets))
+        self._waiting[ticket] = scopes
+        return ticket
+
+    def _dequeue(self, ticket, start):
+        # 대기열에서 빠지고 다음 호출을 깨운 뒤 기다린 시간을 반환 (self._cond를 잡은 상태에서 호출)
+        del self._waiting[ticket]
+        self._async_waiters.pop(ticket, None)
+        self._notify_all()
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            self._stats["waits"] += 1
+            self._stats["wait_seconds"] += waited
+        return waited
+
+    def try_acquire(self, provider, model=None, requests=1, tokens=0):
+        """
+        기다리지 않고 바로 호출할 수 있으면 버킷을 차감합니다.
+
+        같은 한도를 기다리는 호출이 있으면 순서를 지키기 위해 실패합니다.
+
+        Args:
+            provider (str): 제공자 이름
+            model (str, optional): 모델 이름
+            requests (int): 요청 수
+            tokens (int): 예상 토큰 수
+
+        Returns:
+            bool: 차감 여부
+        """
+        scopes = self._scopes(provider, model)
+        with self._cond:
+            now = time.monotonic()
+            if any(self._contends(scopes, other, now) for other in self._waiting.values()):
+                return False
+            if self._wait_time(scopes, requests, tokens, now) > 0:
+                return False
+            self._consume(scopes, requests, tokens, now)
+            return True
+
+    def acquire(self, provider, model=None, requests=1, tokens=0, priority=None):
+        """
+        버킷이 허용할 때까지 우선순위 순서로 기다린 뒤 차감합니다.
+
+        Args:
+            provider (str): 제공자 이름
+            model (str, optional): 모델 이름
+            requests (int): 요청 수
+            tokens (int): 예상 토큰 수
+            priority (str, optional): 우선순위. 없으면 현재 컨텍스트의 우선순위
+
+        Returns:
+            float: 기다린 시간(초)
+        """
+        scopes = self._scopes(provider, model)
+        start = time.monotonic()
+        with self._cond:
+            ticket = self._enqueue(priority, scopes)
+            try:
+                while True:
+                    admitted, wait = self._admit(ticket, scopes, requests, tokens)
+                    if admitted:
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                waited = self._dequeue(ticket, start)
+        return waited
+
+    async def aacquire(self, provider, model=None, requests=1, tokens=0, priority=None):
+        """
+        acquire()의 비동기 버전입니다.
+
+        스레드를 점유하지 않고 이벤트 루프에서 기다리며, 같은 우선순위 대기열을 공유합니다.
+        버킷이 채워질 시간이 지나거나 다른 호출이 대기열, 버킷, 429 일시 정지 상태를 바꾸면 다시 확인합니다.
+        """
+        scopes = self._scopes(provider, model)
+        start = time.monotonic()
+        event = asyncio.Event()
+        with self._cond:
+            ticket = self._enqueue(priority, scopes)
+            self._async_waiters[ticket] = (asyncio.get_running_loop(), event)
+        try:
+            while True:
+                with self._cond:
+                    # 확인한 뒤에 바뀐 상태는 event로 알 수 있도록 확인 전에 초기화
+                    event.clear()
+                    admitted, wait = self._admit(ticket, scopes, requests, tokens)
+                if admitted:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                waited = self._dequeue(ticket, start)
+        return waited
+
+    def pause(self, scope, seconds):
+        """
+        범위의 모든 호출을 지정한 시간 동안 멈춥니다.
+
+        Args:
+            scope (str): 제공자 또는 모델 이름
+            seconds (float): 멈출 시간(초)
+        """
+        with self._cond:
+            until = time.monotonic() + seconds
+            self._paused_until[scope] = max(self._paused_until.get(scope, 0.0), until)
+            self._notify_all()
+
+    def _reconcile(self, provider, model, estimated, actual):
+        if actual is None or not self.uses_tokens(provider, model):
+            return
+        with self._cond:
+            now = time.monotonic()
+            for scope in self._scopes(provider, model):
+                token_bucket = self._buckets.get(scope, (None, None))[1]
+                if token_bucket is not None:
+                    token_bucket.adjust(actual - estimated, now)
+            self._notify_all()
+
+    def _backoff(self, attempt):
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * (0.5 + random.random())
+
+    def _retry_delay(self, error, attempt, provider, model):
+        # 다시 시도할 때까지 기다릴 시간. 다시 시도하지 않으면 None
+        if attempt >= self.max_retries:
+            return None
+        if is_rate_limit_error(error):
+            delay = retry_after_seconds(error) or self._backoff(attempt)
+            self.pause(model or provider, delay)
+            with self._cond:
+                self._stats["rate_limited"] += 1
+            logger.warning(f"{model or provider} 요청 한도 초과, {delay:.1f}초 동안 호출을 멈춥니다 "
+                           f"({attempt + 1}/{self.max_retries})")
+            # 멈춘 시간이 끝날 때 재시도가 한꺼번에 몰리지 않도록 지터를 더함
+            return delay * (1.0 + 0.5 * random.random())
+        if is_transient_error(error):
+            delay = self._backoff(attempt)
+            logger.warning(f"{model or provider} 호출 실패, {delay:.1f}초 후 재시도합니다 "
+                           f"({attempt + 1}/{self.max_retries}): {str(error)}")
+            return delay
+        return None
+
+    def _record_retry(self):
+        with self._cond:
+            self._stats["retries"] += 1
+        record_rate_limit(retries=1)
+
+    def call(self, func, provider, model=None, tokens=0, usage=None, can_retry=None):
+        """
+        한도 안에서 func()를 호출합니다. 429와 일시적 오류는 백오프 후 다시 시도합니다.
+
+        Args:
+            func (callable): 인자 없이 호출할 함수
+            provider (str): 제공자 이름
+            model (str, optional): 모델 이름
+            tokens (int): 예상 토큰 수
+            usage (callable, optional): 결과에서 실제 사용 토큰 수를 읽는 함수
+            can_retry (callable, optional): 실패 후 다시 시도해도 되는지 반환하는 함수 (예: 스트리밍 시작 전)
+
+        Returns:
+            Any: func()의 결과
+        """
+        attempt = 0
+        while True:
+            record_rate_limit(wait_seconds=self.acquire(provider, model, tokens=tokens))
+            try:
+                result = func()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, provider, model) if can_retry is None or can_retry() else None
+                if delay is None:
+                    raise
+                self._record_retry()
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._reconcile(provider, model, tokens, usage(result) if usage else None)
+            return result
+
+    async def acall(self, func, provider, model=None, tokens=0, usage=None, can_retry=None):
+        """
+        call()의 비동기 버전입니다. func는 코루틴 함수입니다.
+        """
+        attempt = 0
+        while True:
+            record_rate_limit(wait_seconds=await self.aacquire(provider, model, tokens=tokens))
+            try:
+                result = await func()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, provider, model) if can_retry is None or can_retry() else None
+                if delay is None:
+                    raise
+                self._record_retry()
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._reconcile(provider, model, tokens, usage(result) if usage else None)
+            return result
+
+    def _settle_batch(self, pending, outputs, results, tokens, attempt, provider, model, usage):
+        # 배치 결과를 반영하고 (다시 보낼 인덱스, 대기 시간)을 반환. 다시 보낼 것이 없으면 None
+        retryable = []
+        for index, output in zip(pending, outputs):
+            results[index] = output
+            if isinstance(output, Exception):
+                if is_rate_limit_error(output) or is_transient_error(output):
+                    retryable.append(index)
+            else:
+                self._reconcile(provider, model, tokens[index], usage(output) if usage else None)
+        if not retryable:
+            return None
+        delay = self._retry_delay(results[retryable[0]], attempt, provider, model)
+        if delay is None:
+            return None
+        self._record_retry()
+        return retryable, delay
+
+    def call_batch(self, func, provider, model=None, tokens=None, count=0, usage=None):
+        """
+        여러 요청을 한 번에 보내는 함수를 한도 안에서 호출하고, 429/일시적 오류가 난 요청만 다시 보냅니다.
+
+        Args:
+            func (callable): 인덱스 목록을 받아 같은 순서의 결과(실패는 예외 객체) 목록을 반환하는 함수
+            provider (str): 제공자 이름
+            model (str, optional): 모델 이름
+            tokens (list, optional): 요청별 예상 토큰 수
+            count (int): 요청 수
+            usage (callable, optional): 결과에서 실제 사용 토큰 수를 읽는 함수
+
+        Returns:
+            list: 요청 순서대로 결과 또는 마지막 시도의 예외
+        """
+        tokens = tokens or [0] * count
+        results = [None] * count
+        pending = list(range(count))
+        attempt = 0
+        while pending:
+            waited = self.acquire(provider, model, requests=len(pending), tokens=sum(tokens[i] for i in pending))
+            record_rate_limit(wait_seconds=waited)
+            retry = self._settle_batch(pending, func(pending), results, tokens, attempt, provider, model, usage)
+            if retry is None:
+                break
+            pending, delay = retry
+            attempt += 1
+            time.sleep(delay)
+        return results
+
+    async def acall_batch(self, func, provider, model=None, tokens=None, count=0, usage=None):
+        """
+        call_batch()의 비동기 버전입니다. func는 코루틴 함수입니다.
+        """
+        tokens = tokens or [0] * count
+        results = [None] * count
+        pending = list(range(count))
+        attempt = 0
+        while pending:
+            waited = await self.aacquire(provider, model, requests=len(pending),
+                                         tokens=sum(tokens[i] for i in pending))
+            record_rate_limit(wait_seconds=waited)
+            retry = self._settle_batch(pending, await func(pending), results, tokens, attempt, provider, model, usage)
+            if retry is None:
+                break
+            pending, delay = retry
+            attempt += 1
+            await asyncio.sleep(delay)
+        return results
+
+    def stats(self):
+        """
+        스케줄러 통계를 반환합니다.
+
+        Returns:
+            dict: 처리한 요청 수, 대기 횟수와 누적 대기 시간, 429 횟수, 재시도 횟수, 현재 대기 중인 호출 수
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["wait_seconds"] = round(stats["wait_seconds"], 4)
+            stats["waiting"] = len(self._waiting)
+        return stats
+
+
+def _create_scheduler_from_env():
+    limits = parse_rate_limits(os.getenv("RATE_LIMITS", ""))
+    max_retries = int(os.getenv("RATE_LIMIT_MAX_RETRIES") or DEFAULT_MAX_RETRIES)
+    burst_seconds = float(os.getenv("RATE_LIMIT_BURST_SECONDS") or DEFAULT_BURST_SECONDS)
+    if limits:
+        described = ", ".join(f"{scope}={rpm or '-'}/{tpm or '-'}" for scope, (rpm, tpm) in limits.items())
+        logger.info(f"API 호출 한도: {described}")
+    return RateLimitScheduler(limits, max_retries=max_retries, burst_seconds=burst_seconds)
+
+
+_scheduler_lock = threading.Lock()
+_scheduler = None
+
+
+def get_rate_limiter():
+    """
+    프로세스 전체에서 공유되는 호출 스케줄러를 반환합니다.
+
+    처음 호출할 때 환경 변수 RATE_LIMITS, RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_BURST_SECONDS로 생성합니다.
+
+    Returns:
+        RateLimitScheduler: 공유 스케줄러
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = _create_scheduler_from_env()
+        return _scheduler
+
+
+def set_rate_limiter(scheduler):
+    """
+    공유 호출 스케줄러를 교체합니다.
+
+    Args:
+        scheduler (RateLimitScheduler | None): 사용할 스케줄러. None이면 다음 호출 때
+                                               환경 변수 설정으로 다시 생성합니다.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -1,7 +1,33 @@
 """
 retrieval 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
 """
 
-from src.retrieval.pdf_retriever import setup_pdf_retrieval
+from src.lazy import lazy_exports
 
-__all__ = ['setup_pdf_retrieval']
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'setup_pdf_retrieval': 'pdf_retriever',
+    'build_guideline_context_packs': 'pdf_retriever',
+    'DEFAULT_PACK_TOKEN_BUDGET': 'context_packs',
+    'get_pack_context': 'context_packs',
+    'pack_context': 'packer',
+    'resolve_pdf_paths': 'ingest',
+    'iter_pdf_chunks': 'ingest',
+    'build_vectorstore': 'ingest',
+    'get_rag_prompt': 'pdf_retriever',
+    'set_rag_prompt': 'pdf_retriever',
+    'LOCAL_RAG_PROMPT': 'pdf_retriever',
+    'get_index_cache_stats': 'index_cache',
+    'BM25Index': 'bm25',
+    'tokenize': 'bm25',
+    'HybridRetriever': 'hybrid',
+    'RETRIEVAL_MODES': 'hybrid',
+    'get_retrieval_mode': 'hybrid',
+    'reciprocal_rank_fusion': 'hybrid',
+    'QueryEmbeddingCache': 'query_cache',
+    'CachedQueryEmbeddings': 'query_cache',
+    'get_query_embedding_cache': 'query_cache',
+    'set_query_embedding_cache': 'query_cache',
+    'get_query_embedding_cache_stats': 'query_cache'
+})
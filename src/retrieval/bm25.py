@@ -0,0 +1,190 @@
+"""
+가이드라인 청크에 대한 BM25 역색인
+
+한국어는 형태소 분석기 없이도 조사·어미가 붙은 어절을 매칭할 수 있도록 한글을 음절 바이그램으로,
+영문과 숫자는 단어 단위로 토큰화합니다. 문서별 BM25 가중치는 색인 생성 시 미리 계산해 두므로
+검색은 쿼리 토큰의 포스팅 목록을 NumPy로 합산하는 것으로 끝나며 임베딩 호출이 필요 없습니다.
+"""
+
+import logging
+import re
+from collections import Counter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 토큰화 방식이 바뀌면 올려서 캐시된 색인을 다시 생성
+TOKENIZER_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z]+|\d+")
+
+
+def tokenize(text):
+    """
+    텍스트를 BM25 토큰 목록으로 변환합니다.
+
+    한글 어절은 음절 바이그램(한 글자 어절은 그대로), 영문은 소문자 단어, 숫자는 숫자열로 분리합니다.
+    예: "공정성은" -> ["공정", "정성", "성은"]
+
+    Args:
+        text (str): 입력 텍스트
+
+    Returns:
+        list: 토큰 목록
+    """
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= word[0] <= "힣" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """
+    CSR 형식의 포스팅 목록으로 구성된 BM25 역색인
+
+    term_ptr[t]:term_ptr[t + 1] 구간의 doc_ids/weights가 토큰 t가 등장하는 문서와
+    해당 문서에서의 BM25 가중치(idf x 정규화된 tf)입니다.
+    """
+
+    def __init__(self, vocabulary, term_ptr, doc_ids, weights, documents):
+        """
+        Args:
+            vocabulary (dict): 토큰 -> 토큰 번호
+            term_ptr (np.ndarray): 토큰별 포스팅 시작 위치 (길이: 토큰 수 + 1)
+            doc_ids (np.ndarray): 포스팅의 문서 번호
+            weights (np.ndarray): 포스팅의 BM25 가중치
+            documents (list): 문서 번호 순서의 Document 목록
+        """
+        self.vocabulary = vocabulary
+        self.term_ptr = term_ptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.documents = documents
+
+    @classmethod
+    def from_documents(cls, documents, k1=1.5, b=0.75):
+        """
+        Document 목록으로 BM25 색인을 생성합니다.
+
+        Args:
+            documents (list): 색인할 Document 목록
+            k1 (float): tf 포화 계수
+            b (float): 문서 길이 정규화 계수
+
+        Returns:
+            BM25Index: 생성된 색인
+        """
+        vocabulary = {}
+        rows, cols, counts = [], [], []
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+
+        for doc_id, document in enumerate(documents):
+            term_counts = Counter(tokenize(document.page_content))
+            doc_lengths[doc_id] = sum(term_counts.values())
+            for token, count in term_counts.items():
+                rows.append(vocabulary.setdefault(token, len(vocabulary)))
+                cols.append(doc_id)
+                counts.append(count)
+
+        term_ids = np.asarray(rows, dtype=np.int64)
+        doc_ids = np.asarray(cols, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float32)
+
+        # 토큰 번호 순으로 정렬해 CSR 포스팅 구성
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, doc_ids, tf = term_ids[order], doc_ids[order], tf[order]
+        df = np.bincount(term_ids, minlength=len(vocabulary))
+        term_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=term_ptr[1:])
+
+        # 질의와 무관한 항은 모두 미리 계산
+        doc_count = len(documents)
+        avg_length = float(doc_lengths.mean()) if doc_count else 0.0
+        idf = np.log1p((doc_count - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * doc_lengths[doc_ids] / max(avg_length, 1e-9))
+        weights = (idf[term_ids] * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+        logger.info(f"BM25 색인 생성 완료: 문서 {doc_count}개, 토큰 {len(vocabulary)}개")
+        return cls(vocabulary, term_ptr, doc_ids, weights, list(documents))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def score(self, query):
+        """
+        모든 문서의 BM25 점수를 계산합니다.
+
+        Args:
+            query (str): 검색 쿼리
+
+        Returns:
+            np.ndarray: 문서 번호 순서의 점수 배열
+        """
+        query_counts = Counter(self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary)
+        if not query_counts:
+            return np.zeros(len(self.documents), dtype=np.float32)
+
+        spans = [np.arange(self.term_ptr[term], self.term_ptr[term + 1]) for term in query_counts]
+        positions = np.concatenate(spans)
+        repeats = np.repeat(np.fromiter(query_counts.values(), dtype=np.float32), [len(span) for span in spans])
+        return np.bincount(self.doc_ids[positions], weights=self.weights[positions] * repeats,
+                           minlength=len(self.documents))
+
+    def search(self, query, k=10):
+        """
+        BM25 점수가 높은 문서를 반환합니다.
+
+        Args:
+            query (str): 검색 쿼리
+            k (int): 반환할 최대 문서 수
+
+        Returns:
+            list: 점수 내림차순 (Document, 점수) 목록. 점수가 0인 문서는 제외합니다.
+        """
+        scores = self.score(query)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.documents[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def to_arrays(self):
+        """
+        디스크 저장용 배열을 반환합니다 (Document 목록 제외).
+
+        Returns:
+            dict: np.savez()에 전달할 배열
+        """
+        vocabulary = np.empty(len(self.vocabulary), dtype=object)
+        for token, term in self.vocabulary.items():
+            vocabulary[term] = token
+        return {
+            "vocabulary": vocabulary.astype(str),
+            "term_ptr": self.term_ptr,
+            "doc_ids": self.doc_ids,
+            "weights": self.weights,
+            "tokenizer_version": np.array(TOKENIZER_VERSION)
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, documents):
+        """
+        to_arrays()로 저장한 배열과 Document 목록으로 색인을 복원합니다.
+
+        Args:
+            arrays (Mapping): 저장된 배열
+            documents (list): 문서 번호 순서의 Document 목록
+
+        Returns:
+            BM25Index | None: 토큰화 버전이 다르면 None
+        """
+        if int(arrays["tokenizer_version"]) != TOKENIZER_VERSION:
+            return None
+        vocabulary = {str(token): term for term, token in enumerate(arrays["vocabulary"])}
+        return cls(vocabulary, arrays["term_ptr"], arrays["doc_ids"], arrays["weights"], documents)
@@ -0,0 +1,72 @@
+"""
+윤리 항목별 가이드라인 컨텍스트 팩
+
+가이드라인 PDF와 평가 항목은 고정되어 있으므로, 항목별 검색 결과를 미리 순위화·중복 제거하고
+토큰 예산에 맞춰 묶어 인덱스 옆에 저장해 둡니다. 노드는 평가 때마다 검색하는 대신 팩을 바로 조회합니다.
+"""
+
+import logging
+import time
+
+from langchain_opentutorial.rag.utils import format_docs
+
+from src.retrieval.hybrid import reciprocal_rank_fusion
+from src.retrieval.packer import pack_context
+
+logger = logging.getLogger(__name__)
+
+# 항목별 팩의 기본 토큰 예산
+DEFAULT_PACK_TOKEN_BUDGET = 800
+
+
+def build_context_packs(retriever, category_queries, token_budget=DEFAULT_PACK_TOKEN_BUDGET):
+    """
+    항목별 검색 쿼리로 컨텍스트 팩을 생성합니다.
+
+    항목마다 여러 쿼리의 검색 결과를 RRF로 결합해 순위를 정하고, 공용 패커로 중복을 제거한 뒤
+    토큰 예산에 맞춰 청크를 통째로 담습니다.
+
+    Args:
+        retriever: PDF 검색기
+        category_queries (dict): 항목 이름 -> 검색 쿼리 목록
+        token_budget (int): 항목별 최대 토큰 수
+
+    Returns:
+        dict: 항목 이름 -> {"context", "chunks", "tokens"}
+    """
+    start = time.perf_counter()
+    packs = {}
+    for category, queries in category_queries.items():
+        results = retriever.batch(list(queries))
+        ranked = reciprocal_rank_fusion(results, k=sum(len(docs) for docs in results))
+        packed = pack_context(
+            [format_docs([document]) for document in ranked],
+            token_budget,
+            allow_partial=False,
+            record=False
+        )
+        packs[category] = {
+            "context": packed["text"],
+            "chunks": packed["packed"],
+            "tokens": packed["packed_tokens"]
+        }
+        logger.info(f"컨텍스트 팩 생성: {category} (청크 {packed['packed']}개, {packed['packed_tokens']}토큰)")
+
+    logger.info(f"컨텍스트 팩 {len(packs)}개 생성 완료 ({time.perf_counter() - start:.2f}초)")
+    return packs
+
+
+def get_pack_context(context_packs, category):
+    """
+    항목의 컨텍스트 팩 텍스트를 반환합니다.
+
+    Args:
+        context_packs (dict | None): 항목 이름 -> 컨텍스트 팩
+        category (str): 항목 이름
+
+    Returns:
+        str | None: 팩 텍스트. 팩이 없으면 None
+    """
+    if not context_packs or category not in context_packs:
+        return None
+    return context_packs[category]["context"]
@@ -0,0 +1,146 @@
+"""
+BM25와 벡터 검색을 결합한 하이브리드 검색기
+"""
+
+import os
+from typing import Any, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+RETRIEVAL_MODE_HYBRID = "hybrid"
+RETRIEVAL_MODE_VECTOR = "vector"
+RETRIEVAL_MODE_LEXICAL = "lexical"
+RETRIEVAL_MODES = (RETRIEVAL_MODE_HYBRID, RETRIEVAL_MODE_VECTOR, RETRIEVAL_MODE_LEXICAL)
+
+
+def get_retrieval_mode(mode=None):
+    """
+    검색 모드를 결정합니다.
+
+    Args:
+        mode (str, optional): 검색 모드. None이면 환경 변수 RETRIEVAL_MODE 또는 hybrid를 사용합니다.
+
+    Returns:
+        str: hybrid, vector, lexical 중 하나
+    """
+    mode = (mode or os.getenv("RETRIEVAL_MODE") or RETRIEVAL_MODE_HYBRID).lower()
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"지원하지 않는 검색 모드입니다: {mode} ({', '.join(RETRIEVAL_MODES)})")
+    return mode
+
+
+def _document_key(document):
+    # 벡터 저장소와 BM25 색인의 Document는 서로 다른 객체이므로 내용과 위치로 같은 청크를 식별
+    return document.page_content, document.metadata.get("source"), document.metadata.get("page")
+
+
+def reciprocal_rank_fusion(result_lists, k=10, rrf_k=60):
+    """
+    여러 검색 결과를 Reciprocal Rank Fusion으로 결합합니다.
+
+    점수 척도가 다른 BM25와 벡터 검색 결과를 순위만으로 합치며,
+    각 문서의 점수는 결과 목록별 1 / (rrf_k + 순위)의 합입니다.
+
+    Args:
+        result_lists (list): 순위 순서의 Document 목록들
+        k (int): 반환할 최대 문서 수
+        rrf_k (int): 순위 평활 상수
+
+    Returns:
+        list: 결합 점수 내림차순 Document 목록
+    """
+    scores = {}
+    documents = {}
+    for results in result_lists:
+        for rank, document in enumerate(results, start=1):
+            key = _document_key(document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(key, document)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked[:k]]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    BM25 역색인과 FAISS 벡터 검색을 결합한 검색기
+
+    - hybrid: 두 검색 결과를 각각 fetch_k개씩 가져와 RRF로 결합
+    - vector: 기존과 같은 벡터 검색만 사용
+    - lexical: BM25만 사용하므로 검색 시 임베딩 호출이 없음
+
+    context_packs에는 미리 생성된 항목별 컨텍스트 팩(없으면 None)이 담깁니다.
+    """
+
+    vectorstore: Optional[Any] = None
+    bm25_index: Optional[Any] = None
+    mode: str = RETRIEVAL_MODE_HYBRID
+    k: int = 10
+    fetch_k: int = 20
+    rrf_k: int = 60
+    context_packs: Optional[dict] = None
+
+    def _query_embedder(self):
+        if self.mode == RETRIEVAL_MODE_LEXICAL or self.vectorstore is None:
+            return None
+        return self.vectorstore.embedding_function
+
+    def prefetch_queries(self, queries):
+        """
+        이후 검색할 쿼리들의 임베딩을 한 번의 요청으로 미리 계산해 캐시에 넣습니다.
+
+        쿼리 임베딩 캐시를 사용하지 않거나 lexical 모드이면 아무 작업도 하지 않습니다.
+
+        Args:
+            queries (list): 검색 쿼리 목록
+        """
+        embed_queries = getattr(self._query_embedder(), "embed_queries", None)
+        if embed_queries is not None and queries:
+            embed_queries(list(queries))
+
+    async def aprefetch_queries(self, queries):
+        """
+        prefetch_queries()의 비동기 버전입니다.
+
+        Args:
+            queries (list): 검색 쿼리 목록
+        """
+        aembed_queries = getattr(self._query_embedder(), "aembed_queries", None)
+        if aembed_queries is not None and queries:
+            await aembed_queries(list(queries))
+
+    def batch(self, inputs, config=None, **kwargs):
+        # 쿼리별 임베딩 요청 대신 한 번에 임베딩한 뒤 검색
+        self.prefetch_queries(inputs)
+        return super().batch(inputs, config, **kwargs)
+
+    async def abatch(self, inputs, config=None, **kwargs):
+        await self.aprefetch_queries(inputs)
+        return await super().abatch(inputs, config, **kwargs)
+
+    def _lexical_search(self, query, k):
+        return [document for document, _ in self.bm25_index.search(query, k)]
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        if self.mode == RETRIEVAL_MODE_LEXICAL:
+            return self._lexical_search(query, self.k)
+        if self.mode == RETRIEVAL_MODE_VECTOR:
+            return self.vectorstore.similarity_search(query, k=self.k)
+
+        return reciprocal_rank_fusion(
+            [self._lexical_search(query, self.fetch_k), self.vectorstore.similarity_search(query, k=self.fetch_k)],
+            k=self.k,
+            rrf_k=self.rrf_k
+        )
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        # BM25 검색은 CPU 연산만 하므로 바로 실행하고, 벡터 검색만 비동기로 실행
+        if self.mode == RETRIEVAL_MODE_LEXICAL:
+            return self._lexical_search(query, self.k)
+        if self.mode == RETRIEVAL_MODE_VECTOR:
+            return await self.vectorstore.asimilarity_search(query, k=self.k)
+
+        lexical_results = self._lexical_search(query, self.fetch_k)
+        vector_results = await self.vectorstore.asimilarity_search(query, k=self.fetch_k)
+        return reciprocal_rank_fusion([lexical_results, vector_results], k=self.k, rrf_k=self.rrf_k)
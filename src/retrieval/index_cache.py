@@ -0,0 +1,351 @@
+"""
+벡터 인덱스 디스크 캐시 관련 기능
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from src.retrieval.bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 캐시 디렉토리
+DEFAULT_INDEX_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "index"
+)
+
+INDEX_NAME = "index"
+MANIFEST_FILE = "manifest.json"
+BM25_ARRAYS_FILE = "bm25.npz"
+BM25_DOCUMENTS_FILE = "documents.pkl"
+CONTEXT_PACKS_FILE = "context_packs.json"
+
+# 청크 메타데이터(출처 정보) 형식 버전
+INGEST_VERSION = 1
+
+_stats_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "builds": 0,
+    "build_seconds": 0.0,
+    "load_seconds": 0.0,
+}
+
+
+def get_index_cache_dir():
+    """
+    인덱스 캐시 디렉토리 경로를 반환합니다.
+
+    Returns:
+        str: 환경 변수 INDEX_CACHE_DIR 또는 기본 캐시 디렉토리
+    """
+    return os.getenv("INDEX_CACHE_DIR") or DEFAULT_INDEX_CACHE_DIR
+
+
+def compute_file_hash(path, block_size=1 << 20):
+    """
+    파일 내용의 SHA-256 해시를 계산합니다.
+
+    Args:
+        path (str): 파일 경로
+        block_size (int): 한 번에 읽을 바이트 수
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_corpus_hash(paths):
+    """
+    여러 PDF로 구성된 코퍼스의 내용 해시를 계산합니다.
+
+    파일별 내용 해시를 정렬해 결합하므로 파일 경로나 순서와 무관하며,
+    청크 메타데이터 형식이 바뀌면 INGEST_VERSION으로 기존 캐시를 무효화합니다.
+
+    Args:
+        paths (list): PDF 파일 경로 목록
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    key_source = json.dumps({
+        "ingest_version": INGEST_VERSION,
+        "files": sorted(compute_file_hash(path) for path in paths)
+    })
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+def make_index_cache_key(pdf_hash, chunk_size, chunk_overlap, embedding_model):
+    """
+    PDF 해시, 분할 설정, 임베딩 모델로 캐시 키를 생성합니다.
+
+    Args:
+        pdf_hash (str): PDF 내용 해시
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 중첩 크기
+        embedding_model (str): 임베딩 모델 이름
+
+    Returns:
+        str: 캐시 키
+    """
+    key_source = json.dumps(
+        {
+            "pdf_hash": pdf_hash,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": embedding_model,
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:32]
+
+
+def load_cached_index(cache_key, embeddings, cache_dir=None):
+    """
+    캐시된 FAISS 인덱스를 메모리 매핑으로 불러옵니다.
+
+    Args:
+        cache_key (str): 캐시 키
+        embeddings: 쿼리 임베딩에 사용할 임베딩 객체
+        cache_dir (str, optional): 캐시 디렉토리
+
+    Returns:
+        FAISS | None: 캐시가 있으면 벡터 저장소, 없으면 None
+    """
+    cache_path = os.path.join(cache_dir or get_index_cache_dir(), cache_key)
+    index_file = os.path.join(cache_path, f"{INDEX_NAME}.faiss")
+    store_file = os.path.join(cache_path, f"{INDEX_NAME}.pkl")
+
+    if not (os.path.exists(index_file) and os.path.exists(store_file)):
+        _record("misses")
+        return None
+
+    start = time.perf_counter()
+    try:
+        try:
+            index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            # 메모리 매핑을 지원하지 않는 인덱스 유형은 일반 로드로 대체
+            index = faiss.read_index(index_file)
+
+        with open(store_file, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"인덱스 캐시 로드 실패, 다시 생성합니다: {str(e)}")
+        _record("misses")
+        return None
+
+    elapsed = time.perf_counter() - start
+    _record("hits", load_seconds=elapsed)
+    logger.info(f"인덱스 캐시 적중: {cache_key} ({elapsed:.3f}초)")
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id
+    )
+
+
+def save_index(vectorstore, cache_key, manifest, cache_dir=None):
+    """
+    FAISS 인덱스를 캐시 디렉토리에 저장합니다.
+
+    임시 디렉토리에 먼저 기록한 뒤 이름을 바꾸므로, 동시에 실행되는 다른 프로세스가
+    절반만 기록된 인덱스를 읽지 않습니다.
+
+    Args:
+        vectorstore (FAISS): 저장할 벡터 저장소
+        cache_key (str): 캐시 키
+        manifest (dict): 캐시 키 구성 요소 등 메타데이터
+        cache_dir (str, optional): 캐시 디렉토리
+    """
+    cache_root = cache_dir or get_index_cache_dir()
+    cache_path = os.path.join(cache_root, cache_key)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+    try:
+        vectorstore.save_local(tmp_path, index_name=INDEX_NAME)
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(cache_path):
+            shutil.rmtree(cache_path, ignore_errors=True)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"인덱스 캐시 저장 완료: {cache_path}")
+    except Exception as e:
+        logger.warning(f"인덱스 캐시 저장 실패: {str(e)}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_cached_bm25_index(cache_key, cache_dir=None):
+    """
+    캐시된 BM25 색인을 불러옵니다.
+
+    Args:
+        cache_key (str): 캐시 키
+        cache_dir (str, optional): 캐시 디렉토리
+
+    Returns:
+        BM25Index | None: 캐시가 있으면 BM25 색인, 없거나 토큰화 방식이 다르면 None
+    """
+    cache_path = os.path.join(cache_dir or get_index_cache_dir(), cache_key)
+    arrays_file = os.path.join(cache_path, BM25_ARRAYS_FILE)
+    documents_file = os.path.join(cache_path, BM25_DOCUMENTS_FILE)
+
+    if not (os.path.exists(arrays_file) and os.path.exists(documents_file)):
+        return None
+
+    try:
+        with open(documents_file, "rb") as f:
+            documents = pickle.load(f)
+        with np.load(arrays_file) as arrays:
+            bm25_index = BM25Index.from_arrays(arrays, documents)
+    except Exception as e:
+        logger.warning(f"BM25 색인 캐시 로드 실패, 다시 생성합니다: {str(e)}")
+        return None
+
+    if bm25_index is not None:
+        logger.info(f"BM25 색인 캐시 적중: {cache_key}")
+    return bm25_index
+
+
+def save_bm25_index(bm25_index, cache_key, manifest, cache_dir=None):
+    """
+    BM25 색인을 캐시 디렉토리에 저장합니다.
+
+    save_index()와 같이 임시 디렉토리에 기록한 뒤 이름을 바꿉니다.
+
+    Args:
+        bm25_index (BM25Index): 저장할 BM25 색인
+        cache_key (str): 캐시 키
+        manifest (dict): 캐시 키 구성 요소 등 메타데이터
+        cache_dir (str, optional): 캐시 디렉토리
+    """
+    cache_root = cache_dir or get_index_cache_dir()
+    cache_path = os.path.join(cache_root, cache_key)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+    try:
+        os.makedirs(tmp_path, exist_ok=True)
+        np.savez(os.path.join(tmp_path, BM25_ARRAYS_FILE), **bm25_index.to_arrays())
+        with open(os.path.join(tmp_path, BM25_DOCUMENTS_FILE), "wb") as f:
+            pickle.dump(bm25_index.documents, f)
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(cache_path):
+            shutil.rmtree(cache_path, ignore_errors=True)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"BM25 색인 캐시 저장 완료: {cache_path}")
+    except Exception as e:
+        logger.warning(f"BM25 색인 캐시 저장 실패: {str(e)}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_cached_context_packs(cache_key, cache_dir=None):
+    """
+    저장된 항목별 컨텍스트 팩을 불러옵니다.
+
+    Args:
+        cache_key (str): 캐시 키
+        cache_dir (str, optional): 캐시 디렉토리
+
+    Returns:
+        dict | None: 항목 이름 -> 컨텍스트 팩. 없으면 None
+    """
+    packs_file = os.path.join(cache_dir or get_index_cache_dir(), cache_key, CONTEXT_PACKS_FILE)
+    if not os.path.exists(packs_file):
+        return None
+
+    try:
+        with open(packs_file, "r", encoding="utf-8") as f:
+            context_packs = json.load(f)
+    except Exception as e:
+        logger.warning(f"컨텍스트 팩 로드 실패, 실시간 검색을 사용합니다: {str(e)}")
+        return None
+
+    logger.info(f"컨텍스트 팩 로드: {len(context_packs)}개 항목")
+    return context_packs
+
+
+def save_context_packs(context_packs, cache_key, manifest, cache_dir=None):
+    """
+    항목별 컨텍스트 팩을 캐시 디렉토리에 저장합니다.
+
+    save_index()와 같이 임시 디렉토리에 기록한 뒤 이름을 바꿉니다.
+
+    Args:
+        context_packs (dict): 항목 이름 -> 컨텍스트 팩
+        cache_key (str): 캐시 키
+        manifest (dict): 캐시 키 구성 요소 등 메타데이터
+        cache_dir (str, optional): 캐시 디렉토리
+
+    Returns:
+        str: 저장된 디렉토리 경로
+    """
+    cache_root = cache_dir or get_index_cache_dir()
+    cache_path = os.path.join(cache_root, cache_key)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+    try:
+        os.makedirs(tmp_path, exist_ok=True)
+        with open(os.path.join(tmp_path, CONTEXT_PACKS_FILE), "w", encoding="utf-8") as f:
+            json.dump(context_packs, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(cache_path):
+            shutil.rmtree(cache_path, ignore_errors=True)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"컨텍스트 팩 저장 완료: {cache_path}")
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return cache_path
+
+
+def record_index_build(elapsed):
+    """
+    인덱스 생성 소요 시간을 통계에 기록합니다.
+
+    Args:
+        elapsed (float): 생성 소요 시간(초)
+    """
+    _record("builds", build_seconds=elapsed)
+
+
+def get_index_cache_stats():
+    """
+    인덱스 캐시 적중/미스/생성 시간 통계를 반환합니다.
+
+    Returns:
+        dict: 캐시 통계
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(counter, build_seconds=0.0, load_seconds=0.0):
+    with _stats_lock:
+        _stats[counter] += 1
+        _stats["build_seconds"] += build_seconds
+        _stats["load_seconds"] += load_seconds
@@ -0,0 +1,241 @@
+"""
+가이드라인 PDF 코퍼스 적재
+
+여러 PDF를 프로세스 풀에서 파싱해 파일 단위로 청크를 스트리밍하고, 크기가 제한된 배치로
+임베딩해 FAISS 인덱스에 차례로 추가합니다. 전체 페이지나 전체 임베딩 목록을 한 번에
+메모리에 올리지 않으므로 코퍼스가 커져도 적재 중 추가 메모리는 동시에 처리하는 파일과
+배치 수만큼으로 제한됩니다.
+"""
+
+import glob
+import logging
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.vectorstores import FAISS
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.retrieval.index_cache import compute_file_hash
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 가이드라인 PDF
+DEFAULT_PDF_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "Research_on_AI_Ethics_Guidelines.pdf"
+)
+
+DEFAULT_INGEST_WORKERS = 4
+DEFAULT_EMBED_BATCH_SIZE = 64
+DEFAULT_EMBED_CONCURRENCY = 4
+DEFAULT_EMBED_MAX_RETRIES = 3
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _expand_path(path):
+    if os.path.isdir(path):
+        return sorted(
+            file_path for file_path in glob.glob(os.path.join(path, "**", "*"), recursive=True)
+            if file_path.lower().endswith(".pdf") and os.path.isfile(file_path)
+        )
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {path}")
+    return [path]
+
+
+def resolve_pdf_paths(pdf_path=None):
+    """
+    PDF 경로 지정을 파일 목록으로 변환합니다.
+
+    Args:
+        pdf_path (str | list, optional): PDF 파일, PDF가 들어 있는 디렉토리(하위 디렉토리 포함),
+            또는 이들의 목록. 문자열은 os.pathsep으로 여러 경로를 구분할 수 있습니다.
+            None이면 환경 변수 PDF_PATH 또는 data 폴더의 기본 PDF를 사용합니다.
+
+    Returns:
+        list: 중복 없이 정렬된 PDF 파일 절대 경로 목록
+
+    Raises:
+        FileNotFoundError: 경로가 없거나 PDF 파일이 하나도 없는 경우
+    """
+    if pdf_path is None:
+        pdf_path = os.getenv("PDF_PATH") or DEFAULT_PDF_PATH
+    if isinstance(pdf_path, str):
+        pdf_path = [path for path in pdf_path.split(os.pathsep) if path]
+
+    paths = sorted({os.path.abspath(file_path) for path in pdf_path for file_path in _expand_path(path)})
+    if not paths:
+        raise FileNotFoundError(f"PDF 파일이 없습니다: {', '.join(pdf_path)}")
+    return paths
+
+
+def load_pdf_chunks(path, chunk_size, chunk_overlap):
+    """
+    PDF 하나를 페이지 단위로 읽으면서 청크로 분할합니다.
+
+    프로세스 풀의 작업 함수로도 사용되며, 청크 메타데이터에 출처 정보를 추가합니다.
+    - source, page, total_pages: PDF 경로와 페이지 번호(0부터), 전체 페이지 수
+    - document_id: PDF 내용 해시 앞 16자리
+    - document_name: 파일 이름
+    - chunk_index: 문서 안에서의 청크 순번
+
+    Args:
+        path (str): PDF 파일 경로
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 중첩 크기
+
+    Returns:
+        list: 청크 Document 목록
+    """
+    provenance = {
+        "document_id": compute_file_hash(path)[:16],
+        "document_name": os.path.basename(path)
+    }
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    chunks = []
+    for page in PyPDFLoader(path).lazy_load():
+        page.metadata.update(provenance)
+        for chunk in text_splitter.split_documents([page]):
+            chunk.metadata["chunk_index"] = len(chunks)
+            chunks.append(chunk)
+    return chunks
+
+
+def iter_pdf_chunks(paths, chunk_size, chunk_overlap, workers=None):
+    """
+    여러 PDF의 청크를 파일 순서대로 생성합니다.
+
+    파일이 둘 이상이면 프로세스 풀에서 파싱하며, 메모리 사용량이 코퍼스 크기에 비례하지 않도록
+    동시에 파싱 중이거나 소비를 기다리는 파일 수를 workers개로 제한합니다.
+
+    Args:
+        paths (list): PDF 파일 경로 목록
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 중첩 크기
+        workers (int, optional): 파싱 프로세스 수. None이면 환경 변수 INGEST_WORKERS 또는 4
+
+    Yields:
+        Document: 청크
+    """
+    workers = min(workers or _env_int("INGEST_WORKERS", DEFAULT_INGEST_WORKERS), len(paths), os.cpu_count() or 1)
+    if workers <= 1:
+        for path in paths:
+            chunks = load_pdf_chunks(path, chunk_size, chunk_overlap)
+            logger.info(f"PDF 파싱 완료: {os.path.basename(path)} (청크 {len(chunks)}개)")
+            yield from chunks
+        return
+
+    remaining = deque(paths)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while remaining or pending:
+            while remaining and len(pending) < workers:
+                path = remaining.popleft()
+                pending.append((path, executor.submit(load_pdf_chunks, path, chunk_size, chunk_overlap)))
+
+            path, future = pending.popleft()
+            try:
+                chunks = future.result()
+            except Exception as e:
+                logger.error(f"PDF 파싱 실패: {path}: {str(e)}")
+                raise
+            logger.info(f"PDF 파싱 완료: {os.path.basename(path)} (청크 {len(chunks)}개)")
+            yield from chunks
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def embed_with_retry(embeddings, texts, max_retries=DEFAULT_EMBED_MAX_RETRIES, base_delay=1.0):
+    """
+    텍스트 배치를 임베딩하며, 실패하면 지수 백오프(지터 포함)로 재시도합니다.
+
+    Args:
+        embeddings (Embeddings): 임베딩 객체
+        texts (list): 텍스트 목록
+        max_retries (int): 최대 재시도 횟수
+        base_delay (float): 첫 재시도 대기 시간(초)
+
+    Returns:
+        list: 임베딩 벡터 목록
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return embeddings.embed_documents(texts)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = base_delay * 2 ** attempt * (0.5 + random.random())
+            logger.warning(f"임베딩 배치 실패, {delay:.1f}초 후 재시도합니다 ({attempt + 1}/{max_retries}): {str(e)}")
+            time.sleep(delay)
+
+
+def build_vectorstore(chunks, embeddings, batch_size=None, concurrency=None,
+                      max_retries=DEFAULT_EMBED_MAX_RETRIES):
+    """
+    청크를 배치 단위로 임베딩해 FAISS 벡터 저장소를 만듭니다.
+
+    최대 concurrency개의 배치를 동시에 임베딩하고, 완료된 배치는 입력 순서대로 인덱스에 추가합니다.
+    청크 생성(PDF 파싱)과 임베딩이 겹쳐 진행되며, 대기 중인 배치 수가 제한되어 있어
+    청크 생성기가 임베딩보다 앞서 나가지 않습니다.
+
+    Args:
+        chunks (Iterable): 청크 Document (생성기 가능)
+        embeddings (Embeddings): 임베딩 객체
+        batch_size (int, optional): 배치 크기. None이면 환경 변수 EMBED_BATCH_SIZE 또는 64
+        concurrency (int, optional): 동시 임베딩 요청 수. None이면 환경 변수 EMBED_CONCURRENCY 또는 4
+        max_retries (int): 배치별 최대 재시도 횟수
+
+    Returns:
+        FAISS: 벡터 저장소
+
+    Raises:
+        ValueError: 청크가 하나도 없는 경우
+    """
+    batch_size = batch_size or _env_int("EMBED_BATCH_SIZE", DEFAULT_EMBED_BATCH_SIZE)
+    concurrency = concurrency or _env_int("EMBED_CONCURRENCY", DEFAULT_EMBED_CONCURRENCY)
+
+    vectorstore = None
+
+    def add(batch, vectors):
+        nonlocal vectorstore
+        text_embeddings = list(zip((chunk.page_content for chunk in batch), vectors))
+        metadatas = [chunk.metadata for chunk in batch]
+        if vectorstore is None:
+            vectorstore = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas)
+        else:
+            vectorstore.add_embeddings(text_embeddings, metadatas=metadatas)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed") as executor:
+        for batch in _batched(chunks, batch_size):
+            texts = [chunk.page_content for chunk in batch]
+            pending.append((batch, executor.submit(embed_with_retry, embeddings, texts, max_retries)))
+            if len(pending) >= concurrency:
+                batch, future = pending.popleft()
+                add(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            add(batch, future.result())
+
+    if vectorstore is None:
+        raise ValueError("PDF에서 추출한 텍스트가 없습니다.")
+    return vectorstore
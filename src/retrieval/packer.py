@@ -0,0 +1,101 @@
+"""
+토큰 예산 기반 컨텍스트 패커
+
+검색 결과 조각(snippet)을 관련도 순으로 정렬하고 거의 같은 조각을 제거한 뒤,
+대상 모델의 실제 토큰 수로 예산을 채웁니다. 글자 수로 자르는 대신 몇 토큰을 담고
+몇 토큰을 버렸는지 함께 반환합니다.
+"""
+
+from src.llm.tokens import count_tokens, truncate_to_tokens
+from src.metrics import record_context_pack
+from src.retrieval.bm25 import tokenize
+
+# 예산이 이만큼 남으면 다음 조각의 앞부분을 잘라서라도 채움
+MIN_PARTIAL_TOKENS = 64
+
+# 토큰 집합의 자카드 유사도가 이 값 이상이면 중복으로 간주
+DUPLICATE_THRESHOLD = 0.8
+
+
+def _relevance_order(snippets, token_sets, query):
+    # 원래 순서(검색 순위)와 쿼리 토큰 겹침 순위를 RRF로 결합
+    if not query:
+        return list(range(len(snippets)))
+
+    query_tokens = set(tokenize(query))
+    overlap = [len(query_tokens & tokens) / (len(tokens) ** 0.5 or 1) for tokens in token_sets]
+    overlap_rank = {index: rank for rank, index in enumerate(sorted(range(len(snippets)), key=lambda i: -overlap[i]))}
+    return sorted(range(len(snippets)), key=lambda i: -(1 / (60 + i) + 1 / (60 + overlap_rank[i])))
+
+
+def _is_duplicate(text, tokens, selected):
+    for other_text, other_tokens in selected:
+        if text in other_text:
+            return True
+        union = len(tokens | other_tokens)
+        if union and len(tokens & other_tokens) / union >= DUPLICATE_THRESHOLD:
+            return True
+    return False
+
+
+def pack_context(snippets, token_budget, model="gpt-4", query=None, separator="\n",
+                 allow_partial=True, record=True):
+    """
+    조각들을 토큰 예산 안에서 관련도 순으로 담아 하나의 컨텍스트로 만듭니다.
+
+    - query가 있으면 원래 순서와 쿼리 토큰 겹침을 함께 고려해 순위를 정합니다.
+    - 이미 담긴 조각에 포함되거나 토큰 집합이 거의 같은 조각은 제외합니다.
+    - 조각은 통째로 담으며, 예산에 맞지 않으면 건너뛰고 다음 조각을 시도합니다.
+      allow_partial이면 남은 예산이 충분할 때 담지 못한 가장 관련도 높은 조각의 앞부분을 담습니다.
+    - 결과 텍스트는 담긴 조각을 원래 순서대로 이어 붙입니다.
+
+    Args:
+        snippets (list): 관련도(검색 순위) 순서의 텍스트 조각 목록
+        token_budget (int): 최대 토큰 수
+        model (str): 토큰 수를 계산할 모델 이름
+        query (str, optional): 관련도 계산에 사용할 쿼리
+        separator (str): 조각 구분자
+        allow_partial (bool): 조각 일부만 담는 것을 허용할지 여부
+        record (bool): 현재 노드의 실행 지표에 담은/버린 토큰 수를 기록할지 여부
+
+    Returns:
+        dict: {"text", "packed_tokens", "dropped_tokens", "packed", "dropped", "duplicates"}
+    """
+    snippets = [snippet for snippet in snippets if snippet and snippet.strip()]
+    normalized = [" ".join(snippet.split()) for snippet in snippets]
+    token_sets = [set(tokenize(text)) for text in normalized]
+    token_counts = [count_tokens(snippet, model) for snippet in snippets]
+    separator_tokens = count_tokens(separator, model)
+
+    selected, chosen, skipped, duplicates = [], {}, [], 0
+    used = 0
+    for index in _relevance_order(snippets, token_sets, query):
+        if _is_duplicate(normalized[index], token_sets[index], selected):
+            duplicates += 1
+            continue
+        cost = token_counts[index] + (separator_tokens if chosen else 0)
+        if used + cost > token_budget:
+            skipped.append(index)
+            continue
+        selected.append((normalized[index], token_sets[index]))
+        chosen[index] = snippets[index]
+        used += cost
+
+    remaining = token_budget - used - (separator_tokens if chosen else 0)
+    if allow_partial and skipped and remaining >= MIN_PARTIAL_TOKENS:
+        index = skipped.pop(0)
+        chosen[index] = truncate_to_tokens(snippets[index], remaining - 1, model) + "…"
+        used += count_tokens(chosen[index], model) + (separator_tokens if len(chosen) > 1 else 0)
+
+    total = sum(token_counts)
+    result = {
+        "text": separator.join(chosen[index] for index in sorted(chosen)),
+        "packed_tokens": used,
+        "dropped_tokens": max(0, total - used),
+        "packed": len(chosen),
+        "dropped": len(snippets) - len(chosen),
+        "duplicates": duplicates
+    }
+    if record:
+        record_context_pack(result["packed_tokens"], result["dropped_tokens"])
+    return result
@@ -3,57 +3,323 @@ PDF 문서 검색 관련 기능
 """
 
 import logging
-import os
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import threading
+import time
+from langchain import hub
+from langchain_core.prompts import PromptTemplate
 from langchain_opentutorial.rag.pdf import PDFRetrievalChain
+from src.llm import get_chat_model, get_embeddings
+from src.ratelimit import RateLimitedEmbeddings
+from src.retrieval.bm25 import BM25Index
+from src.retrieval.hybrid import (
+    HybridRetriever,
+    RETRIEVAL_MODE_LEXICAL,
+    RETRIEVAL_MODE_VECTOR,
+    get_retrieval_mode
+)
+from src.retrieval.index_cache import (
+    compute_corpus_hash,
+    make_index_cache_key,
+    load_cached_index,
+    save_index,
+    load_cached_bm25_index,
+    save_bm25_index,
+    load_cached_context_packs,
+    save_context_packs,
+    record_index_build
+)
+from src.retrieval.context_packs import DEFAULT_PACK_TOKEN_BUDGET, build_context_packs
+from src.retrieval.ingest import build_vectorstore, iter_pdf_chunks, resolve_pdf_paths
+from src.retrieval.query_cache import CachedQueryEmbeddings, get_query_embedding_cache
 
 logger = logging.getLogger(__name__)
 
-def setup_pdf_retrieval(pdf_path=None):
+RAG_PROMPT_NAME = "teddynote/rag-prompt-chat-history"
+
+# 프롬프트 허브에 접근할 수 없을 때 사용하는 로컬 RAG 프롬프트
+LOCAL_RAG_PROMPT = PromptTemplate.from_template(
+    """You are an assistant for question-answering tasks.
+Use the following pieces of retrieved context to answer the question.
+If you don't know the answer, just say that you don't know. Answer in Korean.
+
+#Previous Chat History:
+{chat_history}
+
+#Question:
+{question}
+
+#Context:
+{context}
+
+#Answer:"""
+)
+
+_rag_prompt = None
+_rag_prompt_lock = threading.Lock()
+
+
+def get_rag_prompt():
     """
-    PDF 문서를 로드하고 검색 가능한 벡터 저장소를 생성합니다.
-    
-    Args:
-        pdf_path (str, optional): PDF 파일 경로. 기본값은 None이며, 
-                                 이 경우 기본 경로를 사용합니다.
-    
+    PDF 검색 체인의 프롬프트를 반환합니다.
+
+    프롬프트 허브에서 프로세스당 한 번만 가져오며, 가져오지 못하면 로컬 프롬프트를 사용합니다.
+
     Returns:
-        tuple: (retriever, chain, vectorstore) 튜플
-    """
-    # 기본 PDF 파일 경로
-    if pdf_path is None:
-        # 프로젝트 루트 디렉토리 기준 상대 경로
-        pdf_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-            "data",
-            "Research_on_AI_Ethics_Guidelines.pdf"
+        BasePromptTemplate: RAG 프롬프트
+    """
+    global _rag_prompt
+    with _rag_prompt_lock:
+        if _rag_prompt is None:
+            try:
+                _rag_prompt = hub.pull(RAG_PROMPT_NAME)
+            except Exception as e:
+                logger.warning(f"프롬프트 허브 접근 실패, 로컬 프롬프트를 사용합니다: {str(e)}")
+                _rag_prompt = LOCAL_RAG_PROMPT
+        return _rag_prompt
+
+
+def set_rag_prompt(prompt):
+    """
+    PDF 검색 체인의 프롬프트를 교체합니다.
+
+    Args:
+        prompt (BasePromptTemplate | None): 사용할 프롬프트. None이면 다음 호출 때 허브에서 다시 가져옵니다.
+    """
+    global _rag_prompt
+    with _rag_prompt_lock:
+        _rag_prompt = prompt
+
+
+class IndexedPDFRetrievalChain(PDFRetrievalChain):
+    """
+    이미 생성된 벡터 저장소와 BM25 색인을 재사용하는 PDF 검색 체인
+
+    PDFRetrievalChain.create_chain()은 PDF를 다시 로드, 분할, 임베딩하므로
+    문서 적재 단계를 건너뛰고 전달받은 색인으로 하이브리드 검색기와 체인을 구성합니다.
+    """
+
+    def __init__(self, source_uri, vectorstore, bm25_index=None, retrieval_mode=None, k=10,
+                 context_packs=None):
+        super().__init__(source_uri)
+        self.k = k
+        self.prebuilt_vectorstore = vectorstore
+        self.bm25_index = bm25_index
+        self.context_packs = context_packs
+        self.retrieval_mode = get_retrieval_mode(retrieval_mode)
+
+    def load_documents(self, source_uris):
+        return []
+
+    def split_documents(self, docs, text_splitter):
+        return []
+
+    def create_vectorstore(self, split_docs):
+        return self.prebuilt_vectorstore
+
+    def create_retriever(self, vectorstore):
+        return HybridRetriever(
+            vectorstore=vectorstore,
+            bm25_index=self.bm25_index,
+            mode=self.retrieval_mode,
+            k=self.k,
+            fetch_k=self.k * 2,
+            context_packs=self.context_packs
         )
+
+    def create_model(self):
+        return get_chat_model("gpt-4o-mini", temperature=0)
+
+    def create_prompt(self):
+        return get_rag_prompt()
+
+
+def _embedding_id(embeddings, embedding_model):
+    # 같은 모델 이름이라도 임베딩 구현(예: 벤치마크용 가짜 임베딩)이 다르면 다른 인덱스로 취급
+    return f"{type(embeddings).__name__}/{embedding_model}"
+
+
+def _context_packs_cache_key(pdf_hash, chunk_size, chunk_overlap, embedding_id, retrieval_mode):
+    # 팩 내용은 검색 결과이므로 검색 모드와 임베딩(lexical 모드에서는 None)이 다르면 다른 팩으로 취급
+    return make_index_cache_key(pdf_hash, chunk_size, chunk_overlap,
+                                f"context_packs/{retrieval_mode}/{embedding_id}")
+
+
+def _load_chunks(pdf_paths, chunk_size, chunk_overlap):
+    split_documents = list(iter_pdf_chunks(pdf_paths, chunk_size, chunk_overlap))
+    logger.info(f"분할된 청크의수: {len(split_documents)}")
+    return split_documents
+
+
+def _vectorstore_documents(vectorstore):
+    # FAISS 인덱스 순서대로 청크를 꺼내 BM25 문서 번호와 맞춤
+    return [vectorstore.docstore.search(doc_id) for _, doc_id in sorted(vectorstore.index_to_docstore_id.items())]
+
+
+def setup_pdf_retrieval(pdf_path=None, chunk_size=500, chunk_overlap=50,
+                        embedding_model="text-embedding-3-small", use_cache=True,
+                        retriever_k=10, retrieval_mode=None):
+    """
+    PDF 문서를 로드하고 검색 가능한 벡터 저장소와 BM25 색인을 생성합니다.
+
+    PDF 파싱, 청크 분할, 임베딩은 한 번만 수행되며 검색기와 체인은 모두
+    같은 색인을 사용합니다. 검색 쿼리 임베딩은 쿼리 임베딩 캐시(EMBEDDING_CACHE)를 거칩니다.
+
+    여러 PDF나 디렉토리를 지정하면 하나의 색인으로 묶습니다. PDF는 프로세스 풀에서 파싱되고
+    청크는 배치 단위로 임베딩되며(src.retrieval.ingest), 청크 메타데이터에 문서 출처가 기록됩니다.
+
+    생성된 인덱스는 PDF 내용 해시, 분할 설정, 임베딩 모델을 키로 디스크에 캐시되며,
+    키가 같으면 PDF 파싱과 임베딩 없이 캐시된 인덱스를 메모리 매핑으로 불러옵니다.
+    BM25 색인은 임베딩 모델과 무관하게 PDF 해시와 분할 설정만으로 캐시됩니다.
+
+    build_guideline_context_packs()로 같은 PDF, 분할 설정, 임베딩, 검색 모드로 미리 생성한
+    항목별 컨텍스트 팩이 있으면 검색기의 context_packs 속성으로 함께 제공합니다.
+
+    lexical 모드에서는 벡터 인덱스를 만들지 않으므로 색인 생성과 검색 모두 임베딩 호출이 없습니다.
     
-    logger.info(f"PDF 파일 로드 중: {pdf_path}")
+    Args:
+        pdf_path (str | list, optional): PDF 파일, PDF 디렉토리 또는 이들의 목록. 기본값은 None이며,
+                                        이 경우 환경 변수 PDF_PATH 또는 기본 경로를 사용합니다.
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 중첩 크기
+        embedding_model (str): 임베딩 모델 이름
+        use_cache (bool): 인덱스 디스크 캐시 사용 여부
+        retriever_k (int): 검색기가 반환할 문서 수
+        retrieval_mode (str, optional): 검색 모드 (hybrid, vector, lexical).
+                                        None이면 환경 변수 RETRIEVAL_MODE 또는 hybrid를 사용합니다.
     
+    Returns:
+        tuple: (retriever, chain, vectorstore) 튜플. lexical 모드에서는 vectorstore가 None입니다.
+    """
     try:
-        # PDF 로드
-        loader = PyPDFLoader(pdf_path)
-        docs = loader.load()
-        logger.info(f"문서의 페이지수: {len(docs)}")
+        pdf_paths = resolve_pdf_paths(pdf_path)
+        logger.info(f"PDF 파일 로드 중: {', '.join(pdf_paths)}")
+
+        retrieval_mode = get_retrieval_mode(retrieval_mode)
+        pdf_hash = compute_corpus_hash(pdf_paths) if use_cache else None
+
+        # 캐시된 벡터 인덱스 조회
+        vectorstore = None
+        embedding_id = None
+        if retrieval_mode != RETRIEVAL_MODE_LEXICAL:
+            embeddings = get_embeddings(embedding_model)
+            embedding_id = _embedding_id(embeddings, embedding_model)
+            # 색인 생성과 쿼리 임베딩 요청을 공유 호출 한도 안에서 보냄
+            embeddings = RateLimitedEmbeddings(embeddings, embedding_model)
+
+            # 검색 쿼리 임베딩은 실행 간에 재사용 (색인 생성용 문서 임베딩은 캐시하지 않음)
+            query_cache = get_query_embedding_cache()
+            if query_cache is not None:
+                embeddings = CachedQueryEmbeddings(embeddings, embedding_id, query_cache)
 
-        # 청크 분할
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-        split_documents = text_splitter.split_documents(docs)
-        logger.info(f"분할된 청크의수: {len(split_documents)}")
+            if use_cache:
+                cache_key = make_index_cache_key(pdf_hash, chunk_size, chunk_overlap, embedding_id)
+                vectorstore = load_cached_index(cache_key, embeddings)
 
-        # 임베딩 및 벡터 저장소 생성
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        vectorstore = FAISS.from_documents(documents=split_documents, embedding=embeddings)
+            if vectorstore is None:
+                start = time.perf_counter()
 
-        # PDF 검색 체인 생성
-        pdf_file = PDFRetrievalChain([pdf_path]).create_chain()
+                # 파싱, 분할, 배치 임베딩을 겹쳐 진행하며 벡터 저장소 생성
+                vectorstore = build_vectorstore(
+                    iter_pdf_chunks(pdf_paths, chunk_size, chunk_overlap), embeddings
+                )
+
+                elapsed = time.perf_counter() - start
+                record_index_build(elapsed)
+                logger.info(f"인덱스 생성 완료: 청크 {vectorstore.index.ntotal}개 ({elapsed:.2f}초)")
+
+                if use_cache:
+                    save_index(vectorstore, cache_key, {
+                        "pdf_paths": pdf_paths,
+                        "pdf_hash": pdf_hash,
+                        "chunk_size": chunk_size,
+                        "chunk_overlap": chunk_overlap,
+                        "embedding_model": embedding_model,
+                        "chunk_count": vectorstore.index.ntotal,
+                        "build_seconds": round(elapsed, 3)
+                    })
+
+        # BM25 색인 조회 또는 생성 (벡터 검색만 사용하는 경우 생략)
+        bm25_index = None
+        if retrieval_mode != RETRIEVAL_MODE_VECTOR:
+            if use_cache:
+                bm25_cache_key = make_index_cache_key(pdf_hash, chunk_size, chunk_overlap, "bm25")
+                bm25_index = load_cached_bm25_index(bm25_cache_key)
+
+            if bm25_index is None:
+                start = time.perf_counter()
+                if vectorstore is not None:
+                    documents = _vectorstore_documents(vectorstore)
+                else:
+                    documents = _load_chunks(pdf_paths, chunk_size, chunk_overlap)
+                bm25_index = BM25Index.from_documents(documents)
+                elapsed = time.perf_counter() - start
+
+                if use_cache:
+                    save_bm25_index(bm25_index, bm25_cache_key, {
+                        "pdf_paths": pdf_paths,
+                        "pdf_hash": pdf_hash,
+                        "chunk_size": chunk_size,
+                        "chunk_overlap": chunk_overlap,
+                        "chunk_count": len(bm25_index),
+                        "build_seconds": round(elapsed, 3)
+                    })
+
+        # 미리 생성된 항목별 컨텍스트 팩 (없으면 노드가 실시간 검색)
+        context_packs = load_cached_context_packs(
+            _context_packs_cache_key(pdf_hash, chunk_size, chunk_overlap, embedding_id, retrieval_mode)
+        ) if use_cache else None
+
+        # PDF 검색 체인 생성 (색인 재사용)
+        pdf_file = IndexedPDFRetrievalChain(pdf_paths, vectorstore, bm25_index=bm25_index,
+                                            retrieval_mode=retrieval_mode, k=retriever_k,
+                                            context_packs=context_packs).create_chain()
 
         return pdf_file.retriever, pdf_file.chain, vectorstore
     
     except Exception as e:
         logger.error(f"PDF 처리 중 오류 발생: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def build_guideline_context_packs(category_queries, pdf_path=None, token_budget=DEFAULT_PACK_TOKEN_BUDGET,
+                                  chunk_size=500, chunk_overlap=50,
+                                  embedding_model="text-embedding-3-small", retrieval_mode=None):
+    """
+    가이드라인 PDF에서 항목별 컨텍스트 팩을 생성해 인덱스 캐시 디렉토리에 저장합니다.
+
+    평가 전에 한 번 실행해 두는 오프라인 단계이며, 이후 setup_pdf_retrieval()이 같은 PDF,
+    분할 설정, 임베딩, 검색 모드로 호출되면 저장된 팩을 불러옵니다.
+
+    Args:
+        category_queries (dict): 항목 이름 -> 검색 쿼리 목록
+        pdf_path (str | list, optional): PDF 파일, PDF 디렉토리 또는 이들의 목록
+        token_budget (int): 항목별 최대 토큰 수
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 중첩 크기
+        embedding_model (str): 임베딩 모델 이름
+        retrieval_mode (str, optional): 팩 생성에 사용할 검색 모드
+
+    Returns:
+        tuple: (항목 이름 -> 컨텍스트 팩, 저장된 디렉토리 경로)
+    """
+    pdf_paths = resolve_pdf_paths(pdf_path)
+    retrieval_mode = get_retrieval_mode(retrieval_mode)
+    retriever, _, _ = setup_pdf_retrieval(pdf_paths, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                          embedding_model=embedding_model, retrieval_mode=retrieval_mode)
+
+    context_packs = build_context_packs(retriever, category_queries, token_budget)
+    pdf_hash = compute_corpus_hash(pdf_paths)
+    embedding_id = (_embedding_id(get_embeddings(embedding_model), embedding_model)
+                    if retrieval_mode != RETRIEVAL_MODE_LEXICAL else None)
+    cache_key = _context_packs_cache_key(pdf_hash, chunk_size, chunk_overlap, embedding_id, retrieval_mode)
+    cache_path = save_context_packs(context_packs, cache_key, {
+        "pdf_paths": pdf_paths,
+        "pdf_hash": pdf_hash,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_model": embedding_model,
+        "retrieval_mode": retrieval_mode,
+        "token_budget": token_budget,
+        "category_queries": category_queries
+    })
+    return context_packs, cache_path
\ No newline at end of file
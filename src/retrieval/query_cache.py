@@ -0,0 +1,287 @@
+"""
+검색 쿼리 임베딩 캐시
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.cache import LRUCache, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 캐시 파일
+DEFAULT_EMBEDDING_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "embedding_cache.sqlite"
+)
+
+
+def _encode(vector):
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode(value):
+    return np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+
+
+class QueryEmbeddingCache:
+    """
+    임베딩 모델과 쿼리 텍스트를 키로 하는 쿼리 임베딩 캐시
+
+    메모리 LRU 계층과 SQLite 영속 계층으로 구성되며, 벡터는 float32 바이트를
+    base64로 인코딩해 저장합니다.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None, max_entries=None,
+                 memory_entries=1024, persistent=True):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+            ttl_seconds (float, optional): 영속 계층 항목 유효 시간(초)
+            max_entries (int, optional): 영속 계층 최대 항목 수
+            memory_entries (int): 메모리 계층 최대 항목 수
+            persistent (bool): SQLite 영속 계층 사용 여부
+        """
+        self.memory = LRUCache(memory_entries)
+        self.store = SQLiteStore(
+            path or DEFAULT_EMBEDDING_CACHE_PATH,
+            table="query_embeddings",
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries
+        ) if persistent else None
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "batches": 0}
+
+    @staticmethod
+    def make_key(embedding_id, text):
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            embedding_id (str): 임베딩 구현과 모델 이름
+            text (str): 쿼리 텍스트
+
+        Returns:
+            str: 캐시 키
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return json.dumps([embedding_id, text_hash])
+
+    def get(self, key):
+        """
+        캐시된 임베딩을 반환합니다.
+
+        Args:
+            key (str): 캐시 키
+
+        Returns:
+            list | None: 임베딩 벡터. 없으면 None
+        """
+        vector = self.memory.get(key)
+        if vector is not None:
+            self.record("memory_hits")
+            return vector
+
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                vector = _decode(value)
+                self.memory.set(key, vector)
+                self.record("disk_hits")
+                return vector
+
+        self.record("misses")
+        return None
+
+    def set(self, key, vector):
+        """
+        임베딩을 저장합니다.
+
+        Args:
+            key (str): 캐시 키
+            vector (list): 임베딩 벡터
+
+        Returns:
+            list: 저장된 벡터 (float32로 변환된 값)
+        """
+        # 적중 시와 같은 값이 되도록 float32로 맞춰 저장
+        value = _encode(vector)
+        vector = _decode(value)
+        self.memory.set(key, vector)
+        if self.store is not None:
+            self.store.set(key, value)
+        self.record("writes")
+        return vector
+
+    def record(self, name):
+        """
+        통계 카운터를 하나 증가시킵니다.
+
+        Args:
+            name (str): 카운터 이름
+        """
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            dict: 계층별 적중 수, 미스 수, 배치 임베딩 요청 수, 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    쿼리 임베딩만 캐시하는 임베딩 래퍼
+
+    embed_query()는 캐시를 먼저 조회하고, embed_queries()는 캐시에 없는 쿼리만 모아
+    한 번의 embed_documents() 요청으로 임베딩합니다. 문서 임베딩(색인 생성)은 캐시하지 않습니다.
+    """
+
+    def __init__(self, embeddings, embedding_id, cache):
+        """
+        Args:
+            embeddings (Embeddings): 실제 임베딩 객체
+            embedding_id (str): 캐시 키에 사용할 임베딩 구현과 모델 이름
+            cache (QueryEmbeddingCache): 쿼리 임베딩 캐시
+        """
+        self.embeddings = embeddings
+        self.embedding_id = embedding_id
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_queries([text]))[0]
+
+    def _lookup(self, texts):
+        keys = [self.cache.make_key(self.embedding_id, text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        # 같은 쿼리가 여러 번 있어도 한 번만 임베딩
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        return keys, vectors, missing
+
+    def _fill(self, texts, keys, vectors, missing, embedded):
+        if not missing:
+            return vectors
+
+        self.cache.record("batches")
+        computed = dict(zip(missing, embedded))
+        stored = {}
+        for key, text in zip(keys, texts):
+            if text in computed and text not in stored:
+                stored[text] = self.cache.set(key, computed[text])
+        return [vector if vector is not None else stored[text] for vector, text in zip(vectors, texts)]
+
+    def embed_queries(self, texts):
+        """
+        여러 쿼리를 임베딩합니다. 캐시에 없는 쿼리는 한 번의 요청으로 임베딩합니다.
+
+        Args:
+            texts (list): 쿼리 텍스트 목록
+
+        Returns:
+            list: 입력 순서의 임베딩 벡터 목록
+        """
+        keys, vectors, missing = self._lookup(texts)
+        embedded = self.embeddings.embed_documents(missing) if missing else []
+        return self._fill(texts, keys, vectors, missing, embedded)
+
+    async def aembed_queries(self, texts):
+        """
+        embed_queries()의 비동기 버전입니다.
+
+        Args:
+            texts (list): 쿼리 텍스트 목록
+
+        Returns:
+            list: 입력 순서의 임베딩 벡터 목록
+        """
+        # SQLite 조회가 이벤트 루프를 막지 않도록 스레드에서 실행
+        keys, vectors, missing = await asyncio.to_thread(self._lookup, texts)
+        embedded = await self.embeddings.aembed_documents(missing) if missing else []
+        return await asyncio.to_thread(self._fill, texts, keys, vectors, missing, embedded)
+
+
+_cache_lock = threading.Lock()
+_cache = None
+_cache_configured = False
+
+
+def _create_cache_from_env():
+    mode = os.getenv("EMBEDDING_CACHE", "sqlite").lower()
+    if mode in ("off", "false", "0", "none"):
+        return None
+
+    max_entries = os.getenv("EMBEDDING_CACHE_MAX_ENTRIES")
+    return QueryEmbeddingCache(
+        path=os.getenv("EMBEDDING_CACHE_PATH"),
+        max_entries=int(max_entries) if max_entries else None,
+        persistent=mode != "memory"
+    )
+
+
+def get_query_embedding_cache():
+    """
+    프로세스 전체에서 공유되는 쿼리 임베딩 캐시를 반환합니다.
+
+    환경 변수 EMBEDDING_CACHE(sqlite/memory/off), EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES로 설정합니다.
+
+    Returns:
+        QueryEmbeddingCache | None: 캐시. 비활성화된 경우 None
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            _cache = _create_cache_from_env()
+            _cache_configured = True
+        return _cache
+
+
+def set_query_embedding_cache(cache):
+    """
+    쿼리 임베딩 캐시를 교체합니다.
+
+    Args:
+        cache (QueryEmbeddingCache | None): 사용할 캐시. None이면 캐시를 끕니다.
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def get_query_embedding_cache_stats():
+    """
+    현재 쿼리 임베딩 캐시의 적중 통계를 반환합니다.
+
+    Returns:
+        dict: 캐시 통계. 캐시가 비활성화된 경우 빈 딕셔너리
+    """
+    cache = get_query_embedding_cache()
+    return cache.stats() if cache is not None else {}
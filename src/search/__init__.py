@@ -0,0 +1,16 @@
+"""
+search 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
+"""
+
+from src.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'SearchCache': 'cache',
+    'SearchCacheMiss': 'cache',
+    'SearchClient': 'client',
+    'get_search_tool': 'client',
+    'set_search_tool': 'client',
+    'get_search_cache_stats': 'client'
+})
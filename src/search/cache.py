@@ -0,0 +1,173 @@
+"""
+웹 검색 결과 캐시
+"""
+
+import json
+import logging
+import os
+import threading
+
+from src.cache import LRUCache, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 캐시 파일
+DEFAULT_SEARCH_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "search_cache.sqlite"
+)
+
+# 검색 결과 기본 유효 시간 (1일)
+DEFAULT_SEARCH_CACHE_TTL = 24 * 60 * 60
+
+
+class SearchCacheMiss(LookupError):
+    """오프라인 재생 모드에서 캐시에 없는 검색을 요청한 경우 발생합니다."""
+
+
+def normalize_query(query):
+    """
+    캐시 키에 사용할 수 있도록 검색 쿼리를 정규화합니다.
+
+    공백을 하나로 합치고 대소문자를 구분하지 않습니다.
+
+    Args:
+        query (str): 검색 쿼리
+
+    Returns:
+        str: 정규화된 쿼리
+    """
+    return " ".join(query.split()).casefold()
+
+
+class SearchCache:
+    """
+    정규화된 쿼리, topic, max_results를 키로 하는 검색 결과 캐시
+
+    메모리 LRU 계층과 SQLite 디스크 계층으로 구성되며, 두 계층 모두 같은 TTL을 적용합니다.
+    """
+
+    def __init__(self, path=None, ttl_seconds=DEFAULT_SEARCH_CACHE_TTL, max_entries=None,
+                 memory_entries=256, persistent=True):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+            ttl_seconds (float, optional): 항목 유효 시간(초). None이면 만료되지 않습니다.
+            max_entries (int, optional): 디스크 계층 최대 항목 수
+            memory_entries (int): 메모리 계층 최대 항목 수
+            persistent (bool): SQLite 디스크 계층 사용 여부
+        """
+        self.memory = LRUCache(memory_entries, ttl_seconds=ttl_seconds)
+        self.store = SQLiteStore(
+            path or DEFAULT_SEARCH_CACHE_PATH,
+            table="search_results",
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries
+        ) if persistent else None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "writes": 0}
+
+    @staticmethod
+    def make_key(query, topic, max_results, format_output=True, **kwargs):
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            query (str): 검색 쿼리
+            topic (str): 검색 주제
+            max_results (int): 최대 검색 결과 수
+            format_output (bool): 결과 포맷팅 여부
+            **kwargs: 결과에 영향을 주는 추가 검색 인자
+
+        Returns:
+            str: 캐시 키
+        """
+        return json.dumps(
+            [normalize_query(query), topic, max_results, format_output, kwargs],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+
+    def get(self, key, include_expired=False):
+        """
+        캐시된 검색 결과를 반환합니다.
+
+        Args:
+            key (str): 캐시 키
+            include_expired (bool): True면 TTL이 지난 디스크 항목도 반환합니다 (오프라인 재생용).
+
+        Returns:
+            list | None: 검색 결과. 없으면 None
+        """
+        results = self.memory.get(key)
+        if results is None and self.store is not None:
+            entry = self.store.get_entry(key, include_expired=include_expired)
+            if entry is not None:
+                value, expires_at = entry
+                results = json.loads(value)
+                # 디스크 항목의 남은 유효 시간을 메모리 계층에서도 유지
+                self.memory.set(key, results, expires_at=expires_at)
+
+        self.record("hits" if results is not None else "misses")
+        return results
+
+    def set(self, key, results):
+        """
+        검색 결과를 저장합니다.
+
+        Args:
+            key (str): 캐시 키
+            results (list): 검색 결과
+        """
+        self.memory.set(key, results)
+        if self.store is not None:
+            self.store.set(key, json.dumps(results, ensure_ascii=False))
+        self.record("writes")
+
+    def record(self, name):
+        """
+        통계 카운터를 하나 증가시킵니다.
+
+        Args:
+            name (str): 카운터 이름 (hits, misses, coalesced, writes)
+        """
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            dict: 적중/미스/병합/기록 수와 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def create_search_cache_from_env():
+    """
+    환경 변수로 검색 캐시를 생성합니다.
+
+    SEARCH_CACHE(sqlite/memory/off), SEARCH_CACHE_PATH, SEARCH_CACHE_TTL,
+    SEARCH_CACHE_MAX_ENTRIES를 사용합니다.
+
+    Returns:
+        SearchCache | None: 검색 캐시. 비활성화된 경우 None
+    """
+    mode = os.getenv("SEARCH_CACHE", "sqlite").lower()
+    if mode in ("off", "false", "0", "none"):
+        return None
+
+    ttl = os.getenv("SEARCH_CACHE_TTL")
+    max_entries = os.getenv("SEARCH_CACHE_MAX_ENTRIES")
+    return SearchCache(
+        path=os.getenv("SEARCH_CACHE_PATH"),
+        ttl_seconds=float(ttl) if ttl else DEFAULT_SEARCH_CACHE_TTL,
+        max_entries=int(max_entries) if max_entries else None,
+        persistent=mode != "memory"
+    )
@@ -0,0 +1,181 @@
+"""
+웹 검색 클라이언트 관리
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from src.cache import SingleFlight
+from src.metrics import record_timing
+from src.ratelimit.scheduler import PROVIDER_TAVILY, get_rate_limiter
+from src.search.cache import SearchCacheMiss, create_search_cache_from_env
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_search_client = None
+
+
+class SearchClient:
+    """
+    TavilySearch 래퍼
+
+    동기 search()와 비동기 asearch()를 같은 인터페이스로 제공합니다.
+    Tavily 클라이언트는 블로킹 HTTP 호출을 사용하므로 asearch()는 스레드에서 실행됩니다.
+
+    검색 캐시가 있으면 캐시를 먼저 조회하고, 동시에 들어온 같은 검색은 하나의
+    요청으로 합칩니다. 오프라인 모드에서는 캐시에 있는 결과만 반환합니다.
+    """
+
+    def __init__(self, tool=None, cache=None, offline=False):
+        """
+        Args:
+            tool (TavilySearch, optional): 실제 검색 도구. 오프라인 모드에서는 없어도 됩니다.
+            cache (SearchCache, optional): 검색 결과 캐시
+            offline (bool): 캐시에서만 결과를 반환할지 여부
+        """
+        if tool is None and not offline:
+            raise ValueError("온라인 검색에는 검색 도구가 필요합니다.")
+        self.tool = tool
+        self.cache = cache
+        self.offline = offline
+        self._flights = SingleFlight()
+
+    def search(self, query, topic="general", max_results=5, format_output=True, **kwargs):
+        """
+        웹 검색을 수행합니다.
+
+        Args:
+            query (str): 검색 쿼리
+            topic (str): 검색 주제 ("general" 또는 "news")
+            max_results (int): 최대 검색 결과 수
+            format_output (bool): 결과를 문자열로 포맷팅할지 여부
+
+        Returns:
+            list: 검색 결과 목록
+
+        Raises:
+            SearchCacheMiss: 오프라인 모드에서 캐시에 없는 검색인 경우
+        """
+        start = time.perf_counter()
+        try:
+            return self._search(query, topic, max_results, format_output, **kwargs)
+        finally:
+            record_timing("search", time.perf_counter() - start)
+
+    def _search(self, query, topic, max_results, format_output, **kwargs):
+        if self.cache is None:
+            if self.offline:
+                raise SearchCacheMiss(f"오프라인 모드에서는 검색 캐시가 필요합니다: {query}")
+            return self._search_live(query, topic, max_results, format_output, **kwargs)
+
+        key = self.cache.make_key(query, topic, max_results, format_output, **kwargs)
+        results = self.cache.get(key, include_expired=self.offline)
+        if results is not None:
+            return results
+
+        if self.offline:
+            raise SearchCacheMiss(f"캐시되지 않은 검색입니다 (오프라인 모드): {query}")
+
+        results, shared = self._flights.do(
+            key,
+            lambda: self._fetch_and_store(key, query, topic, max_results, format_output, **kwargs)
+        )
+        if shared:
+            self.cache.record("coalesced")
+        return results
+
+    async def asearch(self, query, topic="general", max_results=5, format_output=True, **kwargs):
+        """
+        search()의 비동기 버전입니다.
+        """
+        return await asyncio.to_thread(
+            self.search, query, topic, max_results, format_output, **kwargs
+        )
+
+    def _fetch_and_store(self, key, query, topic, max_results, format_output, **kwargs):
+        # 대기 중 다른 요청이 먼저 저장했을 수 있으므로 다시 확인
+        results = self.cache.memory.get(key)
+        if results is not None:
+            return results
+
+        results = self._search_live(query, topic, max_results, format_output, **kwargs)
+        self.cache.set(key, results)
+        return results
+
+    def _search_live(self, query, topic, max_results, format_output, **kwargs):
+        # 동시 실행 중인 평가들의 검색 요청이 공유 한도(RATE_LIMITS의 tavily)를 넘지 않도록 스케줄러를 거침
+        return get_rate_limiter().call(
+            lambda: self.tool.search(
+                query=query,
+                topic=topic,
+                max_results=max_results,
+                format_output=format_output,
+                **kwargs
+            ),
+            PROVIDER_TAVILY
+        )
+
+
+def is_search_offline():
+    """
+    오프라인 재생 모드 여부를 반환합니다 (환경 변수 SEARCH_OFFLINE).
+
+    Returns:
+        bool: 오프라인 모드이면 True
+    """
+    return os.getenv("SEARCH_OFFLINE", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_search_tool():
+    """
+    프로세스 전체에서 공유되는 검색 클라이언트를 반환합니다.
+
+    Returns:
+        SearchClient: 공유 검색 클라이언트
+    """
+    global _search_client
+    with _lock:
+        if _search_client is None:
+            offline = is_search_offline()
+            tool = None
+            if not offline:
+                from langchain_teddynote.tools.tavily import TavilySearch
+                logger.info("검색 클라이언트 생성: TavilySearch")
+                tool = TavilySearch()
+            else:
+                logger.info("검색 오프라인 재생 모드: 캐시된 결과만 사용합니다.")
+            _search_client = SearchClient(tool, cache=create_search_cache_from_env(), offline=offline)
+        return _search_client
+
+
+def set_search_tool(client):
+    """
+    공유 검색 클라이언트를 교체합니다.
+
+    Args:
+        client (SearchClient | None): 사용할 검색 클라이언트. None이면 다음 호출 때
+                                      환경 변수 설정으로 다시 생성합니다.
+    """
+    global _search_client
+    with _lock:
+        _search_client = client
+
+
+def get_search_cache_stats():
+    """
+    공유 검색 클라이언트의 캐시 통계를 반환합니다.
+
+    통계를 읽으려고 검색 클라이언트를 새로 만들지 않습니다.
+
+    Returns:
+        dict: 캐시 통계. 클라이언트가 아직 생성되지 않았거나 캐시가 비활성화된 경우 빈 딕셔너리
+    """
+    with _lock:
+        client = _search_client
+    if client is None or client.cache is None:
+        return {}
+    return client.cache.stats()
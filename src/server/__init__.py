@@ -0,0 +1,15 @@
+"""
+server 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
+"""
+
+from src.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'JobManager': 'jobs',
+    'QueueFullError': 'jobs',
+    'make_job_key': 'jobs',
+    'EvaluationRequestHandler': 'http',
+    'create_server': 'http'
+})
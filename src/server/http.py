@@ -0,0 +1,169 @@
+"""
+평가 작업 HTTP API
+
+엔드포인트:
+    POST /jobs                 평가 작업 등록 ({"description", "risk_mode", "report_mode", "model_routing", "priority"})
+    GET  /jobs/{job_id}        작업 상태와 구조화된 결과(JSON) 조회
+    GET  /jobs/{job_id}/report 마크다운 보고서 조회
+    GET  /healthz              서버, 큐, API 호출 스케줄러 상태
+    GET  /metrics              노드별 실행 지표 (Prometheus 형식)
+"""
+
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.metrics import get_metrics_registry
+from src.ratelimit import PRIORITIES, PRIORITY_INTERACTIVE
+from src.server.jobs import JOB_SUCCEEDED, IN_FLIGHT_STATUSES, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_BYTES = 1 << 20
+
+# 큐가 가득 찼을 때 클라이언트에 제안하는 재시도 간격(초)
+RETRY_AFTER_SECONDS = 5
+
+RUN_OPTIONS = {
+    "risk_mode": ("combined", "per_category"),
+    "report_mode": ("llm", "template"),
+    "model_routing": ("cascade", "fixed"),
+}
+
+
+class EvaluationRequestHandler(BaseHTTPRequestHandler):
+    """
+    평가 작업 API 요청 처리기
+
+    server.job_manager에 등록된 JobManager로 작업을 등록하고 조회합니다.
+    """
+
+    server_version = "AIEthicsEvaluator/1.0"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def _send(self, status, body, content_type="application/json; charset=utf-8", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False, indent=2)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status, message, headers=None):
+        self._send(status, {"error": message}, headers=headers)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("요청 본문이 너무 큽니다.")
+        body = self.rfile.read(length) if length else b""
+        data = json.loads(body.decode("utf-8") or "{}")
+        if not isinstance(data, dict):
+            raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+        return data
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, "존재하지 않는 경로입니다.")
+            return
+
+        try:
+            data = self._read_json()
+            description = data.get("description") or data.get("service_description")
+            if not isinstance(description, str) or not description.strip():
+                raise ValueError("description 필드가 필요합니다.")
+            options = {}
+            for name, allowed in RUN_OPTIONS.items():
+                value = data.get(name)
+                if value is not None and value not in allowed:
+                    raise ValueError(f"{name}는 {', '.join(allowed)} 중 하나여야 합니다.")
+                options[name] = value
+            priority = data.get("priority") or PRIORITY_INTERACTIVE
+            if priority not in PRIORITIES:
+                raise ValueError(f"priority는 {', '.join(PRIORITIES)} 중 하나여야 합니다.")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            job, created = self.server.job_manager.submit(description, priority=priority, **options)
+        except QueueFullError as e:
+            self._send_error(HTTPStatus.TOO_MANY_REQUESTS, str(e),
+                             headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+
+        body = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "deduplicated": not created,
+            "status_url": f"/jobs/{job['job_id']}",
+            "report_url": f"/jobs/{job['job_id']}/report",
+        }
+        self._send(HTTPStatus.ACCEPTED, body, headers={"Location": body["status_url"]})
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        parts = path.strip("/").split("/")
+
+        if path == "/healthz":
+            # 스케줄러 모듈은 asyncio를 불러오므로 서버 시작(--help) 경로에서 제외
+            from src.ratelimit import get_rate_limiter
+            self._send(HTTPStatus.OK, {"status": "ok", "queue": self.server.job_manager.stats(),
+                                       "rate_limit": get_rate_limiter().stats()})
+        elif path == "/metrics":
+            self._send(HTTPStatus.OK, get_metrics_registry().to_prometheus(),
+                       content_type="text/plain; version=0.0.4; charset=utf-8")
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._get_job(parts[1])
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "report":
+            self._get_report(parts[1])
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "존재하지 않는 경로입니다.")
+
+    def _get_job(self, job_id):
+        job = self.server.job_manager.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"작업을 찾을 수 없습니다: {job_id}")
+            return
+        self._send(HTTPStatus.OK, job)
+
+    def _get_report(self, job_id):
+        job = self.server.job_manager.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"작업을 찾을 수 없습니다: {job_id}")
+        elif job["status"] in IN_FLIGHT_STATUSES:
+            self._send_error(HTTPStatus.CONFLICT, f"작업이 아직 끝나지 않았습니다 (상태: {job['status']})",
+                             headers={"Retry-After": "1"})
+        elif job["status"] != JOB_SUCCEEDED:
+            self._send_error(HTTPStatus.UNPROCESSABLE_ENTITY, f"평가에 실패한 작업입니다: {job['error']}")
+        else:
+            self._send(HTTPStatus.OK, job["result"]["final_report"], content_type="text/markdown; charset=utf-8")
+
+
+def create_server(job_manager, host="127.0.0.1", port=8000):
+    """
+    평가 작업 API 서버를 생성합니다.
+
+    요청은 스레드마다 처리되지만 평가 자체는 JobManager의 워커 풀에서만 실행되므로
+    동시 평가 수는 워커 수로 제한됩니다.
+
+    Args:
+        job_manager (JobManager): 작업 관리자
+        host (str): 바인딩할 주소
+        port (int): 바인딩할 포트
+
+    Returns:
+        ThreadingHTTPServer: 시작 전의 HTTP 서버
+    """
+    server = ThreadingHTTPServer((host, port), EvaluationRequestHandler)
+    server.daemon_threads = True
+    server.job_manager = job_manager
+    return server
@@ -0,0 +1,206 @@
+"""
+평가 작업 큐 및 워커 풀
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.ratelimit import PRIORITY_INTERACTIVE, request_priority
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+IN_FLIGHT_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class QueueFullError(RuntimeError):
+    """대기 중인 작업 수가 상한에 도달해 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+def make_job_key(service_description, options):
+    """
+    같은 요청을 식별하는 키를 생성합니다.
+
+    Args:
+        service_description (str): AI 서비스 설명
+        options (dict): 실행 옵션 (None 값은 무시)
+
+    Returns:
+        str: 요청 키
+    """
+    key_source = json.dumps(
+        {
+            "description": " ".join(service_description.split()),
+            "options": {key: value for key, value in options.items() if value is not None},
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+class JobManager:
+    """
+    평가 작업을 받아 제한된 수의 워커로 실행하는 작업 관리자
+
+    하나의 평가 엔진(검색 인덱스와 컴파일된 그래프)을 모든 작업이 공유합니다.
+    대기 중인 작업이 max_queue개를 넘으면 새 작업을 거절해 과부하를 막고,
+    진행 중인 작업과 같은 요청은 새로 실행하지 않고 기존 작업을 돌려줍니다.
+    """
+
+    def __init__(self, evaluator, max_workers=4, max_queue=100, max_finished=1000):
+        """
+        Args:
+            evaluator (EthicsEvaluator): 평가 엔진
+            max_workers (int): 동시에 실행할 최대 평가 수
+            max_queue (int): 실행을 기다릴 수 있는 최대 작업 수
+            max_finished (int): 결과를 보관할 완료 작업 수 (오래된 순으로 삭제)
+        """
+        self.evaluator = evaluator
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ethics-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+        self._queued = 0
+        self._running = 0
+        self._deduplicated = 0
+        self._rejected = 0
+
+    def submit(self, service_description, priority=PRIORITY_INTERACTIVE, **options):
+        """
+        평가 작업을 등록합니다.
+
+        Args:
+            service_description (str): AI 서비스 설명
+            priority (str): API 호출 우선순위 ("interactive" 또는 "batch")
+            **options: evaluator.evaluate()에 전달할 실행 옵션 (예: risk_mode, report_mode)
+
+        Returns:
+            tuple: (작업 정보 딕셔너리, 새로 등록되었는지 여부)
+
+        Raises:
+            QueueFullError: 대기 중인 작업이 상한에 도달한 경우
+        """
+        key = make_job_key(service_description, options)
+        with self._lock:
+            job_id = self._in_flight.get(key)
+            if job_id is not None:
+                self._deduplicated += 1
+                return self._snapshot(self._jobs[job_id]), False
+
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(f"대기 중인 작업이 {self.max_queue}개에 도달했습니다.")
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "key": key,
+                "status": JOB_QUEUED,
+                "service_description": service_description,
+                "options": {k: v for k, v in options.items() if v is not None},
+                "priority": priority,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["job_id"]] = job
+            self._in_flight[key] = job["job_id"]
+            self._queued += 1
+
+        self._executor.submit(self._run, job["job_id"])
+        logger.info(f"평가 작업 등록: {job['job_id']}")
+        return self._snapshot(job), True
+
+    def _run(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = JOB_RUNNING
+            job["started_at"] = time.time()
+            self._queued -= 1
+            self._running += 1
+
+        try:
+            with request_priority(job["priority"]):
+                result = self.evaluator.evaluate(job["service_description"], **job["options"])
+            if not result.get("final_report"):
+                raise RuntimeError("워크플로우가 보고서를 생성하지 못하고 종료되었습니다.")
+            status, error = JOB_SUCCEEDED, None
+        except Exception as e:
+            logger.error(f"평가 작업 {job_id} 실패: {str(e)}")
+            result, status, error = None, JOB_FAILED, str(e)
+
+        with self._lock:
+            job.update(status=status, result=result, error=error, finished_at=time.time())
+            self._running -= 1
+            self._in_flight.pop(job["key"], None)
+            self._evict_finished()
+        logger.info(f"평가 작업 종료: {job_id} ({status})")
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] not in IN_FLIGHT_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _snapshot(job):
+        snapshot = {key: value for key, value in job.items() if key not in ("key", "service_description")}
+        if job["started_at"] is not None:
+            end = job["finished_at"] or time.time()
+            snapshot["elapsed_seconds"] = round(end - job["started_at"], 3)
+        return snapshot
+
+    def get(self, job_id):
+        """
+        작업 상태와 결과를 조회합니다.
+
+        Args:
+            job_id (str): 작업 ID
+
+        Returns:
+            dict | None: 작업 정보. 없으면 None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job is not None else None
+
+    def stats(self):
+        """
+        큐 상태 통계를 반환합니다.
+
+        Returns:
+            dict: 대기/실행 중 작업 수, 보관 중 작업 수, 중복 병합/거절 횟수
+        """
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "stored_jobs": len(self._jobs),
+                "deduplicated": self._deduplicated,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait=True):
+        """
+        새 작업을 더 받지 않고 워커를 종료합니다.
+
+        Args:
+            wait (bool): 실행 중인 작업이 끝날 때까지 기다릴지 여부
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
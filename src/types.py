@@ -1,12 +1,22 @@
-from typing import TypedDict, List, Dict, Optional, Any
+import operator
+from typing import Annotated, TypedDict, List, Dict, Optional, Any
 
 class GraphState(TypedDict):
-    """워크플로우 그래프 상태 정의"""
+    """
+    워크플로우 그래프 상태 정의
+
+    노드는 바뀐 키만 담은 상태 변경분을 반환합니다. messages 채널은 덧붙이기 전용
+    리듀서(operator.add)를 사용하므로 노드는 새 메시지만 리스트로 반환합니다.
+    """
     service_description: str  # 초기 서비스 설명
     context: Optional[str]  # 검색 결과 컨텍스트
     service_info: Optional[Dict[str, Any]]  # 서비스 분석 결과
+    ethics_context: Optional[str]  # 리스크 평가용 가이드라인 검색 결과
+    category_contexts: Optional[Dict[str, str]]  # 항목별 리스크 평가 모드의 가이드라인 검색 결과
     risk_assessment: Optional[Dict[str, Any]]  # 리스크 평가 결과
+    best_practices_context: Optional[str]  # 개선안용 모범 사례 검색 결과
+    guidelines_context: Optional[str]  # 개선안용 가이드라인 검색 결과
     improvement_suggestions: Optional[Dict[str, Any]]  # 개선 제안
     final_report: Optional[str]  # 최종 보고서
-    messages: List  # 메시지 기록
+    messages: Annotated[List, operator.add]  # 메시지 기록 (덧붙이기 전용)
     next: str  # 다음 단계 지정자
\ No newline at end of file
@@ -1,7 +1,20 @@
 """
 workflow 패키지 초기화
+
+공개 이름은 처음 접근할 때 하위 모듈에서 불러옵니다 (src.lazy 참고).
 """
 
-from src.workflow.graph import evaluate_ai_service_ethics, build_workflow
+from src.lazy import lazy_exports
 
-__all__ = ['evaluate_ai_service_ethics', 'build_workflow']
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'evaluate_ai_service_ethics': 'engine',
+    'evaluate_ai_service_ethics_async': 'engine',
+    'build_workflow': 'graph',
+    'create_checkpointer': 'checkpoint',
+    'make_thread_id': 'checkpoint',
+    'NodeOutputCache': 'memo',
+    'get_node_cache': 'memo',
+    'set_node_cache': 'memo',
+    'EthicsEvaluator': 'engine',
+    'get_default_evaluator': 'engine'
+})
@@ -0,0 +1,117 @@
+"""
+배치 평가 모듈
+"""
+
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.ratelimit import PRIORITY_BATCH, request_priority
+from src.workflow.engine import get_default_evaluator
+
+logger = logging.getLogger(__name__)
+
+# 서비스 설명으로 인식하는 필드 이름
+DESCRIPTION_FIELDS = ("description", "service_description")
+
+
+def load_service_descriptions(path):
+    """
+    JSONL 또는 CSV 파일에서 평가할 서비스 설명 목록을 읽습니다.
+
+    JSONL은 한 줄에 하나의 JSON 객체(description 필드) 또는 문자열을,
+    CSV는 description 열을 가져야 합니다. id, service_name 필드는 선택입니다.
+
+    Args:
+        path (str): 입력 파일 경로 (.jsonl, .json, .csv)
+
+    Returns:
+        list: {"id", "service_name", "description"} 딕셔너리 목록
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    elif extension in (".jsonl", ".json"):
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    rows.append(json.loads(line))
+    else:
+        raise ValueError(f"지원하지 않는 배치 입력 형식입니다: {path} (jsonl 또는 csv)")
+
+    items = []
+    for index, row in enumerate(rows):
+        if isinstance(row, str):
+            row = {"description": row}
+        description = next((row[field] for field in DESCRIPTION_FIELDS if row.get(field)), None)
+        if not description:
+            logger.warning(f"{index + 1}번째 항목에 서비스 설명이 없어 건너뜁니다.")
+            continue
+        items.append({
+            "id": str(row.get("id") or index + 1),
+            "service_name": row.get("service_name"),
+            "description": description
+        })
+
+    logger.info(f"배치 입력 {len(items)}건 로드: {path}")
+    return items
+
+
+def _evaluate_item(evaluator, item, options):
+    start = time.perf_counter()
+    try:
+        # 배치 평가의 API 호출은 대화형 평가보다 뒤로 양보
+        with request_priority(PRIORITY_BATCH):
+            result = evaluator.evaluate(item["description"], **options)
+        if not result.get("final_report"):
+            raise RuntimeError("워크플로우가 보고서를 생성하지 못하고 종료되었습니다.")
+        error = None
+    except Exception as e:
+        logger.error(f"배치 항목 {item['id']} 평가 실패: {str(e)}")
+        result, error = None, str(e)
+
+    return {
+        **item,
+        "result": result,
+        "error": error,
+        "latency": time.perf_counter() - start
+    }
+
+
+def run_batch(items, evaluator=None, max_concurrency=4, on_complete=None, **options):
+    """
+    여러 서비스 설명을 동시에 평가합니다.
+
+    개별 항목의 실패는 결과의 error 필드에 기록되며 배치 전체를 중단하지 않습니다.
+
+    Args:
+        items (list): load_service_descriptions()가 반환한 항목 목록
+        evaluator (EthicsEvaluator, optional): 사용할 평가 엔진. 없으면 기본 엔진을 사용합니다.
+        max_concurrency (int): 동시에 실행할 최대 평가 수
+        on_complete (callable, optional): 항목이 끝날 때마다 결과 딕셔너리로 호출되는 콜백
+        **options: 항목마다 evaluator.evaluate()에 전달할 실행 옵션 (예: risk_mode)
+
+    Returns:
+        list: 입력 순서대로 정렬된 항목별 결과 목록
+    """
+    evaluator = evaluator or get_default_evaluator()
+    results = [None] * len(items)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = {
+            executor.submit(_evaluate_item, evaluator, item, options): index
+            for index, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            item_result = future.result()
+            results[futures[future]] = item_result
+            if on_complete is not None:
+                on_complete(item_result)
+
+    return results
@@ -0,0 +1,244 @@
+"""
+워크플로우 체크포인트 저장소
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+
+from langgraph.checkpoint.base import CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.cache import LRUCache
+from src.server.jobs import make_job_key
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 체크포인트 DB 경로
+DEFAULT_CHECKPOINT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "checkpoints.sqlite"
+)
+
+# 덧붙이기 전용 리스트 채널의 마지막 저장 위치를 기억할 최대 스레드 수
+LIST_HEAD_THREADS = 1024
+
+# 저장된 값이 없는 채널 (None도 채널 값이므로 구분)
+_MISSING = object()
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """
+    채널별 증분 저장과 비동기 메서드를 지원하는 SQLite 체크포인트 저장소
+
+    SqliteSaver는 스텝마다 전체 상태(channel_values)를 체크포인트 행 하나에 직렬화하므로
+    메시지 기록이 길어질수록 스텝당 저장 크기가 커집니다. 이 저장소는 채널 값을
+    (채널, 버전) 단위로 checkpoint_blobs 테이블에 따로 저장하고, 해당 스텝에서 버전이
+    바뀐 채널만 씁니다. messages처럼 덧붙이기 전용 리스트 채널은 직전에 저장한 버전 뒤에
+    붙은 항목만 저장하고 읽을 때 이어 붙입니다.
+
+    SqliteSaver는 동기 메서드만 제공하므로 ainvoke()/astream()에서도 같은 DB를 쓸 수 있도록
+    비동기 메서드를 스레드에서 동기 메서드로 실행합니다.
+    """
+
+    def __init__(self, conn, *, serde=None):
+        super().__init__(conn, serde=serde)
+        # thread_id -> {(checkpoint_ns, channel): (버전, 길이, 마지막 항목)}
+        self._list_heads = LRUCache(max_entries=LIST_HEAD_THREADS)
+
+    def setup(self):
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                channel TEXT NOT NULL,
+                version TEXT NOT NULL,
+                base_version TEXT,
+                type TEXT NOT NULL,
+                blob BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+            );
+            """
+        )
+
+    def _dump_channel(self, heads, key, version, value):
+        # (base_version, type, blob): base_version이 있으면 blob은 그 버전 뒤에 붙은 항목만 담음
+        # 직전에 저장한 리스트의 마지막 항목이 같은 위치에 그대로 있으면 덧붙이기로 판단
+        head = heads.pop(key, None)
+        if not isinstance(value, list):
+            return (None, *self.serde.dumps_typed(value))
+        if value:
+            heads[key] = (version, len(value), value[-1])
+        if head is not None and head[1] <= len(value) and value[head[1] - 1] is head[2]:
+            return (head[0], *self.serde.dumps_typed(value[head[1]:]))
+        return (None, *self.serde.dumps_typed(value))
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values = checkpoint["channel_values"]
+        heads = self._list_heads.get(thread_id)
+        if heads is None:
+            heads = {}
+            self._list_heads.set(thread_id, heads)
+        rows = []
+        for channel, version in new_versions.items():
+            key = (checkpoint_ns, channel)
+            if channel in values:
+                base_version, type_, blob = self._dump_channel(heads, key, str(version), values[channel])
+            else:
+                heads.pop(key, None)
+                base_version, type_, blob = None, "empty", None
+            rows.append((thread_id, checkpoint_ns, channel, str(version), base_version, type_, blob))
+        with self.cursor() as cur:
+            cur.executemany(
+                "INSERT OR REPLACE INTO checkpoint_blobs "
+                "(thread_id, checkpoint_ns, channel, version, base_version, type, blob) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return super().put(config, {**checkpoint, "channel_values": {}}, metadata, new_versions)
+
+    def _load_channel(self, cur, thread_id, checkpoint_ns, channel, version):
+        # base_version을 따라가며 조각을 모은 뒤 오래된 것부터 이어 붙임
+        parts = []
+        while version is not None:
+            cur.execute(
+                "SELECT base_version, type, blob FROM checkpoint_blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version)
+            )
+            row = cur.fetchone()
+            if row is None or row[1] == "empty":
+                return _MISSING
+            version, type_, blob = row
+            parts.append(self.serde.loads_typed((type_, blob)))
+        value = parts.pop()
+        while parts:
+            value.extend(parts.pop())
+        return value
+
+    def _with_channel_values(self, item):
+        # 채널 값을 체크포인트 행에 저장하던 기존 DB의 항목은 그대로 반환
+        if item is None or item.checkpoint["channel_values"]:
+            return item
+        thread_id = str(item.config["configurable"]["thread_id"])
+        checkpoint_ns = item.config["configurable"].get("checkpoint_ns", "")
+        values = {}
+        with self.cursor(transaction=False) as cur:
+            for channel, version in item.checkpoint["channel_versions"].items():
+                value = self._load_channel(cur, thread_id, checkpoint_ns, channel, str(version))
+                if value is not _MISSING:
+                    values[channel] = value
+        return CheckpointTuple(
+            item.config,
+            {**item.checkpoint, "channel_values": values},
+            item.metadata,
+            item.parent_config,
+            item.pending_writes
+        )
+
+    def get_tuple(self, config):
+        return self._with_channel_values(super().get_tuple(config))
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        # SqliteSaver.list()는 순회하는 동안 잠금을 쥐고 있으므로 목록을 먼저 받은 뒤 채널 값을 채움
+        items = list(super().list(config, filter=filter, before=before, limit=limit))
+        for item in items:
+            yield self._with_channel_values(item)
+
+    def delete_thread(self, thread_id):
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM checkpoint_blobs WHERE thread_id = ?", (str(thread_id),))
+        self._list_heads.pop(str(thread_id))
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(path=None):
+    """
+    환경 변수 설정에 따라 체크포인트 저장소를 생성합니다.
+
+    CHECKPOINT=sqlite(기본값)이면 CHECKPOINT_PATH의 SQLite 파일에 저장해 프로세스가
+    종료되어도 미완료 실행을 이어서 실행할 수 있고, memory이면 프로세스 메모리에만 저장합니다.
+
+    Args:
+        path (str, optional): SQLite 파일 경로. 지정하면 환경 변수보다 우선합니다.
+
+    Returns:
+        BaseCheckpointSaver: 체크포인트 저장소
+    """
+    mode = os.getenv("CHECKPOINT", "sqlite").lower()
+    if path is None and mode in ("memory", "off", "false", "0", "none"):
+        return MemorySaver()
+
+    path = path or os.getenv("CHECKPOINT_PATH") or DEFAULT_CHECKPOINT_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    saver = ThreadedSqliteSaver(conn)
+    saver.setup()
+    logger.info(f"체크포인트 저장소: {path}")
+    return saver
+
+
+def make_thread_id(service_description, options):
+    """
+    입력과 실행 옵션으로 안정적인 스레드 ID를 생성합니다.
+
+    같은 서비스 설명(공백 정규화)과 옵션으로 다시 실행하면 같은 ID가 만들어지므로
+    중단된 실행의 체크포인트를 찾아 이어서 실행할 수 있습니다. 서버 작업 큐의 중복 요청 키
+    (make_job_key)를 그대로 줄여 쓰므로 같은 요청은 항상 같은 체크포인트로 이어집니다.
+
+    Args:
+        service_description (str): AI 서비스 설명
+        options (dict): 실행 옵션 (None 값은 무시)
+
+    Returns:
+        str: 스레드 ID
+    """
+    return make_job_key(service_description, options)[:32]
+
+
+def list_thread_ids(checkpointer):
+    """
+    체크포인트 저장소에 남아 있는 스레드 ID를 최근 갱신 순으로 반환합니다.
+
+    Args:
+        checkpointer (BaseCheckpointSaver): 체크포인트 저장소
+
+    Returns:
+        list: 스레드 ID 목록
+    """
+    updated_at = {}
+    for item in checkpointer.list(None):
+        thread_id = item.config["configurable"]["thread_id"]
+        updated_at[thread_id] = max(updated_at.get(thread_id, ""), item.checkpoint["ts"])
+    return sorted(updated_at, key=updated_at.get, reverse=True)
@@ -0,0 +1,400 @@
+"""
+AI 윤리 평가 엔진 모듈
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from langchain_core.runnables import RunnableConfig
+from langchain_teddynote.messages import random_uuid
+
+from src.llm import get_chat_model
+from src.metrics import collect_run_metrics, get_metrics_registry
+from src.nodes.analysis import ANALYSIS_MODEL
+from src.nodes.improvement import IMPROVEMENT_MODEL
+from src.nodes.report import REPORT_MODEL
+from src.nodes.risk import RISK_MODEL
+from src.nodes.routing import routed_models
+from src.search import get_search_tool
+from src.retrieval import setup_pdf_retrieval
+from src.workflow.checkpoint import create_checkpointer, make_thread_id, list_thread_ids
+from src.workflow.graph import build_workflow
+
+logger = logging.getLogger(__name__)
+
+# fixed 라우팅 정책에서 노드가 사용하는 모델
+FIXED_NODE_MODELS = (ANALYSIS_MODEL, RISK_MODEL, IMPROVEMENT_MODEL, REPORT_MODEL)
+
+
+def workflow_models():
+    """
+    노드에서 사용하는 LLM 모델 목록을 반환합니다.
+
+    fixed 정책의 노드 모델과 cascade 정책의 빠른/강한 모델(FAST_MODEL, STRONG_MODEL 설정)을 합칩니다.
+
+    Returns:
+        tuple: 중복 없는 모델 이름 목록
+    """
+    return tuple(dict.fromkeys(FIXED_NODE_MODELS + routed_models()))
+
+
+class EthicsEvaluator:
+    """
+    AI 윤리 평가 엔진
+
+    PDF 검색기, LLM/검색 클라이언트, 컴파일된 워크플로우를 한 번만 생성해 두고
+    evaluate() 호출마다 그래프 실행만 수행합니다.
+
+    실행마다 서비스 설명과 옵션으로 만든 안정적인 스레드 ID로 체크포인트를 저장합니다.
+    실행이 중간에 실패하면 체크포인트가 남아, 같은 입력으로 다시 실행하거나 resume()을
+    호출하면 마지막으로 완료된 노드 다음부터 이어서 실행합니다. 정상 종료된 실행의
+    체크포인트는 삭제합니다.
+    """
+
+    def __init__(self, pdf_path=None, checkpointer=None):
+        """
+        Args:
+            pdf_path (str | list, optional): AI 윤리 가이드라인 PDF 파일, 디렉토리 또는 이들의 목록
+            checkpointer (BaseCheckpointSaver, optional): 체크포인트 저장소.
+                                                          없으면 환경 변수 설정(CHECKPOINT)으로 생성합니다.
+        """
+        # PDF 검색 설정
+        logger.info("PDF 검색 설정 초기화 중...")
+        self.pdf_retriever, self.pdf_chain, self.vectorstore = setup_pdf_retrieval(pdf_path)
+
+        # LLM 및 검색 클라이언트 준비 (커넥션 풀 공유)
+        self.llms = {model: get_chat_model(model) for model in workflow_models()}
+        self.search_tool = get_search_tool()
+
+        # 워크플로우 구성
+        logger.info("워크플로우 구성 중...")
+        self.app, self.initial_state = build_workflow(
+            self.pdf_retriever,
+            self.pdf_chain,
+            checkpointer=checkpointer or create_checkpointer()
+        )
+
+        self._active_threads = set()
+        self._active_lock = threading.Lock()
+
+    @staticmethod
+    def _make_config(thread_id, options):
+        # None이 아닌 실행 옵션은 노드에 configurable로 전달하고, 재개할 때 쓰도록 체크포인트 메타데이터에도 기록
+        configurable = dict(options)
+        configurable["thread_id"] = thread_id
+        # 체크포인트 메타데이터에는 스칼라 값만 저장되므로 JSON 문자열로 기록
+        return RunnableConfig(recursion_limit=10, configurable=configurable,
+                              metadata={"run_options": json.dumps(options, sort_keys=True)})
+
+    @staticmethod
+    def _run_options(snapshot):
+        return json.loads(snapshot.metadata.get("run_options") or "{}")
+
+    def _acquire_thread(self, thread_id):
+        with self._active_lock:
+            if thread_id in self._active_threads:
+                # 같은 입력이 이미 실행 중이면 체크포인트가 섞이지 않도록 별도 스레드 사용
+                thread_id = f"{thread_id}-{random_uuid()}"
+            self._active_threads.add(thread_id)
+        return thread_id
+
+    def _prepare_run(self, service_description, **options):
+        options = {key: value for key, value in options.items() if value is not None}
+        thread_id = self._acquire_thread(make_thread_id(service_description, options))
+        config = self._make_config(thread_id, options)
+
+        # 입력값 설정
+        state = self.initial_state.copy()
+        state["service_description"] = service_description
+        return state, config
+
+    @staticmethod
+    def _select_input(state, config, snapshot):
+        # 같은 스레드에 미완료 체크포인트가 있으면 입력 없이 실행해 이어서 진행
+        if snapshot.next:
+            logger.info(f"중단된 실행을 이어서 진행합니다: {config['configurable']['thread_id']} "
+                        f"(다음 노드: {', '.join(snapshot.next)})")
+            return None
+        return state
+
+    def _finish_run(self, config, completed):
+        thread_id = config["configurable"]["thread_id"]
+        if completed:
+            # 정상 종료된 실행의 체크포인트는 정리
+            self.app.checkpointer.delete_thread(thread_id)
+        else:
+            logger.warning(f"평가가 중단되었습니다. 체크포인트가 보존되어 이어서 실행할 수 있습니다: {thread_id}")
+        with self._active_lock:
+            self._active_threads.discard(thread_id)
+
+    async def _afinish_run(self, config, completed):
+        thread_id = config["configurable"]["thread_id"]
+        if completed:
+            await self.app.checkpointer.adelete_thread(thread_id)
+        else:
+            logger.warning(f"평가가 중단되었습니다. 체크포인트가 보존되어 이어서 실행할 수 있습니다: {thread_id}")
+        with self._active_lock:
+            self._active_threads.discard(thread_id)
+
+    @staticmethod
+    def _build_output(result, run_metrics):
+        metrics = run_metrics.to_dict()
+        get_metrics_registry().observe(metrics)
+        return {
+            "service_info": result.get("service_info"),
+            "risk_assessment": result.get("risk_assessment"),
+            "improvement_suggestions": result.get("improvement_suggestions"),
+            "final_report": result.get("final_report"),
+            "metrics": metrics
+        }
+
+    @staticmethod
+    def _to_events(mode, chunk):
+        if mode == "custom":
+            if "report_token" in chunk:
+                yield {"type": "token", "text": chunk["report_token"]}
+            return
+        for node, update in chunk.items():
+            if not node.startswith("__"):
+                yield {"type": "node", "node": node, "update": update}
+
+    def _run(self, state, config):
+        completed = False
+        try:
+            state = self._select_input(state, config, self.app.get_state(config))
+            with collect_run_metrics() as run_metrics:
+                result = self.app.invoke(state, config=config)
+            completed = True
+        finally:
+            self._finish_run(config, completed)
+        logger.info("평가 완료!")
+
+        return self._build_output(result, run_metrics)
+
+    async def _arun(self, state, config):
+        completed = False
+        try:
+            state = self._select_input(state, config, await self.app.aget_state(config))
+            with collect_run_metrics() as run_metrics:
+                result = await self.app.ainvoke(state, config=config)
+            completed = True
+        finally:
+            await self._afinish_run(config, completed)
+        logger.info("평가 완료!")
+
+        return self._build_output(result, run_metrics)
+
+    def evaluate(self, service_description: str, risk_mode=None, report_mode=None, model_routing=None):
+        """
+        AI 서비스의 윤리적 평가를 수행하고 보고서를 생성합니다.
+
+        같은 입력으로 중단된 실행이 있으면 처음부터 다시 실행하지 않고 이어서 실행합니다.
+
+        Args:
+            service_description (str): AI 서비스에 대한 설명
+            risk_mode (str, optional): 리스크 평가 모드 (combined 또는 per_category).
+                                       None이면 환경 변수 RISK_MODE 또는 combined를 사용합니다.
+            report_mode (str, optional): 보고서 생성 모드 (llm 또는 template)
+            model_routing (str, optional): 모델 라우팅 정책 (cascade 또는 fixed).
+                                           None이면 환경 변수 MODEL_ROUTING 또는 cascade를 사용합니다.
+
+        Returns:
+            Dict: 서비스 분석, 리스크 평가, 개선안, 최종 보고서, 노드별 실행 지표(metrics)를 포함한 결과
+        """
+        state, config = self._prepare_run(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                          model_routing=model_routing)
+
+        # 워크플로우 실행
+        logger.info("AI 서비스 윤리 평가 시작...")
+        return self._run(state, config)
+
+    async def aevaluate(self, service_description: str, risk_mode=None, report_mode=None, model_routing=None):
+        """
+        evaluate()의 비동기 버전입니다.
+
+        하나의 이벤트 루프에서 여러 평가를 동시에 실행할 수 있으며,
+        모든 평가가 같은 검색기와 클라이언트를 공유합니다.
+
+        Args:
+            service_description (str): AI 서비스에 대한 설명
+            risk_mode (str, optional): 리스크 평가 모드 (combined 또는 per_category)
+            report_mode (str, optional): 보고서 생성 모드 (llm 또는 template)
+            model_routing (str, optional): 모델 라우팅 정책 (cascade 또는 fixed).
+                                           None이면 환경 변수 MODEL_ROUTING 또는 cascade를 사용합니다.
+
+        Returns:
+            Dict: 서비스 분석, 리스크 평가, 개선안, 최종 보고서, 노드별 실행 지표(metrics)를 포함한 결과
+        """
+        state, config = self._prepare_run(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                          model_routing=model_routing)
+
+        # 워크플로우 실행
+        logger.info("AI 서비스 윤리 평가 시작...")
+        return await self._arun(state, config)
+
+    def resume(self, thread_id):
+        """
+        중단된 실행을 스레드 ID로 찾아 이어서 실행합니다.
+
+        Args:
+            thread_id (str): list_incomplete_runs()가 반환한 스레드 ID
+
+        Returns:
+            Dict: evaluate()와 같은 결과
+
+        Raises:
+            ValueError: 이어서 실행할 체크포인트가 없는 경우
+        """
+        snapshot = self.app.get_state({"configurable": {"thread_id": thread_id}})
+        if not snapshot.next:
+            raise ValueError(f"이어서 실행할 미완료 실행이 없습니다: {thread_id}")
+
+        config = self._make_config(self._acquire_thread(thread_id), self._run_options(snapshot))
+        if config["configurable"]["thread_id"] != thread_id:
+            self._finish_run(config, completed=True)
+            raise ValueError(f"이미 실행 중인 스레드입니다: {thread_id}")
+
+        logger.info("AI 서비스 윤리 평가 재개...")
+        return self._run(None, config)
+
+    def list_incomplete_runs(self):
+        """
+        체크포인트 저장소에 남아 있는 미완료 실행 목록을 반환합니다.
+
+        Returns:
+            list: {"thread_id", "next", "updated_at", "service_description", "options"} 목록 (최근 순)
+        """
+        runs = []
+        for thread_id in list_thread_ids(self.app.checkpointer):
+            snapshot = self.app.get_state({"configurable": {"thread_id": thread_id}})
+            if not snapshot.next:
+                continue
+            runs.append({
+                "thread_id": thread_id,
+                "next": list(snapshot.next),
+                "updated_at": snapshot.created_at,
+                "service_description": snapshot.values.get("service_description"),
+                "options": self._run_options(snapshot)
+            })
+        return runs
+
+    def stream(self, service_description: str, risk_mode=None, report_mode=None, model_routing=None):
+        """
+        평가를 실행하면서 진행 상황을 이벤트로 전달합니다.
+
+        노드가 끝날 때마다 해당 노드의 결과를, 보고서 생성 중에는 토큰을 바로 전달하므로
+        전체 평가가 끝나기 전에 중간 결과를 보여줄 수 있습니다.
+
+        Args:
+            service_description (str): AI 서비스에 대한 설명
+            risk_mode (str, optional): 리스크 평가 모드 (combined 또는 per_category)
+            report_mode (str, optional): 보고서 생성 모드 (llm 또는 template)
+            model_routing (str, optional): 모델 라우팅 정책 (cascade 또는 fixed).
+                                           None이면 환경 변수 MODEL_ROUTING 또는 cascade를 사용합니다.
+
+        Yields:
+            dict: {"type": "node", "node": 노드 이름, "update": 노드가 갱신한 상태},
+                  {"type": "token", "text": 보고서 토큰},
+                  마지막으로 {"type": "result", "result": evaluate()와 같은 결과}
+        """
+        state, config = self._prepare_run(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                          model_routing=model_routing)
+
+        # 워크플로우 실행 (노드 결과와 보고서 토큰을 함께 스트리밍)
+        logger.info("AI 서비스 윤리 평가 시작...")
+        completed = False
+        try:
+            state = self._select_input(state, config, self.app.get_state(config))
+            with collect_run_metrics() as run_metrics:
+                for mode, chunk in self.app.stream(state, config=config, stream_mode=["updates", "custom"]):
+                    yield from self._to_events(mode, chunk)
+            result = self.app.get_state(config).values
+            completed = True
+        finally:
+            self._finish_run(config, completed)
+        logger.info("평가 완료!")
+
+        yield {"type": "result", "result": self._build_output(result, run_metrics)}
+
+    async def astream(self, service_description: str, risk_mode=None, report_mode=None, model_routing=None):
+        """
+        stream()의 비동기 버전입니다.
+        """
+        state, config = self._prepare_run(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                          model_routing=model_routing)
+
+        # 워크플로우 실행 (노드 결과와 보고서 토큰을 함께 스트리밍)
+        logger.info("AI 서비스 윤리 평가 시작...")
+        completed = False
+        try:
+            state = self._select_input(state, config, await self.app.aget_state(config))
+            with collect_run_metrics() as run_metrics:
+                async for mode, chunk in self.app.astream(state, config=config, stream_mode=["updates", "custom"]):
+                    for event in self._to_events(mode, chunk):
+                        yield event
+            result = (await self.app.aget_state(config)).values
+            completed = True
+        finally:
+            await self._afinish_run(config, completed)
+        logger.info("평가 완료!")
+
+        yield {"type": "result", "result": self._build_output(result, run_metrics)}
+
+
+_default_evaluator = None
+_default_evaluator_lock = threading.Lock()
+
+
+def get_default_evaluator():
+    """
+    프로세스 전체에서 공유되는 기본 평가 엔진을 반환합니다.
+
+    Returns:
+        EthicsEvaluator: 최초 호출 시 생성된 평가 엔진
+    """
+    global _default_evaluator
+    with _default_evaluator_lock:
+        if _default_evaluator is None:
+            _default_evaluator = EthicsEvaluator()
+        return _default_evaluator
+
+
+def evaluate_ai_service_ethics(service_description: str, risk_mode=None, report_mode=None, model_routing=None):
+    """
+    AI 서비스의 윤리적 평가를 수행하고 보고서를 생성합니다.
+
+    기본 평가 엔진을 재사용하므로 PDF 인덱스와 워크플로우는 최초 호출 시에만 구성됩니다.
+    
+    Args:
+        service_description (str): AI 서비스에 대한 설명
+        risk_mode (str, optional): 리스크 평가 모드 (combined 또는 per_category)
+        report_mode (str, optional): 보고서 생성 모드 (llm 또는 template)
+        model_routing (str, optional): 모델 라우팅 정책 (cascade 또는 fixed)
+    
+    Returns:
+        Dict: 서비스 분석, 리스크 평가, 개선안, 최종 보고서를 포함한 결과
+    """
+    return get_default_evaluator().evaluate(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                            model_routing=model_routing)
+
+
+async def evaluate_ai_service_ethics_async(service_description: str, risk_mode=None, report_mode=None,
+                                           model_routing=None):
+    """
+    evaluate_ai_service_ethics()의 비동기 버전입니다.
+
+    기본 평가 엔진 생성(PDF 인덱스 로드)은 블로킹 작업이므로 스레드에서 수행합니다.
+
+    Args:
+        service_description (str): AI 서비스에 대한 설명
+        risk_mode (str, optional): 리스크 평가 모드 (combined 또는 per_category)
+        report_mode (str, optional): 보고서 생성 모드 (llm 또는 template)
+        model_routing (str, optional): 모델 라우팅 정책 (cascade 또는 fixed)
+
+    Returns:
+        Dict: 서비스 분석, 리스크 평가, 개선안, 최종 보고서를 포함한 결과
+    """
+    evaluator = await asyncio.to_thread(get_default_evaluator)
+    return await evaluator.aevaluate(service_description, risk_mode=risk_mode, report_mode=report_mode,
+                                     model_routing=model_routing)
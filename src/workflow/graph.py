@@ -3,19 +3,32 @@
 """
 
 import logging
-from langchain_core.runnables import RunnableConfig
+from functools import partial
+from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables.utils import accepts_config
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_teddynote.messages import random_uuid
 
+from src.metrics import node_scope
+from src.workflow.memo import memoized, amemoized
 from src.types import GraphState
-from src.retrieval import setup_pdf_retrieval
 from src.nodes import (
     search_service_info,
     analyze_service,
+    retrieve_risk_guidelines,
     assess_risks,
+    search_best_practices,
+    retrieve_improvement_guidelines,
     suggest_improvements,
-    generate_report
+    generate_report,
+    search_service_info_async,
+    analyze_service_async,
+    retrieve_risk_guidelines_async,
+    assess_risks_async,
+    search_best_practices_async,
+    retrieve_improvement_guidelines_async,
+    suggest_improvements_async,
+    generate_report_async
 )
 
 logger = logging.getLogger(__name__)
@@ -32,13 +45,65 @@ def router(state: GraphState):
     """
     return state["next"]
 
-def build_workflow(pdf_retriever, pdf_chain):
+# 개선안 제안 전에 병렬로 실행되는 검색 노드
+IMPROVEMENT_CONTEXT_NODES = ["search_best_practices", "retrieve_improvement_guidelines"]
+
+def improvement_fan_out(state: GraphState):
+    """
+    리스크 평가가 끝나면 개선안용 웹 검색과 PDF 검색을 동시에 시작합니다.
+
+    Args:
+        state (GraphState): 현재 그래프 상태
+
+    Returns:
+        list | str: 병렬 실행할 노드 이름 목록 또는 "end"
+    """
+    if state["next"] == "suggest_improvements":
+        return IMPROVEMENT_CONTEXT_NODES
+    return "end"
+
+def _node(name, func, afunc, **kwargs):
+    """
+    동기/비동기 구현을 모두 가진 노드를 생성합니다.
+
+    app.invoke()는 func를, app.ainvoke()는 afunc를 실행합니다.
+    실행 구간은 node_scope()로 감싸 노드별 지표를 기록하며, 입력 지문이 같은 이전 실행이
+    있으면 노드를 실행하지 않고 저장된 출력을 재사용합니다 (src.workflow.memo 참고).
+    """
+    func = partial(func, **kwargs)
+    afunc = partial(afunc, **kwargs)
+    pass_config = accepts_config(func)
+
+    call = memoized(name, lambda state, config: func(state, config=config) if pass_config else func(state))
+    acall = amemoized(name, lambda state, config: afunc(state, config=config) if pass_config else afunc(state))
+
+    def run(state, config):
+        with node_scope(name):
+            return call(state, config)
+
+    async def arun(state, config):
+        with node_scope(name):
+            return await acall(state, config)
+
+    return RunnableLambda(run, afunc=arun, name=name)
+
+def _add_node(workflow, name, func, afunc, **kwargs):
+    workflow.add_node(name, _node(name, func, afunc, **kwargs))
+
+def build_workflow(pdf_retriever, pdf_chain, checkpointer=None):
     """
     AI 윤리 평가 워크플로우 그래프를 구성합니다.
+
+    서로 의존하지 않는 검색 단계(모범 사례 웹 검색, 가이드라인 PDF 검색)는
+    병렬 노드로 분리되어 LLM 호출 노드 앞에서 합류합니다.
+
+    각 노드는 동기/비동기 구현을 모두 가지므로 컴파일된 앱은 invoke()와
+    ainvoke() 양쪽에서 사용할 수 있습니다.
     
     Args:
         pdf_retriever: PDF 문서 검색기
         pdf_chain: PDF 처리 체인
+        checkpointer (BaseCheckpointSaver, optional): 체크포인트 저장소. 없으면 MemorySaver를 사용합니다.
     
     Returns:
         tuple: (app, initial_state) 워크플로우 앱과 초기 상태
@@ -48,7 +113,11 @@ def build_workflow(pdf_retriever, pdf_chain):
         service_description="",
         context=None,
         service_info=None,
+        ethics_context=None,
+        category_contexts=None,
         risk_assessment=None,
+        best_practices_context=None,
+        guidelines_context=None,
         improvement_suggestions=None,
         final_report=None,
         messages=[],
@@ -59,11 +128,16 @@ def build_workflow(pdf_retriever, pdf_chain):
     workflow = StateGraph(GraphState)
 
     # 노드 추가
-    workflow.add_node("search_service_info", search_service_info)
-    workflow.add_node("analyze_service", analyze_service)
-    workflow.add_node("assess_risks", lambda state: assess_risks(state, pdf_retriever, pdf_chain))
-    workflow.add_node("suggest_improvements", lambda state: suggest_improvements(state, pdf_retriever))
-    workflow.add_node("generate_report", generate_report)
+    _add_node(workflow, "search_service_info", search_service_info, search_service_info_async)
+    _add_node(workflow, "analyze_service", analyze_service, analyze_service_async)
+    _add_node(workflow, "retrieve_risk_guidelines", retrieve_risk_guidelines, retrieve_risk_guidelines_async,
+              pdf_retriever=pdf_retriever)
+    _add_node(workflow, "assess_risks", assess_risks, assess_risks_async)
+    _add_node(workflow, "search_best_practices", search_best_practices, search_best_practices_async)
+    _add_node(workflow, "retrieve_improvement_guidelines", retrieve_improvement_guidelines,
+              retrieve_improvement_guidelines_async, pdf_retriever=pdf_retriever)
+    _add_node(workflow, "suggest_improvements", suggest_improvements, suggest_improvements_async)
+    _add_node(workflow, "generate_report", generate_report, generate_report_async)
 
     # 엣지 정의
     workflow.add_conditional_edges(
@@ -79,20 +153,26 @@ def build_workflow(pdf_retriever, pdf_chain):
         "analyze_service",
         router,
         {
-            "assess_risks": "assess_risks",
+            "assess_risks": "retrieve_risk_guidelines",
             "end": END
         }
     )
 
+    workflow.add_edge("retrieve_risk_guidelines", "assess_risks")
+
+    # 개선안용 검색은 병렬로 실행한 뒤 suggest_improvements에서 합류
     workflow.add_conditional_edges(
         "assess_risks",
-        router,
+        improvement_fan_out,
         {
-            "suggest_improvements": "suggest_improvements",
+            "search_best_practices": "search_best_practices",
+            "retrieve_improvement_guidelines": "retrieve_improvement_guidelines",
             "end": END
         }
     )
 
+    workflow.add_edge(IMPROVEMENT_CONTEXT_NODES, "suggest_improvements")
+
     workflow.add_conditional_edges(
         "suggest_improvements",
         router,
@@ -113,48 +193,7 @@ def build_workflow(pdf_retriever, pdf_chain):
     # 엔트리 포인트 설정
     workflow.set_entry_point("search_service_info")
 
-    # 메모리 설정 및 컴파일
-    memory = MemorySaver()
-    app = workflow.compile(checkpointer=memory)
+    # 체크포인트 저장소 설정 및 컴파일
+    app = workflow.compile(checkpointer=checkpointer or MemorySaver())
 
     return app, initial_state
-
-def evaluate_ai_service_ethics(service_description: str):
-    """
-    AI 서비스의 윤리적 평가를 수행하고 보고서를 생성합니다.
-    
-    Args:
-        service_description (str): AI 서비스에 대한 설명
-    
-    Returns:
-        Dict: 서비스 분석, 리스크 평가, 개선안, 최종 보고서를 포함한 결과
-    """
-    # PDF 검색 설정
-    logger.info("PDF 검색 설정 초기화 중...")
-    pdf_retriever, pdf_chain, _ = setup_pdf_retrieval()
-
-    # 워크플로우 구성
-    logger.info("워크플로우 구성 중...")
-    app, initial_state = build_workflow(pdf_retriever, pdf_chain)
-
-    # 상태 초기화
-    config = RunnableConfig(recursion_limit=10, configurable={"thread_id": random_uuid()})
-
-    # 입력값 설정
-    state = initial_state.copy()
-    state["service_description"] = service_description
-
-    # 워크플로우 실행
-    logger.info("AI 서비스 윤리 평가 시작...")
-    result = app.invoke(state, config=config)
-    logger.info("평가 완료!")
-
-    # 결과 반환
-    output = {
-        "service_info": result.get("service_info"),
-        "risk_assessment": result.get("risk_assessment"),
-        "improvement_suggestions": result.get("improvement_suggestions"),
-        "final_report": result.get("final_report")
-    }
-
-    return output
\ No newline at end of file
@@ -0,0 +1,392 @@
+"""
+노드 단위 메모이제이션
+
+각 노드가 실제로 읽는 상태 필드, 실행 옵션, 노드 구현(프롬프트와 모델 상수를 포함한
+모듈 소스) 버전, 모델 백엔드로 입력 지문을 만들고, 같은 지문으로 이미 실행한 적이 있으면 저장된
+출력을 그대로 재사용합니다. 앞 노드를 다시 실행하더라도 출력이 같으면 뒤 노드의 지문도
+같으므로, 실제로 바뀐 입력의 하류 노드만 다시 실행됩니다.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+from src.cache import LRUCache, SQLiteStore
+from src.llm import get_model_backend
+from src.metrics import record_node_cache
+from src.nodes.risk import is_degraded_assessment
+from src.nodes.routing import ROUTING_OPTIONS
+from src.nodes.utils import get_node_stream_writer, get_run_option
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 기준 기본 캐시 파일
+DEFAULT_NODE_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache",
+    "node_cache.sqlite"
+)
+
+# 저장 형식이 바뀌면 올려서 기존 항목을 무효화
+NODE_CACHE_VERSION = 2
+
+# 노드 캐시 상태 (실행 지표의 cache 필드)
+CACHE_REUSED = "reused"
+CACHE_RECOMPUTED = "recomputed"
+
+
+@dataclass(frozen=True)
+class NodeMemoSpec:
+    """
+    노드 하나의 메모이제이션 설정
+
+    Attributes:
+        fields (tuple): 노드가 읽는 상태 필드
+        modules (tuple): 노드 구현 모듈. 소스가 바뀌면(프롬프트, 모델, 파싱 로직) 저장된 출력을 쓰지 않습니다.
+        options (tuple): 노드가 읽는 실행 옵션 (이름, 기본값) 목록
+        stream_field (str, optional): 재사용할 때 custom 스트림으로 다시 보낼 필드 (보고서 토큰)
+        degraded (callable, optional): 노드 출력이 일부 실패한 결과인지 확인하는 함수.
+                                       True를 반환하면 다음 실행에서 다시 시도하도록 저장하지 않습니다.
+    """
+    fields: tuple
+    modules: tuple
+    options: tuple = ()
+    stream_field: str = None
+    degraded: Callable = None
+
+
+# 메모이제이션하는 LLM 노드. 로컬 인덱스만 읽는 PDF 검색 노드는 충분히 빠르고 검색기 상태에
+# 의존하므로 매번 실행합니다. 웹 검색 노드도 매번 실행해 검색 캐시의 유효 시간(SEARCH_CACHE_TTL)을
+# 따르게 하며, 검색 결과가 같으면 하류 노드의 지문도 같으므로 재사용됩니다.
+NODE_MEMO_SPECS = {
+    "analyze_service": NodeMemoSpec(
+        fields=("service_description", "context"),
+        modules=("src.nodes.analysis", "src.nodes.routing"),
+        options=ROUTING_OPTIONS
+    ),
+    "assess_risks": NodeMemoSpec(
+        fields=("service_info", "ethics_context", "category_contexts"),
+        modules=("src.nodes.risk", "src.nodes.routing"),
+        options=(("risk_mode", "combined"),) + ROUTING_OPTIONS,
+        degraded=is_degraded_assessment
+    ),
+    "suggest_improvements": NodeMemoSpec(
+        fields=("service_info", "risk_assessment", "best_practices_context", "guidelines_context"),
+        modules=("src.nodes.improvement", "src.nodes.routing"),
+        options=ROUTING_OPTIONS
+    ),
+    "generate_report": NodeMemoSpec(
+        fields=("service_info", "risk_assessment", "improvement_suggestions"),
+        modules=("src.nodes.report", "src.nodes.report_template", "src.nodes.routing"),
+        options=(("report_mode", "llm"),) + ROUTING_OPTIONS,
+        stream_field="final_report"
+    ),
+}
+
+
+_version_lock = threading.Lock()
+_versions = {}
+
+
+def _module_version(module_name):
+    with _version_lock:
+        if module_name not in _versions:
+            path = importlib.import_module(module_name).__file__
+            with open(path, "rb") as f:
+                _versions[module_name] = hashlib.sha256(f.read()).hexdigest()
+        return _versions[module_name]
+
+
+def compute_fingerprint(name, spec, state, config=None):
+    """
+    노드 입력 지문을 계산합니다.
+
+    Args:
+        name (str): 노드 이름
+        spec (NodeMemoSpec): 노드 메모이제이션 설정
+        state (GraphState): 노드 입력 상태
+        config (RunnableConfig, optional): 실행 설정 (옵션 값을 읽음)
+
+    Returns:
+        str: 입력 지문 (SHA-256 16진 문자열)
+    """
+    payload = {
+        "node": name,
+        "cache_version": NODE_CACHE_VERSION,
+        # 가짜 백엔드로 만든 출력을 실제 실행에서 재사용하지 않도록 백엔드를 구분
+        "backend": get_model_backend(),
+        "modules": {module: _module_version(module) for module in spec.modules},
+        "fields": {field: state.get(field) for field in spec.fields},
+        "options": {option: get_run_option(config, option, default) for option, default in spec.options}
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def encode_output(output):
+    """
+    노드 출력(상태 변경분)을 직렬화합니다.
+
+    노드는 바뀐 키만 반환하고 messages에는 새로 덧붙일 메시지만 담으므로 그대로 저장합니다.
+
+    Args:
+        output (dict): 노드 출력
+
+    Returns:
+        str: JSON 문자열
+    """
+    updates = {key: value for key, value in output.items() if key != "messages"}
+    if "messages" in output:
+        updates["messages"] = messages_to_dict(output["messages"])
+    return json.dumps(updates, ensure_ascii=False)
+
+
+def decode_output(content):
+    """
+    저장된 노드 출력(상태 변경분)을 복원합니다.
+
+    Args:
+        content (str): encode_output()으로 저장한 JSON 문자열
+
+    Returns:
+        dict: 노드 출력
+    """
+    output = json.loads(content)
+    if "messages" in output:
+        output["messages"] = messages_from_dict(output["messages"])
+    return output
+
+
+def is_cacheable(output, spec=None):
+    """
+    노드 출력을 저장해도 되는지 확인합니다.
+
+    검색 실패나 JSON 파싱 실패처럼 오류로 워크플로우를 끝내는 출력은 일시적인 실패일 수
+    있으므로 저장하지 않습니다. 보고서 노드는 정상 종료도 next가 "end"이므로 보고서가
+    있으면 저장합니다. 워크플로우는 계속되더라도 노드가 일부 실패한 결과로 판단한 출력
+    (예: 429로 평가하지 못한 리스크 항목이 있는 평가)도 저장하지 않습니다.
+
+    Args:
+        output (dict): 노드 출력
+        spec (NodeMemoSpec, optional): 노드 메모이제이션 설정
+
+    Returns:
+        bool: 저장 가능 여부
+    """
+    if output.get("next") == "end" and not output.get("final_report"):
+        return False
+    return spec is None or spec.degraded is None or not spec.degraded(output)
+
+
+class NodeOutputCache:
+    """
+    노드 입력 지문을 키로 하는 노드 출력 캐시
+
+    LLM 응답 캐시와 같은 구조로 메모리 LRU 계층을 먼저 조회하고, 없으면 SQLite
+    영속 계층을 조회합니다. 유효 시간은 두 계층에 모두 적용됩니다.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None, max_entries=None,
+                 memory_entries=256, persistent=True):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+            ttl_seconds (float, optional): 항목 유효 시간(초)
+            max_entries (int, optional): 영속 계층 최대 항목 수
+            memory_entries (int): 메모리 계층 최대 항목 수
+            persistent (bool): SQLite 영속 계층 사용 여부
+        """
+        self.memory = LRUCache(memory_entries, ttl_seconds=ttl_seconds)
+        self.store = SQLiteStore(
+            path or DEFAULT_NODE_CACHE_PATH,
+            table="node_outputs",
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries
+        ) if persistent else None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def get(self, fingerprint):
+        """
+        저장된 노드 출력을 반환합니다.
+
+        Args:
+            fingerprint (str): 노드 입력 지문
+
+        Returns:
+            str | None: encode_output()으로 저장한 출력. 없으면 None
+        """
+        content = self.memory.get(fingerprint)
+        if content is None and self.store is not None:
+            entry = self.store.get_entry(fingerprint)
+            if entry is not None:
+                content, expires_at = entry
+                self.memory.set(fingerprint, content, expires_at=expires_at)
+        self._count("hits" if content is not None else "misses")
+        return content
+
+    def set(self, fingerprint, content):
+        """
+        노드 출력을 저장합니다.
+
+        Args:
+            fingerprint (str): 노드 입력 지문
+            content (str): encode_output()으로 직렬화한 출력
+        """
+        self.memory.set(fingerprint, content)
+        if self.store is not None:
+            self.store.set(fingerprint, content)
+        self._count("writes")
+
+    def stats(self):
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            dict: 적중 수, 미스 수, 저장 수, 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+_cache_lock = threading.Lock()
+_cache = None
+_cache_configured = False
+
+
+def _create_cache_from_env():
+    mode = os.getenv("NODE_CACHE", "sqlite").lower()
+    if mode in ("off", "false", "0", "none"):
+        return None
+
+    ttl = os.getenv("NODE_CACHE_TTL")
+    max_entries = os.getenv("NODE_CACHE_MAX_ENTRIES")
+    return NodeOutputCache(
+        path=os.getenv("NODE_CACHE_PATH"),
+        ttl_seconds=float(ttl) if ttl else None,
+        max_entries=int(max_entries) if max_entries else None,
+        persistent=mode != "memory"
+    )
+
+
+def get_node_cache():
+    """
+    프로세스 전체에서 공유되는 노드 출력 캐시를 반환합니다.
+
+    환경 변수 NODE_CACHE(sqlite/memory/off), NODE_CACHE_PATH, NODE_CACHE_TTL,
+    NODE_CACHE_MAX_ENTRIES로 설정합니다.
+
+    Returns:
+        NodeOutputCache | None: 캐시. 비활성화된 경우 None
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            _cache = _create_cache_from_env()
+            _cache_configured = True
+        return _cache
+
+
+def set_node_cache(cache):
+    """
+    노드 출력 캐시를 교체합니다.
+
+    Args:
+        cache (NodeOutputCache | None): 사용할 캐시. None이면 메모이제이션을 끕니다.
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def _lookup(name, state, config):
+    spec = NODE_MEMO_SPECS.get(name)
+    cache = get_node_cache() if spec is not None else None
+    if cache is None:
+        return None, None, None
+
+    fingerprint = compute_fingerprint(name, spec, state, config)
+    content = cache.get(fingerprint)
+    if content is None:
+        record_node_cache(CACHE_RECOMPUTED, fingerprint)
+        return cache, fingerprint, None
+
+    logger.info(f"{name}: 입력이 바뀌지 않아 저장된 출력을 재사용합니다 ({fingerprint[:12]})")
+    record_node_cache(CACHE_REUSED, fingerprint)
+    output = decode_output(content)
+    if spec.stream_field and output.get(spec.stream_field):
+        # 스트리밍 실행에서도 재사용한 보고서가 출력되도록 한 번에 전달
+        writer = get_node_stream_writer()
+        if writer is not None:
+            writer({"report_token": output[spec.stream_field]})
+    return cache, fingerprint, output
+
+
+def _store(name, cache, fingerprint, output):
+    if cache is None:
+        return
+    if is_cacheable(output, NODE_MEMO_SPECS[name]):
+        cache.set(fingerprint, encode_output(output))
+    else:
+        logger.info(f"{name}: 일부 실패한 출력이므로 저장하지 않습니다 ({fingerprint[:12]})")
+
+
+def memoized(name, run):
+    """
+    노드 함수를 입력 지문 기반 메모이제이션으로 감쌉니다.
+
+    NODE_MEMO_SPECS에 없는 노드나 캐시가 꺼진 경우에는 그대로 실행합니다.
+
+    Args:
+        name (str): 노드 이름
+        run (callable): (state, config)를 받는 노드 함수
+
+    Returns:
+        callable: 같은 시그니처의 노드 함수
+    """
+    def wrapper(state, config):
+        cache, fingerprint, output = _lookup(name, state, config)
+        if output is not None:
+            return output
+        output = run(state, config)
+        _store(name, cache, fingerprint, output)
+        return output
+
+    return wrapper
+
+
+def amemoized(name, arun):
+    """
+    memoized()의 비동기 버전입니다.
+
+    Args:
+        name (str): 노드 이름
+        arun (callable): (state, config)를 받는 비동기 노드 함수
+
+    Returns:
+        callable: 같은 시그니처의 비동기 노드 함수
+    """
+    async def wrapper(state, config):
+        cache, fingerprint, output = _lookup(name, state, config)
+        if output is not None:
+            return output
+        output = await arun(state, config)
+        _store(name, cache, fingerprint, output)
+        return output
+
+    return wrapper
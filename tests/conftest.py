@@ -0,0 +1,33 @@
+"""
+테스트 공용 설정
+
+프로젝트 루트를 모듈 경로에 추가하고, 테스트마다 디스크 캐시와 체크포인트 파일을
+임시 디렉토리로 분리합니다. 모든 테스트는 결정적 가짜 백엔드(src/fakes.py)로 네트워크 없이 실행됩니다.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 경로를 바꿀 캐시/체크포인트 환경 변수
+CACHE_PATH_VARIABLES = (
+    "LLM_CACHE_PATH",
+    "NODE_CACHE_PATH",
+    "SEARCH_CACHE_PATH",
+    "EMBEDDING_CACHE_PATH",
+    "CHECKPOINT_PATH",
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_paths(tmp_path, monkeypatch):
+    """테스트마다 캐시 파일과 인덱스 캐시 디렉토리를 임시 디렉토리로 분리합니다."""
+    for name in CACHE_PATH_VARIABLES:
+        monkeypatch.setenv(name, str(tmp_path / f"{name.lower()}.sqlite"))
+    monkeypatch.setenv("INDEX_CACHE_DIR", str(tmp_path / "index"))
+    return tmp_path
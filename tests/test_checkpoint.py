@@ -0,0 +1,135 @@
+"""
+체크포인트 재개와 증분 저장 테스트
+"""
+
+from typing import Any
+
+import pytest
+
+from src.fakes import FakeChatModel, FakeEmbeddings, use_fake_backends
+from src.llm import set_llm_cache, set_model_factories
+from src.search import set_search_tool
+from src.workflow import EthicsEvaluator
+from src.server import make_job_key
+from src.workflow.checkpoint import create_checkpointer, make_thread_id
+
+DESCRIPTION = "ZestAI는 금융 기관을 위한 AI 기반 신용 평가 서비스입니다."
+
+# 프롬프트 제목 -> 노드 (src.fakes.fake_response와 같은 구분)
+PROMPT_KINDS = (("분석 에이전트", "analysis"), ("리스크 진단", "risk"), ("개선안 제안", "improvement"))
+
+
+def _prompt_kind(prompt):
+    return next((kind for marker, kind in PROMPT_KINDS if marker in prompt), "report")
+
+
+class FlakyChatModel(FakeChatModel):
+    """호출된 노드를 기록하고, 지정한 노드의 호출을 실패시키는 가짜 채팅 모델"""
+
+    # 테스트가 넘긴 객체를 그대로 공유하도록 Any로 선언 (pydantic이 list/set 필드는 복사함)
+    calls: Any = None
+    fail_on: Any = None
+
+    def _record(self, messages):
+        kind = _prompt_kind(self._prompt_text(messages))
+        self.calls.append(kind)
+        if kind in self.fail_on:
+            raise RuntimeError(f"{kind} 노드 호출 실패")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._record(messages)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # 보고서 노드는 스트리밍으로 호출함
+        self._record(messages)
+        yield from super()._stream(messages, stop, run_manager, **kwargs)
+
+
+@pytest.fixture
+def flaky_run(isolated_cache_paths):
+    """(평가 엔진, 호출된 노드 목록, 실패시킬 노드 집합)을 반환합니다."""
+    calls, fail_on = [], set()
+    use_fake_backends()
+    set_model_factories(
+        chat_model_factory=lambda model, temperature: FlakyChatModel(
+            model_name=model, temperature=temperature, calls=calls, fail_on=fail_on
+        ),
+        embeddings_factory=lambda model: FakeEmbeddings(size=64),
+        backend="flaky"
+    )
+    set_llm_cache(None)
+    checkpointer = create_checkpointer(str(isolated_cache_paths / "checkpoints.sqlite"))
+    yield EthicsEvaluator(checkpointer=checkpointer), calls, fail_on
+    checkpointer.conn.close()
+    set_model_factories()
+    set_search_tool(None)
+
+
+def test_failed_run_resumes_after_last_completed_node(flaky_run):
+    evaluator, calls, fail_on = flaky_run
+    fail_on.add("improvement")
+    with pytest.raises(RuntimeError):
+        evaluator.evaluate(DESCRIPTION, report_mode="llm")
+
+    runs = evaluator.list_incomplete_runs()
+    assert [run["next"] for run in runs] == [["suggest_improvements"]]
+
+    fail_on.clear()
+    calls.clear()
+    result = evaluator.evaluate(DESCRIPTION, report_mode="llm")
+
+    # 완료된 분석과 리스크 평가는 다시 호출하지 않음
+    assert calls == ["improvement", "report"]
+    assert result["service_info"] and result["risk_assessment"] and result["final_report"]
+    assert evaluator.list_incomplete_runs() == []
+
+
+def test_resume_by_thread_id_keeps_run_options(flaky_run):
+    evaluator, calls, fail_on = flaky_run
+    fail_on.add("report")
+    with pytest.raises(RuntimeError):
+        evaluator.evaluate(DESCRIPTION, report_mode="llm")
+
+    run, = evaluator.list_incomplete_runs()
+    assert run["options"] == {"report_mode": "llm"}
+
+    fail_on.clear()
+    calls.clear()
+    result = evaluator.resume(run["thread_id"])
+
+    assert calls == ["report"]
+    assert result["final_report"]
+    with pytest.raises(ValueError):
+        evaluator.resume(run["thread_id"])
+
+
+def test_message_history_is_stored_incrementally(flaky_run):
+    evaluator, _, fail_on = flaky_run
+    fail_on.add("report")
+    with pytest.raises(RuntimeError):
+        evaluator.evaluate(DESCRIPTION, report_mode="llm")
+
+    run, = evaluator.list_incomplete_runs()
+    saver = evaluator.app.checkpointer
+    rows = saver.conn.execute(
+        "SELECT base_version, type, blob FROM checkpoint_blobs WHERE thread_id = ? AND channel = 'messages' "
+        "ORDER BY version",
+        (run["thread_id"],)
+    ).fetchall()
+    messages = evaluator.app.get_state({"configurable": {"thread_id": run["thread_id"]}}).values["messages"]
+
+    # 스텝마다 새로 붙은 메시지만 저장하고, 읽을 때 이어 붙여 전체 기록을 복원
+    assert len(messages) > 1
+    assert any(base_version is not None for base_version, _, _ in rows)
+    assert sum(len(saver.serde.loads_typed((type_, blob))) for _, type_, blob in rows) == len(messages)
+
+
+def test_thread_id_follows_job_key():
+    options = {"risk_mode": "per_category", "report_mode": None}
+
+    thread_id = make_thread_id(DESCRIPTION, options)
+
+    # 같은 요청은 작업 큐의 중복 키와 체크포인트 스레드가 항상 함께 일치함
+    assert make_job_key(DESCRIPTION, options).startswith(thread_id)
+    assert make_thread_id("  " + DESCRIPTION.replace(" ", "\n"), {"risk_mode": "per_category"}) == thread_id
@@ -0,0 +1,111 @@
+"""
+BM25 색인과 하이브리드(RRF) 검색 테스트
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.retrieval.bm25 import BM25Index, tokenize
+from src.retrieval.hybrid import (RETRIEVAL_MODE_HYBRID, RETRIEVAL_MODE_LEXICAL, HybridRetriever,
+                                  reciprocal_rank_fusion)
+
+TEXTS = (
+    "공정성 평가는 인구 집단별 차별 여부를 확인합니다.",
+    "프라이버시 보호를 위해 개인정보 수집을 최소화합니다.",
+    "투명성 확보를 위해 모델 의사결정 근거를 공개합니다. 투명성 보고서",
+    "안전성 검증과 책임성 체계를 함께 운영합니다.",
+)
+
+
+def _documents():
+    return [Document(page_content=text, metadata={"source": "guide.pdf", "page": page})
+            for page, text in enumerate(TEXTS)]
+
+
+def _reference_scores(documents, query, k1=1.5, b=0.75):
+    # 색인을 쓰지 않고 BM25 정의대로 계산한 점수
+    doc_tokens = [Counter(tokenize(document.page_content)) for document in documents]
+    lengths = [sum(counts.values()) for counts in doc_tokens]
+    avg_length = sum(lengths) / len(lengths)
+    scores = []
+    for counts, length in zip(doc_tokens, lengths):
+        score = 0.0
+        for token in tokenize(query):
+            df = sum(1 for other in doc_tokens if token in other)
+            tf = counts.get(token, 0)
+            if tf:
+                idf = math.log1p((len(documents) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+        scores.append(score)
+    return scores
+
+
+class StubVectorStore:
+    """정해진 순서의 문서를 반환하는 벡터 저장소"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def similarity_search(self, query, k=4):
+        return self.documents[:k]
+
+
+def test_tokenize_splits_korean_words_into_syllable_bigrams():
+    assert tokenize("공정성은 AI 2024") == ["공정", "정성", "성은", "ai", "2024"]
+    assert tokenize("수 X") == ["수", "x"]
+
+
+@pytest.mark.parametrize("query", ["투명성 보고서", "개인정보 보호", "책임성 투명성", "없는단어"])
+def test_scores_match_bm25_definition(query):
+    documents = _documents()
+    index = BM25Index.from_documents(documents)
+
+    np.testing.assert_allclose(index.score(query), _reference_scores(documents, query), rtol=1e-5)
+
+
+def test_search_ranks_matching_documents_and_drops_zero_scores():
+    index = BM25Index.from_documents(_documents())
+
+    results = index.search("투명성", k=3)
+
+    assert [document.metadata["page"] for document, _ in results] == [2]
+    assert index.search("없는단어") == []
+
+
+def test_arrays_round_trip_keeps_scores():
+    documents = _documents()
+    index = BM25Index.from_documents(documents)
+    arrays = index.to_arrays()
+
+    restored = BM25Index.from_arrays(arrays, documents)
+
+    np.testing.assert_allclose(restored.score("공정성 차별"), index.score("공정성 차별"))
+    assert BM25Index.from_arrays({**arrays, "tokenizer_version": np.array(0)}, documents) is None
+
+
+def test_rrf_prefers_documents_found_by_both_searches():
+    first, second, third = _documents()[:3]
+    # 같은 청크라도 벡터 저장소와 BM25 색인은 서로 다른 Document 객체를 반환함
+    copy_of_second = Document(page_content=second.page_content, metadata=dict(second.metadata))
+
+    fused = reciprocal_rank_fusion([[first, second], [third, copy_of_second]], k=3)
+
+    assert fused[0] is second
+    assert fused[1:] == [first, third]
+    assert reciprocal_rank_fusion([[first, second], [third]], k=1) == [first]
+
+
+def test_hybrid_retriever_fuses_lexical_and_vector_results():
+    documents = _documents()
+    index = BM25Index.from_documents(documents)
+    vectorstore = StubVectorStore([documents[3], documents[2]])
+
+    hybrid = HybridRetriever(vectorstore=vectorstore, bm25_index=index, mode=RETRIEVAL_MODE_HYBRID, k=2)
+    lexical = HybridRetriever(bm25_index=index, mode=RETRIEVAL_MODE_LEXICAL, k=2)
+
+    assert [document.metadata["page"] for document in hybrid.invoke("투명성")] == [2, 3]
+    assert [document.metadata["page"] for document in lexical.invoke("투명성")] == [2]
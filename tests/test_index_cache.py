@@ -0,0 +1,58 @@
+"""
+PDF 인덱스 캐시 테스트
+"""
+
+from typing import Any, List
+
+import pytest
+
+from src.fakes import FakeChatModel, FakeEmbeddings
+from src.llm import set_model_factories
+from src.retrieval import set_query_embedding_cache, setup_pdf_retrieval
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    """색인 생성용 문서 임베딩 텍스트 수를 세는 가짜 임베딩"""
+
+    # 테스트가 넘긴 목록을 그대로 공유하도록 Any로 선언 (pydantic이 list 필드는 복사함)
+    embedded: Any = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embedded_texts():
+    """문서 임베딩 요청 텍스트가 쌓이는 목록을 반환합니다."""
+    embedded = []
+    set_model_factories(
+        chat_model_factory=lambda model, temperature: FakeChatModel(model_name=model, temperature=temperature),
+        embeddings_factory=lambda model: CountingEmbeddings(size=64, embedded=embedded),
+        backend="counting"
+    )
+    set_query_embedding_cache(None)
+    yield embedded
+    set_model_factories()
+
+
+def test_warm_index_is_loaded_without_re_embedding(embedded_texts):
+    _, _, cold = setup_pdf_retrieval(retrieval_mode="vector")
+    chunk_count = len(embedded_texts)
+    assert chunk_count == cold.index.ntotal > 0
+
+    retriever, _, warm = setup_pdf_retrieval(retrieval_mode="vector")
+    assert warm.index.ntotal == chunk_count
+    assert retriever.invoke("공정성 평가 기준")
+
+    # 캐시된 인덱스를 불러오고 검색해도 청크를 다시 임베딩하지 않음
+    assert len(embedded_texts) == chunk_count
+
+
+def test_index_is_rebuilt_for_different_chunking(embedded_texts):
+    setup_pdf_retrieval(retrieval_mode="vector")
+    chunk_count = len(embedded_texts)
+
+    setup_pdf_retrieval(retrieval_mode="vector", chunk_size=800)
+
+    assert len(embedded_texts) > chunk_count
@@ -0,0 +1,83 @@
+"""
+LLM 응답 캐시 테스트
+"""
+
+import time
+
+import pytest
+
+from src.fakes import FakeChatModel
+from src.llm import LLMResponseCache, invoke_llm, set_llm_cache
+from src.llm.cache import DEFAULT_LLM_CACHE_MAX_ENTRIES, DEFAULT_LLM_CACHE_TTL, _create_cache_from_env
+
+
+class CountingChatModel(FakeChatModel):
+    """호출 횟수를 세는 가짜 채팅 모델"""
+
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+class OtherChatModel(CountingChatModel):
+    """같은 모델 이름을 쓰는 다른 구현"""
+
+
+@pytest.fixture
+def memory_cache():
+    cache = LLMResponseCache(persistent=False)
+    set_llm_cache(cache)
+    yield cache
+    set_llm_cache(None)
+
+
+def test_env_cache_is_bounded_by_default(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_TTL", raising=False)
+    monkeypatch.delenv("LLM_CACHE_MAX_ENTRIES", raising=False)
+
+    cache = _create_cache_from_env()
+
+    # 설정하지 않아도 영속 계층이 무한히 커지지 않음
+    assert cache.store.ttl_seconds == DEFAULT_LLM_CACHE_TTL
+    assert cache.store.max_entries == DEFAULT_LLM_CACHE_MAX_ENTRIES
+    assert cache.memory.ttl_seconds == DEFAULT_LLM_CACHE_TTL
+
+
+def test_memory_tier_expires_after_ttl():
+    cache = LLMResponseCache(persistent=False, ttl_seconds=0.1)
+    cache.set("key", "응답")
+    assert cache.get("key") == "응답"
+
+    time.sleep(0.15)
+    assert cache.get("key") is None
+
+
+def test_promoted_entry_keeps_remaining_disk_lifetime(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    LLMResponseCache(path=path, ttl_seconds=0.3).set("key", "응답")
+    time.sleep(0.2)
+
+    # 새 프로세스처럼 빈 메모리 계층에서 디스크 항목을 올림
+    cache = LLMResponseCache(path=path, ttl_seconds=0.3)
+    assert cache.get("key") == "응답"
+    time.sleep(0.15)
+    assert cache.get("key") is None
+
+
+def test_same_prompt_is_served_from_cache(memory_cache):
+    llm = CountingChatModel(model_name="gpt-4")
+    first = invoke_llm(llm, "분석 에이전트 프롬프트")
+    second = invoke_llm(llm, "분석 에이전트 프롬프트")
+
+    assert llm.calls == 1
+    assert second.content == first.content
+
+
+def test_model_implementation_is_part_of_key(memory_cache):
+    invoke_llm(CountingChatModel(model_name="gpt-4"), "분석 에이전트 프롬프트")
+
+    other = OtherChatModel(model_name="gpt-4")
+    invoke_llm(other, "분석 에이전트 프롬프트")
+    assert other.calls == 1
@@ -0,0 +1,70 @@
+"""
+노드 출력 캐시(메모이제이션) 테스트
+"""
+
+import pytest
+
+from src.workflow import set_node_cache
+from src.workflow.memo import NodeOutputCache, memoized
+
+STATE = {"service_info": {"service_name": "서비스"}, "ethics_context": "컨텍스트", "category_contexts": None}
+
+
+def _assessment(*scores):
+    return {
+        "risk_assessment": {
+            "risk_assessments": [{"category": f"항목{index}", "score": score} for index, score in enumerate(scores)],
+            "overall_risk_score": 3.0,
+            "highest_risk_area": "항목0",
+            "summary": "요약"
+        },
+        "next": "suggest_improvements"
+    }
+
+
+@pytest.fixture
+def node_cache():
+    cache = NodeOutputCache(persistent=False)
+    set_node_cache(cache)
+    yield cache
+    set_node_cache(None)
+
+
+def _counting_node(output):
+    calls = []
+
+    def run(state, config):
+        calls.append(state)
+        return output
+
+    return memoized("assess_risks", run), calls
+
+
+def test_complete_assessment_is_reused(node_cache):
+    node, calls = _counting_node(_assessment(3, 4, 2))
+
+    node(STATE, None)
+    node(STATE, None)
+
+    assert len(calls) == 1
+    assert node_cache.stats()["writes"] == 1
+
+
+def test_assessment_with_failed_category_is_not_cached(node_cache):
+    # 429나 파싱 실패로 평가하지 못한 항목이 있으면 다음 실행에서 다시 평가
+    node, calls = _counting_node(_assessment(3, None, 2))
+
+    node(STATE, None)
+    node(STATE, None)
+
+    assert len(calls) == 2
+    assert node_cache.stats()["writes"] == 0
+
+
+def test_error_output_is_not_cached(node_cache):
+    node, calls = _counting_node({"messages": [], "next": "end"})
+
+    node(STATE, None)
+    node(STATE, None)
+
+    assert len(calls) == 2
@@ -0,0 +1,71 @@
+"""
+토큰 예산 컨텍스트 패커 테스트
+"""
+
+import pytest
+
+from src.llm.tokens import count_tokens
+from src.retrieval.packer import MIN_PARTIAL_TOKENS, pack_context
+
+SNIPPETS = [
+    "공정성 평가는 인구 집단별 차별 여부와 데이터 편향을 확인하는 절차입니다. " * 4,
+    "프라이버시 보호를 위해 개인정보 수집을 최소화하고 보관 기간을 제한합니다. " * 6,
+    "투명성 확보를 위해 모델 의사결정 근거를 사용자에게 공개합니다. " * 2,
+    "책임성 체계는 문제 발생 시 담당자와 구제 절차를 명확히 합니다. " * 8,
+]
+
+
+@pytest.mark.parametrize("budget", [20, 60, 150, 300, 10000])
+def test_packed_text_fits_token_budget(budget):
+    result = pack_context(SNIPPETS, budget, record=False)
+
+    assert count_tokens(result["text"]) <= budget
+    assert result["packed_tokens"] <= budget
+    assert result["packed"] + result["dropped"] == len(SNIPPETS)
+
+
+def test_token_accounting_covers_every_snippet():
+    total = sum(count_tokens(snippet) for snippet in SNIPPETS)
+
+    everything = pack_context(SNIPPETS, 10000, record=False)
+    assert everything["dropped_tokens"] == 0 and everything["packed"] == len(SNIPPETS)
+
+    partial = pack_context(SNIPPETS, 150, record=False)
+    assert partial["packed_tokens"] + partial["dropped_tokens"] == total
+
+
+def test_oversized_snippet_is_skipped_for_smaller_ones():
+    small = count_tokens(SNIPPETS[2])
+    budget = small + 1
+
+    result = pack_context(SNIPPETS, budget, allow_partial=False, record=False)
+
+    # 앞의 큰 조각은 건너뛰고 예산에 맞는 조각을 담으며, 원래 순서로 이어 붙임
+    assert result["text"] == SNIPPETS[2]
+    assert result["packed"] == 1
+
+
+def test_partial_snippet_fills_remaining_budget():
+    snippets = [SNIPPETS[0], SNIPPETS[3]]
+    budget = count_tokens(SNIPPETS[0]) + MIN_PARTIAL_TOKENS + 10
+
+    with_partial = pack_context(snippets, budget, record=False)
+    without_partial = pack_context(snippets, budget, allow_partial=False, record=False)
+
+    # 담지 못한 조각의 앞부분을 남은 예산만큼 담음
+    head = with_partial["text"].split("\n")[1]
+    assert head.endswith("…") and SNIPPETS[3].startswith(head[:-1])
+    assert count_tokens(with_partial["text"]) <= budget
+    assert with_partial["packed_tokens"] > without_partial["packed_tokens"]
+    assert not without_partial["text"].endswith("…")
+
+
+def test_contained_and_whitespace_duplicates_are_dropped():
+    base = SNIPPETS[2].strip()
+    snippets = [base, "  " + base.replace(" ", "\n"), base[:40], "", SNIPPETS[0]]
+
+    result = pack_context(snippets, 10000, record=False)
+
+    assert result["duplicates"] == 2
+    assert result["packed"] == 2
+    assert result["text"] == "\n".join([base, SNIPPETS[0]])
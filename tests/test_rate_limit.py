@@ -0,0 +1,134 @@
+"""
+API 호출 스케줄러 테스트 (우선순위 대기열, 429 공동 백오프)
+"""
+
+import asyncio
+import threading
+import time
+
+from src.fakes import FakeRateLimitError
+from src.ratelimit import (PRIORITY_BATCH, PRIORITY_INTERACTIVE, PROVIDER_OPENAI, RateLimitScheduler,
+                           request_priority)
+
+MODEL = "gpt-test"
+
+
+def _exhausted_scheduler():
+    # 버킷 크기 1, 0.1초마다 요청 하나가 채워지는 한도를 만들고 바로 비움
+    scheduler = RateLimitScheduler({MODEL: (600, None)}, burst_seconds=0.1)
+    scheduler.acquire(PROVIDER_OPENAI, MODEL)
+    return scheduler
+
+
+def test_interactive_calls_go_before_waiting_batch_calls():
+    scheduler = _exhausted_scheduler()
+    order = []
+
+    def worker(priority):
+        scheduler.acquire(PROVIDER_OPENAI, MODEL, priority=priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=worker, args=(PRIORITY_BATCH,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.02)
+    threads.append(threading.Thread(target=worker, args=(PRIORITY_INTERACTIVE,)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BATCH]
+
+
+def test_async_waiters_keep_priority_without_threads():
+    scheduler = _exhausted_scheduler()
+    order = []
+
+    async def worker(priority):
+        await scheduler.aacquire(PROVIDER_OPENAI, MODEL)
+        order.append(priority)
+
+    async def main():
+        with request_priority(PRIORITY_BATCH):
+            batch = [asyncio.create_task(worker(PRIORITY_BATCH)) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        threads = threading.active_count()
+        interactive = asyncio.create_task(worker(PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0.02)
+        # 기다리는 호출이 스레드를 점유하지 않음
+        assert threading.active_count() == threads
+        assert scheduler.stats()["waiting"] == 3
+        await asyncio.gather(*batch, interactive)
+
+    asyncio.run(main())
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BATCH]
+
+
+def test_rate_limit_error_pauses_every_caller_of_the_model():
+    scheduler = RateLimitScheduler(base_delay=0.2, max_delay=0.2)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise FakeRateLimitError("429")
+        return "ok"
+
+    results = []
+    caller = threading.Thread(target=lambda: results.append(scheduler.call(flaky, PROVIDER_OPENAI, MODEL)))
+    caller.start()
+    while scheduler.stats()["rate_limited"] == 0:
+        time.sleep(0.005)
+
+    # 같은 모델의 다른 호출도 백오프가 끝날 때까지 기다리고, 다른 모델은 바로 진행
+    assert scheduler.acquire(PROVIDER_OPENAI, MODEL) >= 0.05
+    assert scheduler.acquire(PROVIDER_OPENAI, "other-model") < 0.05
+    caller.join()
+
+    assert results == ["ok"]
+    assert attempts[1] - attempts[0] >= 0.1
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_async_waiter_wakes_when_pause_ends():
+    scheduler = RateLimitScheduler()
+    scheduler.pause(MODEL, 0.1)
+
+    waited = asyncio.run(scheduler.aacquire(PROVIDER_OPENAI, MODEL))
+
+    assert 0.08 <= waited < 0.5
+
+
+def test_waiting_call_does_not_block_other_models_of_the_provider():
+    # gpt-test에만 토큰 한도가 있으므로 같은 제공자(openai)의 다른 모델은 기다리지 않음
+    scheduler = RateLimitScheduler({MODEL: (None, 600)}, burst_seconds=1)
+    scheduler.acquire(PROVIDER_OPENAI, MODEL, tokens=10)
+    waiter = threading.Thread(target=scheduler.acquire, args=(PROVIDER_OPENAI, MODEL), kwargs={"tokens": 10})
+    waiter.start()
+    while scheduler.stats()["waiting"] == 0:
+        time.sleep(0.005)
+
+    assert scheduler.acquire(PROVIDER_OPENAI, "other-model") < 0.05
+    assert scheduler.try_acquire(PROVIDER_OPENAI, "other-model")
+    waiter.join()
+
+
+def test_shared_provider_limit_keeps_priority_order_across_models():
+    scheduler = RateLimitScheduler({PROVIDER_OPENAI: (600, None)}, burst_seconds=0.1)
+    scheduler.acquire(PROVIDER_OPENAI, MODEL)
+    order = []
+
+    def worker(model, priority):
+        scheduler.acquire(PROVIDER_OPENAI, model, priority=priority)
+        order.append(model)
+
+    batch = threading.Thread(target=worker, args=(MODEL, PRIORITY_BATCH))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=worker, args=("other-model", PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in (batch, interactive):
+        thread.join()
+
+    assert order == ["other-model", MODEL]
@@ -0,0 +1,86 @@
+"""
+리스크 평가 노드 테스트 (항목별 평가 병합과 실패 항목 처리)
+"""
+
+import pytest
+
+from src.fakes import FakeChatModel, FakeEmbeddings, use_fake_backends
+from src.llm import set_llm_cache, set_model_factories
+from src.nodes.risk import RISK_MODE_COMBINED, _get_risk_mode, merge_category_assessments
+from src.search import set_search_tool
+from src.workflow import EthicsEvaluator
+from src.workflow.checkpoint import create_checkpointer
+
+DESCRIPTION = "ZestAI는 금융 기관을 위한 AI 기반 신용 평가 서비스입니다."
+
+FAILING_CATEGORY = "투명성"
+
+
+class BrokenCategoryChatModel(FakeChatModel):
+    """한 리스크 항목의 평가 요청에만 JSON이 아닌 응답을 반환하는 가짜 채팅 모델"""
+
+    def _build_result(self, prompt):
+        result = super()._build_result(prompt)
+        if f"평가 대상 항목: {FAILING_CATEGORY}(" in prompt:
+            result.generations[0].message.content = "평가를 완료하지 못했습니다."
+        return result
+
+
+@pytest.fixture
+def evaluator(isolated_cache_paths):
+    use_fake_backends()
+    set_model_factories(
+        chat_model_factory=lambda model, temperature: BrokenCategoryChatModel(model_name=model,
+                                                                              temperature=temperature),
+        embeddings_factory=lambda model: FakeEmbeddings(size=64),
+        backend="broken-category"
+    )
+    set_llm_cache(None)
+    checkpointer = create_checkpointer(str(isolated_cache_paths / "checkpoints.sqlite"))
+    yield EthicsEvaluator(checkpointer=checkpointer)
+    checkpointer.conn.close()
+    set_model_factories()
+    set_search_tool(None)
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+
+def test_merge_excludes_failed_categories_from_scores():
+    merged = merge_category_assessments({
+        "공정성": _Response('{"score": 4, "rationale": "근거"}'),
+        "투명성": ValueError("429"),
+        "안전성": _Response('{"score": 2}'),
+    })
+
+    scores = {item["category"]: item["score"] for item in merged["risk_assessments"]}
+    assert scores == {"공정성": 4, "투명성": None, "안전성": 2}
+    assert merged["overall_risk_score"] == 3.0
+    assert merged["highest_risk_area"] == "공정성"
+    assert "투명성" in merged["summary"]
+
+
+def test_merge_fails_only_when_every_category_fails():
+    with pytest.raises(ValueError):
+        merge_category_assessments({"공정성": ValueError("429"), "투명성": _Response("JSON 아님")})
+
+
+@pytest.mark.parametrize("report_mode", ["template", "llm"])
+def test_failed_category_does_not_abort_evaluation(evaluator, report_mode):
+    result = evaluator.evaluate(DESCRIPTION, risk_mode="per_category", report_mode=report_mode)
+
+    scores = {item["category"]: item["score"] for item in result["risk_assessment"]["risk_assessments"]}
+    assert scores[FAILING_CATEGORY] is None
+    assert all(score is not None for category, score in scores.items() if category != FAILING_CATEGORY)
+    assert result["improvement_suggestions"]
+    assert result["final_report"]
+
+
+def test_unknown_risk_mode_falls_back_to_combined(monkeypatch, caplog):
+    monkeypatch.setenv("RISK_MODE", "unknown")
+
+    assert _get_risk_mode(None) == RISK_MODE_COMBINED
+    assert _get_risk_mode({"configurable": {"risk_mode": "bogus"}}) == RISK_MODE_COMBINED
+    assert "bogus" in caplog.text
@@ -0,0 +1,116 @@
+"""
+모델 캐스케이드 라우팅 테스트
+"""
+
+import json
+from typing import Any, Dict
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.fakes import FakeChatModel
+from src.llm import set_llm_cache, set_model_factories
+from src.nodes import analyze_service, assess_risks
+from src.workflow.engine import workflow_models
+
+CONFIG = {"configurable": {"model_routing": "cascade", "fast_model": "fast", "strong_model": "strong"}}
+
+NO_FLAGS = {"critical_decisions": False, "vulnerable_users": False}
+
+
+class ScriptedChatModel(FakeChatModel):
+    """모델 이름별로 정해진 응답을 반환하고 호출된 모델을 기록하는 가짜 채팅 모델"""
+
+    responses: Dict[str, str] = {}
+    # 테스트가 넘긴 목록을 그대로 공유하도록 Any로 선언 (pydantic이 list 필드는 복사함)
+    calls: Any = None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(self.model_name)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.responses[self.model_name]))])
+
+
+@pytest.fixture
+def scripted_models():
+    """fast/strong 모델 응답을 지정하고, 호출된 모델 이름 목록을 반환하는 함수를 제공합니다."""
+    calls = []
+
+    def use(fast, strong):
+        responses = {"fast": json.dumps(fast, ensure_ascii=False), "strong": json.dumps(strong, ensure_ascii=False)}
+        set_model_factories(
+            chat_model_factory=lambda model, temperature: ScriptedChatModel(
+                model_name=model, responses=responses, calls=calls
+            ),
+            backend="scripted"
+        )
+        return calls
+
+    set_llm_cache(None)
+    yield use
+    set_model_factories()
+
+
+def _analysis(service_name, risk_flags):
+    return {"service_name": service_name, "primary_function": "기능", "target_users": "사용자",
+            "risk_flags": risk_flags}
+
+
+def _assessment(scores):
+    return {
+        "risk_assessments": [{"category": f"항목{index}", "score": score} for index, score in enumerate(scores)],
+        "overall_risk_score": round(sum(scores) / len(scores), 1),
+        "highest_risk_area": "항목0",
+        "summary": "요약"
+    }
+
+
+def _risk_state():
+    return {"service_info": _analysis("서비스", NO_FLAGS), "ethics_context": "컨텍스트"}
+
+
+def test_analysis_escalates_on_fast_model_risk_flags(scripted_models):
+    calls = scripted_models(_analysis("빠른", {"critical_decisions": True}), _analysis("강한", NO_FLAGS))
+
+    update = analyze_service({"service_description": "설명", "context": ""}, CONFIG)
+
+    assert calls == ["fast", "strong"]
+    assert update["service_info"]["service_name"] == "강한"
+
+
+def test_analysis_keeps_fast_response_without_flags(scripted_models):
+    calls = scripted_models(_analysis("빠른", NO_FLAGS), _analysis("강한", NO_FLAGS))
+
+    update = analyze_service({"service_description": "설명", "context": ""}, CONFIG)
+
+    assert calls == ["fast"]
+    assert update["service_info"]["service_name"] == "빠른"
+
+
+def test_combined_assessment_ignores_single_borderline_category(scripted_models):
+    # 항목 하나가 3~4점이어도 전체 점수가 경계에서 멀면 다시 평가하지 않음
+    calls = scripted_models(_assessment([3, 4, 2, 1, 2]), _assessment([5, 5, 5, 5, 5]))
+
+    update = assess_risks(_risk_state(), CONFIG)
+
+    assert calls == ["fast"]
+    assert update["risk_assessment"]["overall_risk_score"] == 2.4
+
+
+def test_combined_assessment_escalates_near_high_threshold(scripted_models):
+    calls = scripted_models(_assessment([4, 4, 4, 4, 3]), _assessment([5, 5, 5, 5, 5]))
+
+    update = assess_risks(_risk_state(), CONFIG)
+
+    assert calls == ["fast", "strong"]
+    assert update["risk_assessment"]["overall_risk_score"] == 5.0
+
+
+def test_workflow_models_follow_routing_config(monkeypatch):
+    monkeypatch.setenv("FAST_MODEL", "fast-model")
+    monkeypatch.setenv("STRONG_MODEL", "strong-model")
+
+    models = workflow_models()
+
+    assert "fast-model" in models and "strong-model" in models
+    assert len(models) == len(set(models))
@@ -0,0 +1,62 @@
+"""
+검색 결과 캐시 테스트
+"""
+
+import time
+
+import pytest
+
+from src.search import SearchCache, SearchCacheMiss, SearchClient, get_search_cache_stats, set_search_tool
+
+
+class CountingSearchTool:
+    """호출 횟수를 세는 검색 도구"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, query, topic="general", max_results=3, format_output=False, **kwargs):
+        self.calls += 1
+        return [f"{query} 결과 {self.calls}"]
+
+
+def test_memory_tier_respects_ttl():
+    tool = CountingSearchTool()
+    client = SearchClient(tool, cache=SearchCache(persistent=False, ttl_seconds=0.1))
+
+    assert client.search("AI 윤리") == ["AI 윤리 결과 1"]
+    assert client.search("ai   윤리") == ["AI 윤리 결과 1"]
+    assert tool.calls == 1
+
+    time.sleep(0.15)
+    assert client.search("AI 윤리") == ["AI 윤리 결과 2"]
+    assert tool.calls == 2
+
+
+def test_offline_replay_returns_expired_disk_entry(tmp_path):
+    path = str(tmp_path / "search.sqlite")
+    SearchClient(CountingSearchTool(), cache=SearchCache(path=path, ttl_seconds=0.05)).search("AI 윤리")
+    time.sleep(0.1)
+
+    offline = SearchClient(None, cache=SearchCache(path=path, ttl_seconds=0.05), offline=True)
+    assert offline.search("AI 윤리") == ["AI 윤리 결과 1"]
+    with pytest.raises(SearchCacheMiss):
+        offline.search("다른 검색")
+
+
+def test_cache_stats_do_not_create_search_client(monkeypatch):
+    set_search_tool(None)
+
+    def fail():
+        raise AssertionError("통계 조회에서 검색 클라이언트를 생성함")
+
+    monkeypatch.setattr("src.search.client.get_search_tool", fail)
+
+    # 아직 검색하지 않았다면 Tavily 클라이언트를 만들지 않고 빈 통계를 반환
+    assert get_search_cache_stats() == {}
+
+    set_search_tool(SearchClient(CountingSearchTool(), cache=SearchCache(persistent=False)))
+    try:
+        assert get_search_cache_stats()["hits"] == 0
+    finally:
+        set_search_tool(None)